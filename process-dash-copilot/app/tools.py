@@ -23,6 +23,25 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_days_range",
+            "description": (
+                "Fetch day rollups for every date in an inclusive range (max 366 days) plus range totals. "
+                "Each day has the same shape as get_day. Prefer this over repeated get_day calls "
+                "for week or month summaries."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "fromDate": {"type": "string", "description": "First date, YYYY-MM-DD"},
+                    "toDate": {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD"},
+                },
+                "required": ["fromDate", "toDate"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -334,7 +353,22 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "close_sprint",
-            "description": "Mark a sprint as closed. Returns unfinished stories. Always ask the user which to carry forward before calling carry_forward_stories.",
+            "description": "Mark a sprint as closed. Returns unfinished stories. Always ask the user which to carry forward before calling carry_forward_stories, and pass carryForwardTo only when they want every unfinished story moved.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "sprintId": {"type": "string", "description": "UUID of the sprint"},
+                    "carryForwardTo": {"type": "string", "description": "Sprint UUID to carry all unfinished stories to (optional)"},
+                },
+                "required": ["sprintId"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "reopen_sprint",
+            "description": "Reopen a closed sprint so its frozen rollup is recomputed from new activity.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -348,15 +382,16 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "carry_forward_stories",
-            "description": "Copy selected stories from a closed sprint to a target sprint. Originals become CARRIED_OVER.",
+            "description": "Copy selected stories (or, with allUnfinished, every unfinished one) from a closed sprint to a target sprint. Originals become CARRIED_OVER.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "sprintId":       {"type": "string"},
                     "storyIds":       {"type": "array", "items": {"type": "string"}},
+                    "allUnfinished":  {"type": "boolean"},
                     "targetSprintId": {"type": "string"},
                 },
-                "required": ["sprintId", "storyIds", "targetSprintId"],
+                "required": ["sprintId", "targetSprintId"],
             },
         },
     },
@@ -466,8 +501,17 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "get_projects_dashboard",
-            "description": "Get a summary dashboard of all projects — overall health and activity.",
-            "parameters": {"type": "object", "properties": {}},
+            "description": (
+                "Get a summary dashboard of all projects — overall health and activity. "
+                "Lifetime by default; pass fromDate/toDate to limit it to a date window."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "fromDate": {"type": "string", "description": "First date, YYYY-MM-DD (optional)"},
+                    "toDate": {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD (optional)"},
+                },
+            },
         },
     },
     {
@@ -776,4 +820,31 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "search",
+            "description": (
+                "Full-text search across stories, focus blocks (intent, notes, outcome), todos, daily intents "
+                "and sprint summaries. Returns the best matches first with highlighted snippets — use it to find "
+                "when something was worked on before fetching the day or sprint."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query":     {"type": "string", "description": "Words to look for; the last word also matches as a prefix"},
+                    "fromDate":  {"type": "string", "description": "First date, YYYY-MM-DD (optional)"},
+                    "toDate":    {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD (optional)"},
+                    "projectId": {"type": "string", "description": "UUID of a project to search within (optional)"},
+                    "kinds": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["story", "block", "todo", "intents", "sprint_summary"]},
+                        "description": "Only these kinds of record (optional)",
+                    },
+                    "limit": {"type": "integer", "description": "Max results, 1-100 (default 20)"},
+                },
+                "required": ["query"],
+            },
+        },
+    },
 ]
@@ -2,12 +2,32 @@ import logging
 
 from sqlmodel import create_engine, Session, SQLModel
 from sqlmodel import select
-from sqlalchemy import text
+from sqlalchemy import event, text
 from app.settings import settings
 
 logger = logging.getLogger("uvicorn.error")
 
+def apply_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """Run the given PRAGMAs on every new DBAPI connection of a SQLite engine."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def read_sqlite_pragmas(session: Session, names) -> dict:
+    return {name: session.exec(text(f"PRAGMA {name}")).one()[0] for name in names}
+
+
 engine = create_engine(settings.database_url, echo=False)
+apply_sqlite_pragmas(engine, settings.sqlite_pragmas)
+
+_LOGGED_PRAGMAS = ["journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store"]
 
 def get_session():
     with Session(engine) as session:
@@ -18,6 +38,12 @@ def init_db():
     logger.info("Storage config: backups=%s", settings.backup_dir)
     SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
+        active = read_sqlite_pragmas(session, _LOGGED_PRAGMAS)
+        logger.info(
+            "Storage config: profile=%s pragmas=%s",
+            settings.WORKOBS_SQLITE_PROFILE,
+            ", ".join(f"{k}={v}" for k, v in active.items()),
+        )
         ensure_sqlite_compat_schema(session)
         ensure_default_project(session)
 
@@ -43,15 +69,42 @@ def ensure_sqlite_compat_schema(session: Session):
     _ensure_column(session, "event_log", "occurred_at", "DATETIME")
     _ensure_index(session, "ix_event_log_occurred_at", "event_log", "occurred_at")
 
+    # Denormalized hot payload keys (see EventLog); backfill once when added.
+    from app.services.events import PAYLOAD_COLUMNS
+    added = [
+        column
+        for column in PAYLOAD_COLUMNS
+        if _ensure_column(session, "event_log", column, "VARCHAR")
+    ]
+    for column in PAYLOAD_COLUMNS:
+        _ensure_index(session, f"ix_event_log_type_{column}", "event_log", f"type, {column}")
+    if added:
+        assignments = ", ".join(f"{c} = json_extract(payload, '$.{PAYLOAD_COLUMNS[c]}')" for c in added)
+        session.exec(text(f"UPDATE event_log SET {assignments} WHERE json_valid(payload)"))
+
+    # Keyset pagination order for GET /api/events
+    _ensure_index(session, "ix_event_log_ts_id", "event_log", "ts, id")
+
+    # Keyset pagination order for GET /api/reports/projects/{id}/blocks
+    _ensure_index(session, "ix_day_blocks_project_date", "day_blocks", "project_id, date, started_at")
+
+    # Block start times for the focus heatmap (backfilled by rebuild_projections.py)
+    _ensure_column(session, "day_blocks", "occurred_at", "DATETIME")
+
+    # Open / done todo lists for GET /api/todos
+    _ensure_index(session, "ix_day_todos_completed_date", "day_todos", "completed, date")
+
     session.commit()
 
 
-def _ensure_column(session: Session, table_name: str, column_name: str, column_type: str):
+def _ensure_column(session: Session, table_name: str, column_name: str, column_type: str) -> bool:
+    """Add the column if it is missing. Returns True when it was added."""
     rows = session.exec(text(f"PRAGMA table_info({table_name})")).all()
     existing_columns = {row[1] for row in rows}
     if column_name in existing_columns:
-        return
+        return False
     session.exec(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+    return True
 
 
 def _ensure_index(session: Session, index_name: str, table_name: str, column_name: str):
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import init_db
+from app.db import engine, init_db
 from app.routers import health, intents, blocks, reports, export, recovery, sprints, projects, todos, stories
-from app.routers import financial_years, sprint_tasks
+from app.routers import financial_years, sprint_tasks, events, search
+from app.services.write_behind import start_writer, stop_writer
+from app.settings import settings
 
 app = FastAPI(title="Work Observability API", version="0.1.0")
 
@@ -38,6 +40,8 @@ api_router.include_router(todos.router)
 api_router.include_router(stories.router)
 api_router.include_router(financial_years.router)
 api_router.include_router(sprint_tasks.router)
+api_router.include_router(events.router)
+api_router.include_router(search.router)
 
 app.include_router(api_router)
 
@@ -45,3 +49,14 @@ app.include_router(api_router)
 @app.on_event("startup")
 def on_startup():
     init_db()
+    if settings.WORKOBS_WRITE_BEHIND:
+        start_writer(
+            engine,
+            flush_interval_ms=settings.WORKOBS_WRITE_BEHIND_FLUSH_MS,
+            max_batch_size=settings.WORKOBS_WRITE_BEHIND_MAX_BATCH,
+        )
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_writer(engine)
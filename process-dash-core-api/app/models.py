@@ -1,5 +1,6 @@
 from datetime import date, datetime, timezone
 import uuid
+from sqlalchemy import DDL, Index, event
 from sqlmodel import Field, SQLModel
 from typing import Optional
 
@@ -71,6 +72,14 @@ class TeamAllocation(SQLModel, table=True):
 
 class EventLog(SQLModel, table=True):
     __tablename__ = "event_log"
+    __table_args__ = (
+        Index("ix_event_log_type_payload_date", "type", "payload_date"),
+        Index("ix_event_log_type_block_id", "type", "block_id"),
+        Index("ix_event_log_type_todo_id", "type", "todo_id"),
+        Index("ix_event_log_type_sprint_id", "type", "sprint_id"),
+        Index("ix_event_log_type_story_id", "type", "story_id"),
+        Index("ix_event_log_ts_id", "ts", "id"),
+    )
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     project_id: Optional[str] = Field(default=None, foreign_key="projects.id", index=True)
@@ -79,6 +88,14 @@ class EventLog(SQLModel, table=True):
     type: str = Field(index=True)
     payload: str  # JSON stored as string
 
+    # Hot payload keys, denormalized by log_event so lookups can use an index
+    # instead of substring-matching the JSON text.
+    payload_date: Optional[str] = None   # payload["date"]
+    block_id: Optional[str] = None       # payload["blockId"]
+    todo_id: Optional[str] = None        # payload["todoId"]
+    sprint_id: Optional[str] = None      # payload["sprintId"]
+    story_id: Optional[str] = None       # payload["storyId"]
+
     class Config:
         arbitrary_types_allowed = True
 
@@ -144,3 +161,189 @@ class UserStory(SQLModel, table=True):
     is_deleted: bool = Field(default=False, index=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class StoryTag(SQLModel, table=True):
+    """
+    One row per (story, tag), lower-cased: the indexed form of UserStory.tags,
+    kept in sync by the story write paths (see app.services.story_tags).
+    """
+    __tablename__ = "story_tags"
+    __table_args__ = (
+        # Tag filters and facets look stories up by tag.
+        Index("ix_story_tags_tag_lower_story_id", "tag_lower", "story_id"),
+    )
+
+    story_id: str = Field(foreign_key="user_stories.id", primary_key=True)
+    tag_lower: str = Field(primary_key=True)
+
+
+class SearchDocument(SQLModel, table=True):
+    """
+    One searchable item (a story, block, todo, day's intents or sprint
+    summary); its text lives in the search_fts row with the same rowid.
+    See app.services.search.
+    """
+    __tablename__ = "search_documents"
+    __table_args__ = (Index("ix_search_documents_kind_ref_id", "kind", "ref_id", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str                             # story | block | todo | intents | sprint_summary
+    ref_id: str                           # id of the item (the date for intents)
+    date: Optional[str] = Field(default=None, index=True)   # YYYY-MM-DD
+    project_id: Optional[str] = Field(default=None, index=True)
+
+
+# FTS5 tables are not SQLAlchemy tables: create_all() emits this one
+# together with search_documents.
+SEARCH_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts "
+    "USING fts5(title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+event.listen(SearchDocument.__table__, "after_create", DDL(SEARCH_FTS_DDL))
+
+
+# ── Day projections ───────────────────────────────────────────────────────────
+# Read models derived from event_log and maintained by log_event in the same
+# transaction as the event itself. event_log stays the source of truth; these
+# tables can always be rebuilt with `python rebuild_projections.py`.
+
+class DayBlock(SQLModel, table=True):
+    __tablename__ = "day_blocks"
+    __table_args__ = (
+        # Project block lists page newest-first by (date, started_at).
+        Index("ix_day_blocks_project_date", "project_id", "date", "started_at"),
+    )
+
+    block_id: str = Field(primary_key=True)
+    date: str = Field(index=True)                 # YYYY-MM-DD from the start payload
+    project_id: Optional[str] = Field(default=None, index=True)
+    story_id: Optional[str] = None
+    intent: Optional[str] = None
+    notes: Optional[str] = None
+    started_at: datetime
+    occurred_at: Optional[datetime] = None        # the start event's occurred_at (None before it was projected)
+    interrupted: bool = Field(default=False)
+    reason_code: Optional[str] = None             # code of the latest interruption
+    interruptions: Optional[str] = None           # JSON object of reason code -> interruptions, e.g. '{"MEETING": 2}'
+    actual_outcome: Optional[str] = None
+    duration_minutes: Optional[int] = None
+
+
+class DayRecovery(SQLModel, table=True):
+    __tablename__ = "day_recovery"
+
+    block_id: str = Field(primary_key=True)
+    date: str = Field(index=True)
+    kind: Optional[str] = None
+    started_at: datetime
+    duration_minutes: Optional[int] = None
+
+
+class DayTodo(SQLModel, table=True):
+    __tablename__ = "day_todos"
+    __table_args__ = (
+        # Open / done todo lists filtered by date range.
+        Index("ix_day_todos_completed_date", "completed", "date"),
+    )
+
+    todo_id: str = Field(primary_key=True)
+    date: str = Field(index=True)                 # creation date of the todo
+    text: str = ""
+    added_at: datetime
+    completed: bool = Field(default=False)
+    completion_date: Optional[str] = None
+    deleted: bool = Field(default=False)
+
+
+class SprintStoryState(SQLModel, table=True):
+    """
+    One interval of a story's state in its sprint: its status and points from
+    valid_from until valid_to (NULL while current). Derived from the
+    user_story_* events (see app.services.burndown).
+    """
+    __tablename__ = "sprint_story_states"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sprint_id: str = Field(index=True)
+    story_id: str = Field(index=True)
+    status: str                           # story status, or DELETED
+    points: int = 0                       # story_points, 0 when unestimated
+    valid_from: datetime                  # ts of the event that opened it
+    valid_to: Optional[datetime] = None
+
+
+class DailyMetric(SQLModel, table=True):
+    """
+    Day x project x reason-code aggregate of the day projections, maintained
+    alongside them (see app.services.daily_metrics). "" stands for no
+    project / no reason code.
+    """
+    __tablename__ = "daily_metrics"
+
+    date: str = Field(primary_key=True)
+    project_id: str = Field(default="", primary_key=True)
+    reason_code: str = Field(default="", primary_key=True)
+    blocks: int = 0
+    interrupted_blocks: int = 0
+    focus_blocks: int = 0
+    active_minutes: int = 0
+    focus_minutes: int = 0
+    recovery_minutes: int = 0
+    todos_completed: int = 0
+    interruptions: int = 0                        # interruptions logged with this reason code
+
+
+class RollupSnapshot(SQLModel, table=True):
+    """
+    Folded period-metrics state covering event_log up to (hwm_ts, hwm_id).
+    See app.services.snapshots.
+    """
+    __tablename__ = "rollup_snapshots"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    first_ts: Optional[datetime] = None   # oldest event folded into the state
+    hwm_ts: datetime                      # high-water mark: last folded event
+    hwm_id: str
+    event_count: int = 0
+    state: str                            # JSON, see snapshots.new_period_state
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class SprintRollupSnapshot(SQLModel, table=True):
+    """
+    A closed sprint's rollup, frozen when the sprint was closed and served
+    instead of recomputing it. See app.services.rollups.freeze_sprint_rollup.
+    """
+    __tablename__ = "sprint_rollup_snapshots"
+
+    sprint_id: str = Field(foreign_key="sprint_definitions.id", primary_key=True)
+    metrics: str                          # JSON, block metrics incl. topFragmenters
+    stories: str                          # JSON, get_sprint_story_metrics
+    reflection: str                       # JSON, latest sprint summary
+    frozen_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class EventLogPartition(SQLModel, table=True):
+    """Registry of monthly event_log archive tables (see app.services.archive)."""
+    __tablename__ = "event_log_partitions"
+
+    table_name: str = Field(primary_key=True)   # event_log_archive_YYYYMM
+    month: str = Field(index=True)              # YYYY-MM
+    event_count: int = 0
+    min_ts: Optional[datetime] = None
+    max_ts: Optional[datetime] = None
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ScopeVersion(SQLModel, table=True):
+    """
+    A version token per rollup scope ("day:2026-03-02", "sprint:<id>", ...),
+    replaced whenever a commit changes that scope's inputs. ETags are built
+    from these (see app.services.scope_versions).
+    """
+    __tablename__ = "scope_versions"
+
+    scope: str = Field(primary_key=True)
+    version: str                          # random token, new on every change
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -8,6 +8,11 @@ import uuid
 
 router = APIRouter(prefix="/blocks", tags=["blocks"])
 
+VALID_REASON_CODES = {
+    "MEETING", "DEPENDENCY", "CONTEXT_SWITCH", 
+    "FAMILY", "EMOTIONAL_LOAD", "TECH_ISSUE", "UNPLANNED_REQUEST"
+}
+
 class StartBlockRequest(BaseModel):
     date: str
     intent: str
@@ -35,12 +40,8 @@ def start_block(req: StartBlockRequest, session: Session = Depends(get_session))
 
 @router.post("/interrupt")
 def interrupt_block(req: InterruptBlockRequest, session: Session = Depends(get_session)):
-    valid_reasons = {
-        "MEETING", "DEPENDENCY", "CONTEXT_SWITCH", 
-        "FAMILY", "EMOTIONAL_LOAD", "TECH_ISSUE", "UNPLANNED_REQUEST"
-    }
-    if req.reasonCode not in valid_reasons:
-        raise HTTPException(status_code=400, detail=f"Invalid reason code. Must be one of {valid_reasons}")
+    if req.reasonCode not in VALID_REASON_CODES:
+        raise HTTPException(status_code=400, detail=f"Invalid reason code. Must be one of {VALID_REASON_CODES}")
         
     log_event(session, "intent_block_interrupted", req.dict())
     return {"ok": True}
@@ -0,0 +1,261 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.db import get_session
+from app.models import DayBlock, DayTodo
+from app.routers.blocks import StartBlockRequest, InterruptBlockRequest, EndBlockRequest, VALID_REASON_CODES
+from app.routers.intents import DailyIntentsRequest, MAX_DAILY_INTENTS
+from app.routers.recovery import StartRecoveryRequest, EndRecoveryRequest, RECOVERY_KINDS
+from app.routers.todos import AddTodoRequest, CompleteTodoRequest
+from app.services.events import (
+    decode_cursor,
+    event_to_dict,
+    get_events_page,
+    iter_events,
+    log_events,
+    new_event,
+)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+MAX_BATCH_SIZE = 5000
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+class BatchEvent(BaseModel):
+    type: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    occurredAt: Optional[datetime] = None
+    clientId: Optional[str] = None  # client-generated event id, used as event_log.id
+
+
+class EventBatchRequest(BaseModel):
+    events: List[BatchEvent] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+# Each builder validates a raw payload with the same request model (and checks)
+# as the single-event endpoint, and returns (payload, project_id, entity ids).
+# Entity ids (blockId / todoId) may be supplied by the client so that later
+# events in the same batch can reference them; otherwise they are generated.
+
+def _new_entity_id(raw: dict, key: str) -> str:
+    if raw.get(key) is None:
+        return str(uuid.uuid4())
+    if not isinstance(raw[key], str) or not raw[key]:
+        raise ValueError(f"{key} must be a non-empty string")
+    return raw[key]
+
+
+def _block_started(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = StartBlockRequest(**raw)
+    payload = req.model_dump()
+    payload["blockId"] = _new_entity_id(raw, "blockId")
+    return payload, req.projectId, {"blockId": payload["blockId"]}
+
+
+def _block_interrupted(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = InterruptBlockRequest(**raw)
+    if req.reasonCode not in VALID_REASON_CODES:
+        raise ValueError(f"Invalid reason code. Must be one of {VALID_REASON_CODES}")
+    return req.model_dump(), None, {"blockId": req.blockId}
+
+
+def _block_ended(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = EndBlockRequest(**raw)
+    return req.model_dump(), None, {"blockId": req.blockId}
+
+
+def _recovery_started(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = StartRecoveryRequest(**raw)
+    if req.kind not in RECOVERY_KINDS:
+        raise ValueError("Invalid recovery kind. Must be COFFEE or LUNCH.")
+    block_id = _new_entity_id(raw, "blockId")
+    return {"blockId": block_id, "kind": req.kind, "date": req.date}, None, {"blockId": block_id}
+
+
+def _recovery_ended(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = EndRecoveryRequest(**raw)
+    return {"blockId": req.blockId, "durationMinutes": req.durationMinutes}, None, {"blockId": req.blockId}
+
+
+def _intents_set(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = DailyIntentsRequest(**raw)
+    if len(req.intents) > MAX_DAILY_INTENTS:
+        raise ValueError(f"Max {MAX_DAILY_INTENTS} intents allowed")
+    return req.model_dump(), None, {}
+
+
+def _todo_added(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    req = AddTodoRequest(**raw)
+    todo_id = _new_entity_id(raw, "todoId")
+    return {"todoId": todo_id, "text": req.text, "date": req.date}, None, {"todoId": todo_id}
+
+
+def _require_todo_id(raw: dict) -> str:
+    todo_id = raw.get("todoId")
+    if not isinstance(todo_id, str) or not todo_id:
+        raise ValueError("todoId is required")
+    return todo_id
+
+
+def _todo_completion(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    todo_id = _require_todo_id(raw)
+    req = CompleteTodoRequest(**raw)
+    return {"todoId": todo_id, "completionDate": req.completionDate}, None, {"todoId": todo_id}
+
+
+def _todo_deleted(raw: dict) -> Tuple[dict, Optional[str], dict]:
+    todo_id = _require_todo_id(raw)
+    return {"todoId": todo_id}, None, {"todoId": todo_id}
+
+
+EVENT_BUILDERS = {
+    "intent_block_started": _block_started,
+    "intent_block_interrupted": _block_interrupted,
+    "intent_block_ended": _block_ended,
+    "recovery_block_started": _recovery_started,
+    "recovery_block_ended": _recovery_ended,
+    "daily_intents_set": _intents_set,
+    "todo_added": _todo_added,
+    "todo_completed": _todo_completion,
+    "todo_uncompleted": _todo_completion,
+    "todo_deleted": _todo_deleted,
+}
+
+# Events that create an entity, with the projection table that holds it.
+CREATING_EVENTS = {
+    "intent_block_started": ("blockId", DayBlock.block_id),
+    "todo_added": ("todoId", DayTodo.todo_id),
+}
+
+
+def _duplicate_entities(session: Session, items: List[Tuple[int, str, dict]]) -> List[dict]:
+    """
+    Errors for creating events (block started, todo added) whose id already
+    exists, either in its projection table or earlier in the same batch.
+    """
+    errors = []
+    for event_type, (key, column) in CREATING_EVENTS.items():
+        ids = [(index, entity_ids[key]) for index, t, entity_ids in items if t == event_type]
+        if not ids:
+            continue
+        existing = set(session.exec(select(column).where(column.in_({i for _, i in ids}))).all())
+        seen = set()
+        for index, entity_id in ids:
+            if entity_id in existing or entity_id in seen:
+                errors.append({"index": index, "error": f"{key} '{entity_id}' already exists"})
+            seen.add(entity_id)
+    return sorted(errors, key=lambda e: e["index"])
+
+
+@router.post("/batch")
+def ingest_event_batch(req: EventBatchRequest, session: Session = Depends(get_session)):
+    """
+    Validate and append a batch of events in a single transaction.
+    Either every event is written or none is.
+    """
+    events = []
+    results = []
+    errors = []
+    for index, item in enumerate(req.events):
+        builder = EVENT_BUILDERS.get(item.type)
+        if builder is None:
+            errors.append({"index": index, "error": f"Unsupported event type '{item.type}'"})
+            continue
+        try:
+            payload, project_id, entity_ids = builder(item.payload)
+        except ValidationError as exc:
+            errors.append({"index": index, "error": exc.errors(include_url=False, include_context=False)})
+            continue
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+            continue
+
+        event = new_event(
+            item.type,
+            payload,
+            local_id=item.clientId,
+            project_id=project_id,
+            occurred_at=item.occurredAt,
+        )
+        events.append(event)
+        results.append({"index": index, "type": item.type, "clientId": item.clientId, **entity_ids})
+
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    duplicates = _duplicate_entities(session, [(r["index"], r["type"], r) for r in results])
+    if duplicates:
+        raise HTTPException(status_code=409, detail=duplicates)
+
+    try:
+        log_events(session, events)
+    except IntegrityError as exc:
+        session.rollback()
+        raise HTTPException(status_code=409, detail="Duplicate event id in batch") from exc
+
+    for result, event in zip(results, events):
+        result["eventId"] = event.id
+    return {"ok": True, "count": len(results), "items": results}
+
+
+def _parse_types(types: Optional[str]) -> Optional[List[str]]:
+    if not types:
+        return None
+    return [t.strip() for t in types.split(",") if t.strip()] or None
+
+
+def _check_cursor(after: Optional[str]) -> None:
+    if after:
+        try:
+            decode_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("")
+def list_events(
+    after: Optional[str] = None,
+    types: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: Session = Depends(get_session),
+):
+    """
+    Page through the event log in (ts, id) order.
+    Pass the returned nextCursor as `after` to fetch the next page; it is
+    null once the end of the log is reached.
+    """
+    _check_cursor(after)
+    events, next_cursor = get_events_page(session, types=_parse_types(types), after=after, limit=limit)
+    return {"items": [event_to_dict(e) for e in events], "nextCursor": next_cursor}
+
+
+@router.get("/stream")
+def stream_events(
+    after: Optional[str] = None,
+    types: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Stream the event log (from `after`, if given) as NDJSON, one event per line.
+    """
+    _check_cursor(after)
+    type_list = _parse_types(types)
+    # The request-scoped session may be closed before the body is sent, so the
+    # generator owns its own session for the lifetime of the stream.
+    bind = session.get_bind()
+
+    def _lines():
+        with Session(bind) as stream_session:
+            for event in iter_events(stream_session, types=type_list, after=after):
+                yield json.dumps(event_to_dict(event)) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
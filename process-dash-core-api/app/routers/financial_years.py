@@ -6,6 +6,7 @@ from pydantic import BaseModel
 
 from app.db import get_session
 from app.models import FinancialYear
+from app.services.rollups import get_financial_year_rollup
 
 router = APIRouter(prefix="/financial-years", tags=["financial-years"])
 
@@ -79,6 +80,15 @@ def get_current_financial_year(session: Session = Depends(get_session)):
     return _fy_dict(fy)
 
 
+@router.get("/{fy_id}/rollup")
+def get_financial_year_rollup_view(fy_id: str, session: Session = Depends(get_session)):
+    """Focus, fragmentation and velocity for the year, by quarter, month and ISO week."""
+    fy = session.get(FinancialYear, fy_id)
+    if not fy:
+        raise HTTPException(status_code=404, detail="Financial year not found")
+    return get_financial_year_rollup(session, fy)
+
+
 @router.patch("/{fy_id}")
 def update_financial_year(fy_id: str, req: FYUpdateRequest, session: Session = Depends(get_session)):
     from datetime import date
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 from pathlib import Path
+from app.db import engine
+from app.services.rollup_cache import get_cache
+from app.services.write_behind import get_writer
 from app.settings import settings
 
 router = APIRouter()
@@ -26,3 +29,16 @@ def get_storage_info():
         "backupDir": str(backup_dir),
         "backupDirExists": Path(backup_dir).exists(),
     }
+
+
+@router.get("/health/writer")
+def get_writer_stats():
+    writer = get_writer(engine)
+    if writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **writer.stats()}
+
+
+@router.get("/health/rollup-cache")
+def get_rollup_cache_stats():
+    return get_cache(engine).stats()
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 from app.db import get_session
-from app.services.events import log_event, get_events
+from app.services.events import log_event
 from pydantic import BaseModel, Field
 from datetime import date
 from typing import List
 
 router = APIRouter(prefix="/intents", tags=["intents"])
 
+MAX_DAILY_INTENTS = 5
+
 class DailyIntentsRequest(BaseModel):
     date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
     intents: List[str]
@@ -18,7 +20,7 @@ class DailyIntentsRequest(BaseModel):
 
 @router.post("/daily")
 def set_daily_intents(req: DailyIntentsRequest, session: Session = Depends(get_session)):
-    if len(req.intents) > 5:
+    if len(req.intents) > MAX_DAILY_INTENTS:
         raise HTTPException(status_code=400, detail="Max 5 intents allowed")
         
     log_event(session, "daily_intents_set", req.dict())
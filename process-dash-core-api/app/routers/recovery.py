@@ -10,6 +10,8 @@ from app.services.events import log_event
 
 router = APIRouter(prefix="/recovery", tags=["recovery"])
 
+RECOVERY_KINDS = ["COFFEE", "LUNCH"]
+
 class StartRecoveryRequest(BaseModel):
     kind: str # "COFFEE" | "LUNCH"
     date: str
@@ -20,7 +22,7 @@ class EndRecoveryRequest(BaseModel):
 
 @router.post("/start")
 def start_recovery(req: StartRecoveryRequest, session: Session = Depends(get_session)):
-    if req.kind not in ["COFFEE", "LUNCH"]:
+    if req.kind not in RECOVERY_KINDS:
         raise HTTPException(status_code=400, detail="Invalid recovery kind. Must be COFFEE or LUNCH.")
         
     block_id = str(uuid4())
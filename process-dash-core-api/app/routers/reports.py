@@ -1,19 +1,227 @@
-from fastapi import APIRouter, Depends
+import json
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 from app.db import get_session
-from app.services.rollups import get_day_rollup, get_projects_dashboard, get_project_data
+from app.models import FinancialYear, Project, SprintDefinition
+from app.services.daily_metrics import get_metrics_range
+from app.services.heatmap import get_focus_heatmap
+from app.services.rollup_cache import BYPASS, CACHE_HEADER, day_key, project_key, project_summary_key
+from app.services.rollups import (
+    MAX_PROJECT_BLOCKS_PAGE_SIZE,
+    PROJECT_BLOCKS_PAGE_SIZE,
+    cached_day_rollup,
+    cached_project_data,
+    cached_project_summary,
+    decode_block_cursor,
+    get_days_range,
+    get_project_blocks_page,
+    get_projects_dashboard,
+    iter_project_blocks,
+)
+from app.services.scope_versions import ALL_PROJECTS, etag, etag_headers, etag_matches, rollup_etag
 
 router = APIRouter(tags=["reports"])
 
+MAX_RANGE_DAYS = 366
+
+@router.get("/days")
+def get_days_range_view(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    session: Session = Depends(get_session),
+):
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if (to_date - from_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    return get_days_range(session, from_date, to_date)
+
 @router.get("/days/{date_str}")
-def get_day_view(date_str: str, session: Session = Depends(get_session)):
-    return get_day_rollup(session, date_str)
+def get_day_view(
+    date_str: str,
+    response: Response,
+    x_rollup_cache: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session),
+):
+    current = rollup_etag(session, day_key(date_str))
+    if x_rollup_cache != BYPASS and etag_matches(if_none_match, current):
+        return Response(status_code=304, headers=etag_headers(current))
+    rollup, status = cached_day_rollup(session, date_str, bypass=x_rollup_cache == BYPASS)
+    response.headers[CACHE_HEADER] = status
+    response.headers.update(etag_headers(current))
+    return rollup
 
 @router.get("/reports/projects")
-def get_projects_dashboard_view(session: Session = Depends(get_session)):
-    return {"items": get_projects_dashboard(session)}
+def get_projects_dashboard_view(
+    response: Response,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session),
+):
+    """Project metrics, lifetime by default or for the inclusive from/to date window."""
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    # The window is part of the representation: one ETag per from/to pair.
+    window = f"{from_date or ''}..{to_date or ''}" if from_date or to_date else ""
+    current = etag(session, [ALL_PROJECTS], window)
+    if etag_matches(if_none_match, current):
+        return Response(status_code=304, headers=etag_headers(current))
+    response.headers.update(etag_headers(current))
+    start = datetime.combine(from_date, datetime.min.time()) if from_date else None
+    end = datetime.combine(to_date + timedelta(days=1), datetime.min.time()) if to_date else None
+    return {"items": get_projects_dashboard(session, start, end)}
+
+def _metrics_range(
+    session: Session,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    week: Optional[str],
+    month: Optional[str],
+    sprint_id: Optional[str],
+    financial_year_id: Optional[str],
+) -> tuple:
+    """Resolve exactly one range selector to an inclusive (from, to) pair."""
+    selectors = [from_date or to_date, week, month, sprint_id, financial_year_id]
+    if sum(1 for s in selectors if s) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Pass exactly one of from/to, week, month, sprintId or financialYearId",
+        )
+    if week:
+        try:
+            year, number = week.split("-W")
+            start = date.fromisocalendar(int(year), int(number), 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="week must look like 2026-W07")
+        return start, start + timedelta(days=6)
+    if month:
+        try:
+            start = datetime.strptime(month, "%Y-%m").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must look like 2026-02")
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    if sprint_id:
+        sprint = session.get(SprintDefinition, sprint_id)
+        if not sprint:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+        return sprint.start_date, sprint.end_date
+    if financial_year_id:
+        fy = session.get(FinancialYear, financial_year_id)
+        if not fy:
+            raise HTTPException(status_code=404, detail="Financial year not found")
+        return fy.start_date, fy.end_date
+    if not (from_date and to_date):
+        raise HTTPException(status_code=400, detail="Pass both 'from' and 'to'")
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    return from_date, to_date
+
+@router.get("/reports/metrics")
+def get_metrics_view(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    week: Optional[str] = None,
+    month: Optional[str] = None,
+    sprintId: Optional[str] = None,
+    financialYearId: Optional[str] = None,
+    projectId: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Block, recovery and todo totals for one range — from/to, an ISO week, a
+    month, a sprint or a financial year — summed from the daily_metrics cube.
+    """
+    start, end = _metrics_range(session, from_date, to_date, week, month, sprintId, financialYearId)
+    return get_metrics_range(session, start, end, project_id=projectId)
+
+@router.get("/reports/heatmap")
+def get_heatmap_view(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    projectId: Optional[str] = None,
+    tzOffsetMinutes: int = Query(0, ge=-14 * 60, le=14 * 60),
+    session: Session = Depends(get_session),
+):
+    """Focus minutes and interruptions by weekday × hour of day for blocks dated in from/to."""
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    return get_focus_heatmap(session, from_date, to_date, project_id=projectId, tz_offset_minutes=tzOffsetMinutes)
 
 @router.get("/reports/projects/{project_id}/data")
-def get_project_data_view(project_id: str, session: Session = Depends(get_session)):
-    return get_project_data(session, project_id)
+def get_project_data_view(
+    project_id: str,
+    response: Response,
+    version: int = Query(1, ge=1, le=2),
+    x_rollup_cache: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session),
+):
+    """
+    Lifetime metrics, sprints and blocks of a project. version=2 leaves out
+    both block lists (metrics.blocks and blocks); page through
+    /reports/projects/{id}/blocks instead.
+    """
+    summary = version >= 2
+    current = rollup_etag(session, project_summary_key(project_id) if summary else project_key(project_id))
+    if x_rollup_cache != BYPASS and etag_matches(if_none_match, current):
+        return Response(status_code=304, headers=etag_headers(current))
+    compute = cached_project_summary if summary else cached_project_data
+    data, status = compute(session, project_id, bypass=x_rollup_cache == BYPASS)
+    response.headers[CACHE_HEADER] = status
+    response.headers.update(etag_headers(current))
+    return data
+
+def _project_blocks_args(session: Session, project_id: str, from_date, to_date, after) -> None:
+    if not session.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if after:
+        try:
+            decode_block_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/reports/projects/{project_id}/blocks")
+def list_project_blocks(
+    project_id: str,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    after: Optional[str] = None,
+    limit: int = Query(PROJECT_BLOCKS_PAGE_SIZE, ge=1, le=MAX_PROJECT_BLOCKS_PAGE_SIZE),
+    session: Session = Depends(get_session),
+):
+    """
+    Page through a project's blocks, newest day first, optionally within from/to.
+    Pass the returned nextCursor as `after` for the next page.
+    """
+    _project_blocks_args(session, project_id, from_date, to_date, after)
+    return get_project_blocks_page(session, project_id, from_date, to_date, after=after, limit=limit)
+
+@router.get("/reports/projects/{project_id}/blocks/stream")
+def stream_project_blocks(
+    project_id: str,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    after: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """Stream a project's blocks (same order and filters as the paged list) as NDJSON."""
+    _project_blocks_args(session, project_id, from_date, to_date, after)
+    # The request-scoped session may be closed before the body is sent, so the
+    # generator owns its own session for the lifetime of the stream.
+    bind = session.get_bind()
+
+    def _lines():
+        with Session(bind) as stream_session:
+            for block in iter_project_blocks(stream_session, project_id, from_date, to_date, after=after):
+                yield json.dumps(block) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,34 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app.db import get_session
+from app.services.search import KINDS, MAX_RESULTS, search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("")
+def search_view(
+    q: str = Query(..., min_length=1, max_length=200),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    projectId: Optional[str] = None,
+    kind: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_RESULTS),
+    session: Session = Depends(get_session),
+):
+    """
+    Ranked full-text search over stories, blocks, todos, daily intents and
+    sprint summaries, with matches wrapped in <mark> tags.
+    """
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if kind and not set(kind) <= set(KINDS):
+        raise HTTPException(status_code=400, detail=f"Invalid kind. Must be one of {list(KINDS)}")
+    try:
+        return search(session, q, from_date, to_date, projectId, kind, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
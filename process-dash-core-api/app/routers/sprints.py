@@ -1,20 +1,28 @@
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from pydantic import BaseModel, Field
+from sqlalchemy import update
 from sqlmodel import Session, select
 
 from app.db import get_session
 from app.db import ensure_default_project
-from app.models import SprintDefinition
-from app.services.events import log_event
+from app.models import EventLog, SprintDefinition, SprintRollupSnapshot, UserStory
+from app.services.burndown import get_sprint_burndown
+from app.services.events import log_event, log_events, new_event
+from app.services.rollup_cache import BYPASS, CACHE_HEADER, note_keys, sprint_key
 from app.services.rollups import (
-    get_sprint_rollup,
+    cached_sprint_rollup,
+    freeze_sprint_rollup,
     has_saved_sprint_summary,
     list_sprint_definitions,
     list_sprint_summaries,
+    thaw_sprint_rollup,
+    update_frozen_sprint_rollup,
 )
+from app.services.scope_versions import etag_headers, etag_matches, rollup_etag
+from app.services.story_tags import sync_stories_tags
 
 
 router = APIRouter(prefix="/sprints", tags=["sprints"])
@@ -148,8 +156,29 @@ def get_sprint(sprint_id: str, session: Session = Depends(get_session)):
 
 
 @router.get("/{sprint_id}/rollup")
-def get_sprint_rollup_view(sprint_id: str, session: Session = Depends(get_session)):
-    return get_sprint_rollup(session, sprint_id)
+def get_sprint_rollup_view(
+    sprint_id: str,
+    response: Response,
+    x_rollup_cache: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session),
+):
+    current = rollup_etag(session, sprint_key(sprint_id))
+    if x_rollup_cache != BYPASS and etag_matches(if_none_match, current):
+        return Response(status_code=304, headers=etag_headers(current))
+    rollup, status = cached_sprint_rollup(session, sprint_id, bypass=x_rollup_cache == BYPASS)
+    response.headers[CACHE_HEADER] = status
+    response.headers.update(etag_headers(current))
+    return rollup
+
+
+@router.get("/{sprint_id}/burndown")
+def get_sprint_burndown_view(sprint_id: str, session: Session = Depends(get_session)):
+    """Daily remaining / completed points and stories, with scope-change markers."""
+    sprint = session.get(SprintDefinition, sprint_id)
+    if not sprint:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    return get_sprint_burndown(session, sprint)
 
 
 @router.post("/{sprint_id}/summary")
@@ -165,6 +194,9 @@ def save_sprint_summary(
     payload = req.model_dump()
     payload["sprintId"] = sprint_id
     log_event(session, "sprint_summary_saved", payload)
+    if sprint.is_closed:
+        update_frozen_sprint_rollup(session, sprint_id, reflection=True)
+        session.commit()
     return {"ok": True}
 
 
@@ -179,6 +211,7 @@ def update_sprint(
         raise HTTPException(status_code=404, detail="Sprint not found")
 
     has_summary = has_saved_sprint_summary(session, sprint_id)
+    is_frozen = session.get(SprintRollupSnapshot, sprint_id) is not None
     changing_dates_or_duration = req.startDate is not None or req.durationDays is not None
     if has_summary and changing_dates_or_duration and not req.forceRecalculate:
         return {
@@ -186,6 +219,12 @@ def update_sprint(
             "requiresConfirmation": True,
             "warning": "This sprint already has saved summaries. Confirm to modify dates/duration and recalculate progress.",
         }
+    if is_frozen and changing_dates_or_duration and not req.forceRecalculate:
+        return {
+            "ok": False,
+            "requiresConfirmation": True,
+            "warning": "This sprint is closed and its rollup is frozen. Confirm to modify dates/duration and recalculate it.",
+        }
 
     next_name = req.name.strip() if req.name is not None else sprint.name
     next_start = _parse_iso_date(req.startDate) if req.startDate is not None else sprint.start_date
@@ -201,6 +240,8 @@ def update_sprint(
     sprint.updated_at = datetime.now(timezone.utc)
 
     session.add(sprint)
+    if is_frozen and req.forceRecalculate:
+        freeze_sprint_rollup(session, sprint)
     session.commit()
     session.refresh(sprint)
 
@@ -218,47 +259,171 @@ def update_sprint(
 
 # ── Sprint close + carry-forward ───────────────────────────────────────────────
 
+UNFINISHED_STATUSES = ("TODO", "IN_PROGRESS")
+
+
+class SprintCloseRequest(BaseModel):
+    carryForwardTo: Optional[str] = None  # also carry every unfinished story to this sprint
+
+
 class CarryForwardRequest(BaseModel):
-    storyIds: List[str]          # stories to carry forward
+    storyIds: List[str] = Field(default_factory=list)  # stories to carry forward
+    allUnfinished: bool = False  # carry every TODO / IN_PROGRESS story instead
     targetSprintId: str          # destination sprint
 
 
+def _target_sprint(session: Session, sprint_id: str, target_id: str) -> SprintDefinition:
+    target = session.get(SprintDefinition, target_id)
+    if not target:
+        raise HTTPException(status_code=404, detail="Target sprint not found")
+    if target.id == sprint_id:
+        raise HTTPException(status_code=400, detail="Target sprint must differ from the source sprint")
+    return target
+
+
+def _unfinished_stories_query(sprint_id: str):
+    return (
+        select(UserStory)
+        .where(UserStory.sprint_id == sprint_id)
+        .where(UserStory.is_deleted == False)  # noqa: E712
+        .where(UserStory.status.in_(UNFINISHED_STATUSES))
+        .order_by(UserStory.created_at)
+    )
+
+
+def _carry_forward(
+    session: Session,
+    sprint_id: str,
+    stories: List[UserStory],
+    target_id: str,
+) -> Tuple[List[UserStory], List[EventLog]]:
+    """
+    Copy `stories` into the target sprint and mark the originals CARRIED_OVER:
+    one INSERT of the copies and one UPDATE of the originals. Does not commit;
+    returns the copies and the user_story_carried_forward events to log.
+    """
+    from app.routers.stories import _parse_tags  # local import to avoid circular
+
+    if not stories:
+        return [], []
+    copies = [
+        UserStory(
+            sprint_id=target_id,
+            project_id=story.project_id,
+            title=story.title,
+            description=story.description,
+            acceptance_criteria=story.acceptance_criteria,
+            story_points=story.story_points,
+            tags=story.tags,
+            status="TODO",
+        )
+        for story in stories
+    ]
+    session.add_all(copies)
+    session.execute(
+        update(UserStory)
+        .where(UserStory.id.in_([story.id for story in stories]))
+        .values(status="CARRIED_OVER", updated_at=datetime.now(timezone.utc))
+    )
+    note_keys(session, [sprint_key(sprint_id)])  # the UPDATE skips the flush hooks
+    session.flush()
+    sync_stories_tags(session, copies)
+    update_frozen_sprint_rollup(session, sprint_id, stories=True)
+    update_frozen_sprint_rollup(session, target_id, stories=True)
+
+    events = [
+        new_event(
+            "user_story_carried_forward",
+            {
+                "originalStoryId": story.id,
+                "newStoryId": copy.id,
+                "fromSprintId": sprint_id,
+                "toSprintId": target_id,
+                "title": story.title,
+                "storyPoints": story.story_points,
+                "tags": _parse_tags(story.tags),
+            },
+            project_id=story.project_id,
+        )
+        for story, copy in zip(stories, copies)
+    ]
+    return copies, events
+
+
 @router.post("/{sprint_id}/close")
-def close_sprint(sprint_id: str, session: Session = Depends(get_session)):
-    """Mark a sprint closed and return its unfinished stories."""
-    from app.models import UserStory
-    from sqlmodel import select as sql_select
+def close_sprint(
+    sprint_id: str,
+    req: Optional[SprintCloseRequest] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Mark a sprint closed, freeze its rollup and return its unfinished stories.
+    With carryForwardTo, the unfinished stories are carried forward to that
+    sprint in the same transaction instead.
+    """
+    from app.routers.stories import _story_to_dict  # local import to avoid circular
 
     sprint = session.get(SprintDefinition, sprint_id)
     if not sprint:
         raise HTTPException(status_code=404, detail="Sprint not found")
+    target = _target_sprint(session, sprint_id, req.carryForwardTo) if req and req.carryForwardTo else None
+
+    unfinished = session.exec(_unfinished_stories_query(sprint_id)).all()
 
     sprint.is_closed = True
     sprint.updated_at = datetime.now(timezone.utc)
     session.add(sprint)
+    events = [new_event("sprint_closed", {"sprintId": sprint_id, "sprintName": sprint.name}, project_id=sprint.project_id)]
+
+    carried = []
+    if target is not None:
+        copies, carry_events = _carry_forward(session, sprint_id, unfinished, target.id)
+        events.extend(carry_events)
+        carried = [_story_to_dict(copy) for copy in copies]
+        unfinished = []
+    if session.get(SprintRollupSnapshot, sprint_id) is None:
+        freeze_sprint_rollup(session, sprint)
+
+    response = {
+        "ok": True,
+        "sprintId": sprint_id,
+        "unfinishedStories": [_story_to_dict(s) for s in unfinished],
+        "carriedForward": carried,
+    }
+    log_events(session, events)
+    return response
+
+
+@router.post("/{sprint_id}/reopen")
+def reopen_sprint(sprint_id: str, session: Session = Depends(get_session)):
+    """Reopen a closed sprint; its rollup is recomputed from the log again."""
+    sprint = session.get(SprintDefinition, sprint_id)
+    if not sprint:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+
+    sprint.is_closed = False
+    sprint.updated_at = datetime.now(timezone.utc)
+    session.add(sprint)
+    thaw_sprint_rollup(session, sprint_id)
 
     log_event(
         session,
-        "sprint_closed",
+        "sprint_reopened",
         {"sprintId": sprint_id, "sprintName": sprint.name},
         project_id=sprint.project_id,
     )
     session.commit()
-
-    # Return unfinished stories so the UI can offer carry-forward
-    from app.routers.stories import _story_to_dict, _parse_tags  # local import to avoid circular
-    unfinished = session.exec(
-        sql_select(UserStory).where(
-            UserStory.sprint_id == sprint_id,
-            UserStory.is_deleted == False,  # noqa: E712
-            UserStory.status != "DONE",
-        )
-    ).all()
+    session.refresh(sprint)
 
     return {
         "ok": True,
-        "sprintId": sprint_id,
-        "unfinishedStories": [_story_to_dict(s) for s in unfinished],
+        "id": sprint.id,
+        "name": sprint.name,
+        "startDate": sprint.start_date.isoformat(),
+        "endDate": sprint.end_date.isoformat(),
+        "durationDays": sprint.duration_days,
+        "isArchived": sprint.is_archived,
+        "isClosed": sprint.is_closed,
     }
 
 
@@ -268,59 +433,37 @@ def carry_forward_stories(
     req: CarryForwardRequest,
     session: Session = Depends(get_session),
 ):
-    """Copy selected stories to a target sprint and mark originals as CARRIED_OVER."""
-    import uuid as _uuid
-    from app.models import UserStory
-    from app.routers.stories import _story_to_dict, _parse_tags  # local import
+    """
+    Copy stories to a target sprint and mark the originals CARRIED_OVER, in
+    one transaction: the given storyIds (skipping ones already carried over),
+    or with allUnfinished every TODO / IN_PROGRESS story of the sprint.
+    """
+    from app.routers.stories import _story_to_dict  # local import to avoid circular
 
     source_sprint = session.get(SprintDefinition, sprint_id)
     if not source_sprint:
         raise HTTPException(status_code=404, detail="Source sprint not found")
+    _target_sprint(session, sprint_id, req.targetSprintId)
+    if not req.allUnfinished and not req.storyIds:
+        raise HTTPException(status_code=400, detail="Pass storyIds or allUnfinished")
 
-    target_sprint = session.get(SprintDefinition, req.targetSprintId)
-    if not target_sprint:
-        raise HTTPException(status_code=404, detail="Target sprint not found")
-
-    moved = []
-    for story_id in req.storyIds:
-        story = session.get(UserStory, story_id)
-        if not story or story.is_deleted or story.sprint_id != sprint_id:
-            continue
-
-        # Mark original as CARRIED_OVER
-        story.status = "CARRIED_OVER"
-        story.updated_at = datetime.now(timezone.utc)
-        session.add(story)
-
-        # Create a fresh copy in the target sprint
-        new_story = UserStory(
-            id=str(_uuid.uuid4()),
-            sprint_id=req.targetSprintId,
-            project_id=story.project_id,
-            title=story.title,
-            description=story.description,
-            acceptance_criteria=story.acceptance_criteria,
-            story_points=story.story_points,
-            tags=story.tags,
-            status="TODO",
-        )
-        session.add(new_story)
-        session.flush()
-
-        log_event(
-            session,
-            "user_story_carried_forward",
-            {
-                "originalStoryId": story.id,
-                "newStoryId": new_story.id,
-                "fromSprintId": sprint_id,
-                "toSprintId": req.targetSprintId,
-                "title": story.title,
-                "tags": _parse_tags(story.tags),
-            },
-            project_id=story.project_id,
+    if req.allUnfinished:
+        stories = session.exec(_unfinished_stories_query(sprint_id)).all()
+    else:
+        order = {story_id: i for i, story_id in enumerate(req.storyIds)}
+        stories = sorted(
+            session.exec(
+                select(UserStory)
+                .where(UserStory.id.in_(req.storyIds))
+                .where(UserStory.sprint_id == sprint_id)
+                .where(UserStory.is_deleted == False)  # noqa: E712
+                .where(UserStory.status != "CARRIED_OVER")
+            ).all(),
+            key=lambda story: order[story.id],
         )
-        moved.append(_story_to_dict(new_story))
 
+    copies, events = _carry_forward(session, sprint_id, stories, req.targetSprintId)
+    moved = [_story_to_dict(copy) for copy in copies]
+    log_events(session, events)
     session.commit()
     return {"ok": True, "movedStories": moved, "count": len(moved)}
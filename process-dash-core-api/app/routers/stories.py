@@ -1,17 +1,24 @@
+import codecs
+import csv
 import json
+import re
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field, field_validator
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from sqlmodel import Session, select
 
 from app.db import get_session
 from app.models import SprintDefinition, UserStory, STORY_STATUSES, STORY_POINTS_VALUES
-from app.services.events import log_event
+from app.services.events import log_event, log_events, new_event
+from app.services.story_tags import TAG_MODES, normalise_tag_filter, sync_stories_tags, sync_story_tags, tag_facets, tagged_story_ids
 
 router = APIRouter(prefix="/stories", tags=["stories"])
 
+MAX_IMPORT_ROWS = 1000
+CSV_TAG_SEPARATOR = re.compile(r"[;,]")
+
 
 # ── Tag helpers ────────────────────────────────────────────────────────────────
 
@@ -103,16 +110,79 @@ def _story_to_dict(story: UserStory) -> dict:
     }
 
 
-# ── Endpoints ──────────────────────────────────────────────────────────────────
+def _created_payload(story: UserStory) -> dict:
+    return {
+        "storyId": story.id,
+        "sprintId": story.sprint_id,
+        "projectId": story.project_id,
+        "title": story.title,
+        "storyPoints": story.story_points,
+        "tags": _parse_tags(story.tags),
+    }
 
-@router.get("")
-def list_stories(
-    sprintId: Optional[str] = None,
-    projectId: Optional[str] = None,
-    status: Optional[str] = None,
-    tag: Optional[str] = None,
-    session: Session = Depends(get_session),
-):
+
+def _new_story(req: StoryCreateRequest, sprint: SprintDefinition) -> UserStory:
+    return UserStory(
+        sprint_id=req.sprintId,
+        project_id=req.projectId or sprint.project_id,
+        title=req.title.strip(),
+        description=req.description,
+        acceptance_criteria=req.acceptanceCriteria,
+        story_points=req.storyPoints,
+        tags=_serialise_tags(req.tags),
+    )
+
+
+def _apply_update(story: UserStory, req: StoryUpdateRequest) -> Tuple[bool, List[Tuple[str, dict]]]:
+    """
+    Apply a partial update to a story (not flushed, tags not synced).
+    Returns whether anything was set and the (type, payload) events to log.
+    """
+    old_status = story.status
+    old_points = story.story_points
+    changed = False
+
+    if req.title is not None:
+        story.title = req.title.strip()
+        changed = True
+    if req.description is not None:
+        story.description = req.description
+        changed = True
+    if req.acceptanceCriteria is not None:
+        story.acceptance_criteria = req.acceptanceCriteria
+        changed = True
+    if req.storyPoints is not None:
+        story.story_points = req.storyPoints
+        changed = True
+    if req.status is not None and req.status != old_status:
+        story.status = req.status
+        changed = True
+    if req.tags is not None:
+        story.tags = _serialise_tags(req.tags)
+        changed = True
+
+    events: List[Tuple[str, dict]] = []
+    if not changed:
+        return False, events
+    story.updated_at = datetime.now(timezone.utc)
+    if req.status is not None and req.status != old_status:
+        events.append(("user_story_status_changed", {
+            "storyId": story.id,
+            "sprintId": story.sprint_id,
+            "oldStatus": old_status,
+            "newStatus": req.status,
+        }))
+    if req.storyPoints is not None and req.storyPoints != old_points:
+        events.append(("user_story_points_changed", {
+            "storyId": story.id,
+            "sprintId": story.sprint_id,
+            "oldPoints": old_points,
+            "newPoints": req.storyPoints,
+        }))
+    return True, events
+
+
+def _stories_query(sprintId: Optional[str], projectId: Optional[str], status: Optional[str]):
     query = select(UserStory).where(UserStory.is_deleted == False)  # noqa: E712
     if sprintId:
         query = query.where(UserStory.sprint_id == sprintId)
@@ -122,54 +192,213 @@ def list_stories(
         if status not in STORY_STATUSES:
             raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of {STORY_STATUSES}")
         query = query.where(UserStory.status == status)
-    stories = session.exec(query.order_by(UserStory.created_at)).all()
+    return query
+
+
+# ── Bulk import parsing ────────────────────────────────────────────────────────
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Complete CSV records from a UTF-8 byte stream (quoted cells may span lines)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = record = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            record += line + "\n"
+            if record.count('"') % 2 == 0:
+                yield record
+                record = ""
+    record += buffer + decoder.decode(b"", final=True)
+    if record.strip():
+        yield record
+
+
+def _csv_row(header: List[str], values: List[str]) -> Dict[str, Any]:
+    """A CSV record as an import row; empty cells are left out (unchanged)."""
+    row: Dict[str, Any] = {}
+    for name, value in zip(header, values):
+        value = value.strip()
+        if not name or not value:
+            continue
+        row[name] = [t for t in CSV_TAG_SEPARATOR.split(value) if t.strip()] if name == "tags" else value
+    return row
+
+
+async def _read_csv_rows(chunks: AsyncIterator[bytes]) -> List[Dict[str, Any]]:
+    header: Optional[List[str]] = None
+    rows: List[Dict[str, Any]] = []
+    try:
+        async for record in _csv_records(chunks):
+            values = next(csv.reader([record]), [])
+            if not any(v.strip() for v in values):
+                continue
+            if header is None:
+                header = [v.strip() for v in values]
+                continue
+            if len(rows) == MAX_IMPORT_ROWS:
+                raise HTTPException(status_code=413, detail=f"At most {MAX_IMPORT_ROWS} stories per import")
+            rows.append(_csv_row(header, values))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {exc}") from exc
+    return rows
+
+
+async def _import_rows(request: Request) -> List[Dict[str, Any]]:
+    """
+    The rows of a bulk import body: a JSON {"stories": [...]} object, or CSV
+    (text/csv) with a header row, parsed as it streams in.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        rows = await _read_csv_rows(request.stream())
+    elif content_type == "application/json":
+        try:
+            body = await request.json()
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+        rows = body.get("stories") if isinstance(body, dict) else None
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail='Expected {"stories": [...]}')
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise HTTPException(status_code=413, detail=f"At most {MAX_IMPORT_ROWS} stories per import")
+    else:
+        raise HTTPException(status_code=415, detail="Send application/json or text/csv")
+    if not rows:
+        raise HTTPException(status_code=400, detail="No stories to import")
+    return rows
 
-    # Client-side tag filter (SQLite JSON support is limited)
-    if tag:
-        tag_lower = tag.lower()
-        stories = [s for s in stories if tag_lower in [t.lower() for t in _parse_tags(s.tags)]]
 
+# ── Endpoints ──────────────────────────────────────────────────────────────────
+
+@router.get("")
+def list_stories(
+    sprintId: Optional[str] = None,
+    projectId: Optional[str] = None,
+    status: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    tagMode: str = "any",
+    session: Session = Depends(get_session),
+):
+    """
+    Stories, oldest first. Repeat `tag` to filter by several tags (case-
+    insensitive): tagMode=any keeps stories with at least one, all with every one.
+    Blank tags are ignored; if none is left the list is not filtered by tag.
+    """
+    if tagMode not in TAG_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid tagMode. Must be one of {list(TAG_MODES)}")
+    query = _stories_query(sprintId, projectId, status)
+    wanted = normalise_tag_filter(tag)
+    if wanted:
+        query = query.where(UserStory.id.in_(tagged_story_ids(wanted, tagMode)))
+    stories = session.exec(query.order_by(UserStory.created_at)).all()
     return {"items": [_story_to_dict(s) for s in stories]}
 
 
+@router.get("/tags")
+def list_story_tags(
+    sprintId: Optional[str] = None,
+    projectId: Optional[str] = None,
+    status: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """Tag facets: how many (non-deleted) stories carry each tag, most used first."""
+    return {"items": tag_facets(session, _stories_query(sprintId, projectId, status))}
+
+
 @router.post("")
 def create_story(req: StoryCreateRequest, session: Session = Depends(get_session)):
     sprint = session.get(SprintDefinition, req.sprintId)
     if not sprint:
         raise HTTPException(status_code=404, detail="Sprint not found")
 
-    project_id = req.projectId or sprint.project_id
-
-    story = UserStory(
-        sprint_id=req.sprintId,
-        project_id=project_id,
-        title=req.title.strip(),
-        description=req.description,
-        acceptance_criteria=req.acceptanceCriteria,
-        story_points=req.storyPoints,
-        tags=_serialise_tags(req.tags),
-    )
+    story = _new_story(req, sprint)
     session.add(story)
     session.flush()
+    sync_story_tags(session, story)
 
-    log_event(
-        session,
-        "user_story_created",
-        {
-            "storyId": story.id,
-            "sprintId": story.sprint_id,
-            "projectId": story.project_id,
-            "title": story.title,
-            "storyPoints": story.story_points,
-            "tags": _parse_tags(story.tags),
-        },
-        project_id=project_id,
-    )
+    log_event(session, "user_story_created", _created_payload(story), project_id=story.project_id)
     session.commit()
     session.refresh(story)
     return _story_to_dict(story)
 
 
+@router.post("/bulk")
+def bulk_import_stories(
+    sprintId: Optional[str] = None,
+    rows: List[Dict[str, Any]] = Depends(_import_rows),
+    session: Session = Depends(get_session),
+):
+    """
+    Create or update many stories in one transaction. A row with an `id`
+    updates that story (same fields as PATCH); any other row creates one in
+    its `sprintId`, or the sprintId query param. Either every row is applied
+    or none is: invalid rows are reported together with 422.
+    """
+    objects = [row for row in rows if isinstance(row, dict)]
+    update_ids = [row["id"] for row in objects if isinstance(row.get("id"), str)]
+    sprint_ids = [i for i in {sprintId, *(row.get("sprintId") for row in objects)} if isinstance(i, str)]
+    existing = {s.id: s for s in session.exec(select(UserStory).where(UserStory.id.in_(update_ids)))}
+    sprints = {s.id: s for s in session.exec(select(SprintDefinition).where(SprintDefinition.id.in_(sprint_ids)))}
+
+    plan: List[Tuple[int, Optional[UserStory], Any]] = []
+    errors = []
+    seen = set()
+    for index, row in enumerate(rows):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("Each story must be an object")
+            if row.get("id") is not None:
+                story = existing.get(row["id"])
+                if story is None or story.is_deleted:
+                    raise ValueError("Story not found")
+                if story.id in seen:
+                    raise ValueError("Story appears more than once")
+                seen.add(story.id)
+                plan.append((index, story, StoryUpdateRequest(**row)))
+            else:
+                req = StoryCreateRequest(**{"sprintId": sprintId, **row})
+                if req.sprintId not in sprints:
+                    raise ValueError("Sprint not found")
+                plan.append((index, None, req))
+        except ValidationError as exc:
+            errors.append({"index": index, "error": exc.errors(include_url=False, include_context=False)})
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    items = []
+    events = []
+    retagged = []
+    for index, story, req in plan:
+        if story is None:
+            story = _new_story(req, sprints[req.sprintId])
+            action = "created"
+            events.append(new_event("user_story_created", _created_payload(story), project_id=story.project_id))
+        else:
+            changed, story_events = _apply_update(story, req)
+            action = "updated" if changed else "unchanged"
+            events.extend(
+                new_event(event_type, payload, project_id=story.project_id) for event_type, payload in story_events
+            )
+        if action == "created" or req.tags is not None:
+            retagged.append(story)
+        session.add(story)
+        items.append({"index": index, "action": action, "id": story.id, "title": story.title})
+
+    session.flush()
+    sync_stories_tags(session, retagged)
+    log_events(session, events)
+    session.commit()
+    return {
+        "ok": True,
+        "count": len(items),
+        **{action: sum(1 for item in items if item["action"] == action) for action in ("created", "updated", "unchanged")},
+        "items": items,
+    }
+
+
 @router.get("/{story_id}")
 def get_story(story_id: str, session: Session = Depends(get_session)):
     story = session.get(UserStory, story_id)
@@ -188,44 +417,13 @@ def update_story(
     if not story or story.is_deleted:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    old_status = story.status
-    changed = False
-
-    if req.title is not None:
-        story.title = req.title.strip()
-        changed = True
-    if req.description is not None:
-        story.description = req.description
-        changed = True
-    if req.acceptanceCriteria is not None:
-        story.acceptance_criteria = req.acceptanceCriteria
-        changed = True
-    if req.storyPoints is not None:
-        story.story_points = req.storyPoints
-        changed = True
-    if req.status is not None and req.status != old_status:
-        story.status = req.status
-        changed = True
-    if req.tags is not None:
-        story.tags = _serialise_tags(req.tags)
-        changed = True
-
+    changed, events = _apply_update(story, req)
     if changed:
-        story.updated_at = datetime.now(timezone.utc)
         session.add(story)
-
-        if req.status is not None and req.status != old_status:
-            log_event(
-                session,
-                "user_story_status_changed",
-                {
-                    "storyId": story.id,
-                    "sprintId": story.sprint_id,
-                    "oldStatus": old_status,
-                    "newStatus": req.status,
-                },
-                project_id=story.project_id,
-            )
+        if req.tags is not None:
+            sync_story_tags(session, story)
+        for event_type, payload in events:
+            log_event(session, event_type, payload, project_id=story.project_id)
 
     session.commit()
     session.refresh(story)
@@ -1,12 +1,12 @@
 import uuid
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.db import get_session
 from app.services.events import log_event
-from app.models import EventLog
-import json
+from app.services.rollups import TODOS_MAX_PAGE_SIZE, decode_todo_cursor, list_todos
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
@@ -20,101 +20,39 @@ class CompleteTodoRequest(BaseModel):
     completionDate: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
 
 
-def _parse_payload(event: EventLog) -> dict:
-    return json.loads(event.payload)
-
-
 def _build_todos_for_date(session: Session, date_str: str) -> List[dict]:
     """
-    Replay todo events to build the list of todos visible on a given date.
-    A todo is visible on its creation date.
-    A todo is marked completed on the completionDate logged in todo_completed.
-    A todo is removed if a todo_deleted event exists for it.
+    Todos created on date_str, in the order they were added. Deleted todos are
+    left out; a date_str that is not a date matches nothing.
     """
-    # Fetch all todo events ordered by time
-    events = session.exec(
-        select(EventLog)
-        .where(EventLog.type.in_(["todo_added", "todo_completed", "todo_uncompleted", "todo_deleted"]))
-        .order_by(EventLog.ts)
-    ).all()
-
-    todos: dict[str, dict] = {}
-    deleted_ids: set[str] = set()
-
-    for evt in events:
-        p = _parse_payload(evt)
-        todo_id = p.get("todoId")
-        if not todo_id:
-            continue
-
-        if evt.type == "todo_added":
-            if p.get("date") == date_str:
-                todos[todo_id] = {
-                    "todoId": todo_id,
-                    "text": p.get("text", ""),
-                    "date": p.get("date"),
-                    "completed": False,
-                    "completionDate": None,
-                }
-        elif evt.type == "todo_completed":
-            if todo_id in todos:
-                todos[todo_id]["completed"] = True
-                todos[todo_id]["completionDate"] = p.get("completionDate")
-        elif evt.type == "todo_uncompleted":
-            if todo_id in todos:
-                todos[todo_id]["completed"] = False
-                todos[todo_id]["completionDate"] = None
-        elif evt.type == "todo_deleted":
-            deleted_ids.add(todo_id)
-
-    return [t for tid, t in todos.items() if tid not in deleted_ids]
-
-
-def _build_all_todos(session: Session) -> List[dict]:
-    """Replay all todo events and return every non-deleted todo across all dates."""
-    events = session.exec(
-        select(EventLog)
-        .where(EventLog.type.in_(["todo_added", "todo_completed", "todo_uncompleted", "todo_deleted"]))
-        .order_by(EventLog.ts)
-    ).all()
-
-    todos: dict[str, dict] = {}
-    deleted_ids: set[str] = set()
-
-    for evt in events:
-        p = _parse_payload(evt)
-        todo_id = p.get("todoId")
-        if not todo_id:
-            continue
-
-        if evt.type == "todo_added":
-            todos[todo_id] = {
-                "todoId": todo_id,
-                "text": p.get("text", ""),
-                "date": p.get("date"),
-                "completed": False,
-                "completionDate": None,
-            }
-        elif evt.type == "todo_completed":
-            if todo_id in todos:
-                todos[todo_id]["completed"] = True
-                todos[todo_id]["completionDate"] = p.get("completionDate")
-        elif evt.type == "todo_uncompleted":
-            if todo_id in todos:
-                todos[todo_id]["completed"] = False
-                todos[todo_id]["completionDate"] = None
-        elif evt.type == "todo_deleted":
-            deleted_ids.add(todo_id)
-
-    return [t for tid, t in todos.items() if tid not in deleted_ids]
+    try:
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        return []
+    return list_todos(session, day, day)["todos"]
 
 
 @router.get("")
-def list_all_todos(session: Session = Depends(get_session)):
-    """Return all todos across all dates, sorted by date desc."""
-    todos = _build_all_todos(session)
-    todos.sort(key=lambda t: t.get("date") or "", reverse=True)
-    return {"todos": todos}
+def list_all_todos(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    completed: Optional[bool] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=TODOS_MAX_PAGE_SIZE),
+    session: Session = Depends(get_session),
+):
+    """
+    Todos across all dates, newest date first. Optional from / to (inclusive)
+    and completed filters; pass limit to page, then nextCursor as after.
+    """
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if after:
+        try:
+            decode_todo_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return list_todos(session, from_date, to_date, completed, after, limit)
 
 
 @router.post("")
@@ -0,0 +1,301 @@
+"""
+Event log archive — monthly partitions for settled history.
+
+archive_events() moves events logged before a horizon out of event_log into
+one table per calendar month (event_log_archive_YYYYMM, same columns) and
+records each table in event_log_partitions. compact_settled_todos() then
+replaces the archived history of every settled todo with a single
+todo_settled event carrying its terminal state — unless that would change a
+rollup (see _completions).
+
+Readers never name a partition:
+
+  - event_tables() lists the archive tables, oldest first, followed by
+    event_log, for consumers that walk the log in (ts, id) order. Archived
+    months are strictly older than anything left in event_log, so walking the
+    tables in turn is the same as walking one table.
+  - all_events() is the UNION ALL of the same tables, for keyed lookups.
+"""
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, literal, union_all
+from sqlmodel import Session, select
+
+from app.models import EventLog, EventLogPartition, FinancialYear, RollupSnapshot, SprintDefinition
+from app.services.events import payload_columns
+
+ARCHIVE_TABLE_PREFIX = "event_log_archive_"
+
+TODO_HISTORY_TYPES = ["todo_added", "todo_completed", "todo_uncompleted", "todo_deleted", "todo_settled"]
+
+EVENT_COLUMNS = [c.name for c in EventLog.__table__.columns]
+
+_archive_metadata = MetaData()
+
+
+def naive_utc(dt: datetime) -> datetime:
+    """event_log timestamps are stored (and read back) as naive UTC."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def archive_table(table_name: str) -> Table:
+    """The Table for one monthly archive, built once per process."""
+    table = _archive_metadata.tables.get(table_name)
+    if table is not None:
+        return table
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+        for c in EventLog.__table__.columns
+    ]
+    table = Table(table_name, _archive_metadata, *columns)
+    Index(f"ix_{table_name}_ts_id", table.c.ts, table.c.id)
+    Index(f"ix_{table_name}_type_payload_date", table.c.type, table.c.payload_date)
+    Index(f"ix_{table_name}_type_todo_id", table.c.type, table.c.todo_id)
+    Index(f"ix_{table_name}_type_sprint_id", table.c.type, table.c.sprint_id)
+    return table
+
+
+def _month_table_name(ts: datetime) -> str:
+    return f"{ARCHIVE_TABLE_PREFIX}{ts.year:04d}{ts.month:02d}"
+
+
+def _next_month(ts: datetime) -> datetime:
+    first = ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (first + timedelta(days=32)).replace(day=1)
+
+
+def event_tables(session: Session) -> List[Table]:
+    """Archive tables (oldest month first), then the live event_log."""
+    names = session.exec(select(EventLogPartition.table_name).order_by(EventLogPartition.month)).all()
+    return [archive_table(name) for name in names] + [EventLog.__table__]
+
+
+def all_events(session: Session):
+    """event_log and every archive as one selectable with event_log's columns."""
+    tables = event_tables(session)
+    if len(tables) == 1:
+        return EventLog.__table__
+    selects = [select(*[t.c[name] for name in EVENT_COLUMNS]) for t in tables]
+    return union_all(*selects).subquery("event_log_all")
+
+
+# ── Horizons ─────────────────────────────────────────────────────────────────
+
+def _start_of_day(d: date) -> datetime:
+    return datetime.combine(d, time.min)
+
+
+def horizon_before_current_financial_year(session: Session, today: Optional[date] = None) -> Optional[datetime]:
+    """Start of the current financial year: everything logged in earlier years is settled."""
+    today = today or date.today()
+    current = session.exec(select(FinancialYear).where(FinancialYear.is_current == True)).first()  # noqa: E712
+    if current is None:
+        current = session.exec(
+            select(FinancialYear)
+            .where(FinancialYear.start_date <= today)
+            .where(FinancialYear.end_date >= today)
+        ).first()
+    return _start_of_day(current.start_date) if current else None
+
+
+def horizon_after_closed_sprints(session: Session) -> Optional[datetime]:
+    """
+    Day after the last closed sprint, but never past the start of a sprint
+    that is still open.
+    """
+    last_closed_end = session.exec(
+        select(func.max(SprintDefinition.end_date)).where(SprintDefinition.is_closed == True)  # noqa: E712
+    ).first()
+    if last_closed_end is None:
+        return None
+    horizon = last_closed_end + timedelta(days=1)
+    first_open_start = session.exec(
+        select(func.min(SprintDefinition.start_date))
+        .where(SprintDefinition.is_closed == False)  # noqa: E712
+        .where(SprintDefinition.is_archived == False)  # noqa: E712
+    ).first()
+    if first_open_start is not None and first_open_start < horizon:
+        horizon = first_open_start
+    return _start_of_day(horizon)
+
+
+# ── Archiving ────────────────────────────────────────────────────────────────
+
+def _refresh_partition(session: Session, table: Table) -> EventLogPartition:
+    count, min_ts, max_ts = session.exec(
+        select(func.count(), func.min(table.c.ts), func.max(table.c.ts))
+    ).one()
+    partition = session.get(EventLogPartition, table.name)
+    if partition is None:
+        partition = EventLogPartition(table_name=table.name, month=f"{table.name[-6:-2]}-{table.name[-2:]}")
+    partition.event_count = count
+    partition.min_ts = min_ts
+    partition.max_ts = max_ts
+    partition.archived_at = datetime.now(timezone.utc)
+    session.add(partition)
+    return partition
+
+
+def archive_events(session: Session, before: datetime) -> List[Dict[str, Any]]:
+    """
+    Move every event logged before `before` into its monthly archive table.
+    Each month is moved in its own transaction. Returns one entry per month.
+    """
+    before = naive_utc(before)
+    live = EventLog.__table__
+    moved: List[Dict[str, Any]] = []
+
+    while True:
+        oldest = session.exec(select(func.min(live.c.ts)).where(live.c.ts < before)).first()
+        if oldest is None:
+            break
+        month_start = oldest.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = min(_next_month(oldest), before)
+
+        table = archive_table(_month_table_name(oldest))
+        table.create(session.connection(), checkfirst=True)
+        in_month = (live.c.ts >= month_start) & (live.c.ts < month_end)
+        result = session.exec(
+            insert(table).from_select(EVENT_COLUMNS, select(*[live.c[name] for name in EVENT_COLUMNS]).where(in_month))
+        )
+        session.exec(delete(live).where(in_month))
+        partition = _refresh_partition(session, table)
+        session.commit()
+        moved.append({"table": table.name, "month": partition.month, "moved": result.rowcount})
+
+    return moved
+
+
+def restore_archives(session: Session) -> int:
+    """Move every archived event back into event_log and drop the archives."""
+    live = EventLog.__table__
+    restored = 0
+    for table in event_tables(session)[:-1]:
+        result = session.exec(
+            insert(live).from_select(EVENT_COLUMNS, select(*[table.c[name] for name in EVENT_COLUMNS]))
+        )
+        restored += result.rowcount
+        session.exec(delete(EventLogPartition).where(EventLogPartition.table_name == table.name))
+        table.drop(session.connection())
+        session.commit()
+    return restored
+
+
+# ── Compaction ───────────────────────────────────────────────────────────────
+
+def _settle_todo(history: List[Any]) -> Optional[Dict[str, Any]]:
+    """Fold one todo's events into its terminal state (None if it was never added)."""
+    state: Optional[Dict[str, Any]] = None
+    settled_ts = completed_ts = None
+    for event in history:
+        p = json.loads(event.payload)
+        if event.type in ("todo_added", "todo_settled"):
+            state = {
+                "todoId": p["todoId"],
+                "text": p.get("text", ""),
+                "date": p.get("date"),
+                "addedAt": p.get("addedAt") or event.ts.isoformat(),
+                "completed": bool(p.get("completed", False)),
+                "completionDate": p.get("completionDate"),
+                "deleted": bool(p.get("deleted", False)) or (state or {}).get("deleted", False),
+            }
+            if state["completed"]:
+                completed_ts = event.ts
+        elif state is None:
+            continue
+        elif event.type == "todo_completed":
+            state["completed"] = True
+            state["completionDate"] = p.get("completionDate")
+            completed_ts = event.ts
+        elif event.type == "todo_uncompleted":
+            state["completed"] = False
+            state["completionDate"] = None
+            completed_ts = None
+        elif event.type == "todo_deleted":
+            state["deleted"] = True
+        settled_ts = event.ts
+    if state is None:
+        return None
+    # A completed todo keeps the time of its (last) completion so period
+    # rollups still count it in the right window.
+    return {"payload": state, "ts": completed_ts or settled_ts}
+
+
+def _completions(history: List[Any]) -> int:
+    """Completions a period rollup counts for this history (see snapshots.fold_period_event)."""
+    return sum(
+        1 for event in history
+        if event.type == "todo_completed"
+        or (event.type == "todo_settled" and json.loads(event.payload).get("completed"))
+    )
+
+
+def compact_settled_todos(session: Session) -> int:
+    """
+    Replace the archived history of every settled todo — one with no events
+    left in event_log — by a single todo_settled event. Returns the number of
+    events removed.
+
+    Period rollups count every todo_completed event, and a todo_settled event
+    once if it ended completed, so a history with completion churn (completed
+    twice, or completed then uncompleted) is left as it is.
+    """
+    archives = event_tables(session)[:-1]
+    if not archives:
+        return 0
+    live_todo_ids = select(EventLog.todo_id).where(EventLog.todo_id.is_not(None))
+
+    histories: Dict[str, List[Any]] = {}
+    for table in archives:
+        rows = session.exec(
+            select(*table.c, literal(table.name).label("partition"))
+            .where(table.c.type.in_(TODO_HISTORY_TYPES))
+            .where(table.c.todo_id.is_not(None))
+            .where(table.c.todo_id.not_in(live_todo_ids))
+            .order_by(table.c.ts, table.c.id)
+        ).all()
+        for row in rows:
+            histories.setdefault(row.todo_id, []).append(row)
+
+    removed = 0
+    touched = set()
+    for todo_id, history in histories.items():
+        if len(history) == 1 and history[0].type == "todo_settled":
+            continue
+        settled = _settle_todo(history)
+        if settled is None or _completions(history) != int(settled["payload"]["completed"]):
+            continue
+        for row in history:
+            table = archive_table(row.partition)
+            session.exec(delete(table).where(table.c.id == row.id))
+            touched.add(row.partition)
+        target = archive_table(_month_table_name(settled["ts"]))
+        session.exec(insert(target).values(
+            id=history[0].id,
+            project_id=None,
+            ts=settled["ts"],
+            occurred_at=settled["ts"],
+            type="todo_settled",
+            payload=json.dumps(settled["payload"]),
+            **payload_columns(settled["payload"]),
+        ))
+        touched.add(target.name)
+        removed += len(history) - 1
+
+    for name in touched:
+        _refresh_partition(session, archive_table(name))
+    if removed:
+        from app.services.rollup_cache import note_everything  # local import to avoid a cycle
+
+        # The archived log was rewritten: drop snapshots and cached rollups
+        # rather than trust them. note_everything also bumps the
+        # persisted "*" scope version, which is how an API server running in
+        # another process learns to drop its cache (rollup_cache.cached).
+        session.exec(delete(RollupSnapshot))
+        note_everything(session)
+    session.commit()
+    return removed
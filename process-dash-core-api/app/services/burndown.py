@@ -0,0 +1,235 @@
+"""
+Sprint burndown — daily remaining work from the sprint_story_states projection.
+
+log_event() folds each user_story_* event into sprint_story_states in the same
+transaction (see projections.apply_event). A story's history in its sprint is
+a chain of intervals, each holding its status and points from the event that
+opened it until the next one:
+
+  - user_story_created opens the first interval (TODO, storyPoints)
+  - user_story_status_changed / user_story_points_changed close the current
+    interval and open one with the new status / points
+  - user_story_deleted moves the story to DELETED; user_story_carried_forward
+    moves the original to CARRIED_OVER and opens the copy in its new sprint
+  - follow-up events only apply to a story that has already been created
+
+A story is in scope while TODO, IN_PROGRESS or DONE, and remaining while TODO
+or IN_PROGRESS. get_sprint_burndown() reads one sprint's intervals and sweeps
+them once over the sprint's days, so a request never replays the log.
+Event timestamps are UTC; a day's figures are the state at the end of it.
+"""
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models import SprintDefinition, SprintStoryState
+
+STORY_EVENT_TYPES = [
+    "user_story_created", "user_story_status_changed", "user_story_points_changed",
+    "user_story_deleted", "user_story_carried_forward",
+]
+
+IN_SCOPE_STATUSES = {"TODO", "IN_PROGRESS", "DONE"}
+REMAINING_STATUSES = {"TODO", "IN_PROGRESS"}
+
+_REBUILD_YIELD_PER = 1000
+
+
+def story_event_ids(p: dict) -> List[str]:
+    """The story ids an event's payload refers to."""
+    keys = ("storyId", "originalStoryId", "newStoryId")
+    return [p[k] for k in keys if isinstance(p.get(k), str)]
+
+
+def preload_story_states(session: Session, story_ids: Iterable[str], rows: Dict[Tuple[type, str], Any]) -> None:
+    """
+    Load the current interval of each story into `rows` (see
+    projections.apply_events), marking stories without one as None so the
+    cache stays complete for them.
+    """
+    story_ids = set(story_ids)
+    if not story_ids:
+        return
+    for story_id in story_ids:
+        rows[(SprintStoryState, story_id)] = None
+    current = session.exec(
+        select(SprintStoryState)
+        .where(SprintStoryState.story_id.in_(story_ids))
+        .where(SprintStoryState.valid_to == None)  # noqa: E711
+    ).all()
+    for state in current:
+        rows[(SprintStoryState, state.story_id)] = state
+
+
+def _current(session: Session, story_id: str, rows: Optional[dict]) -> Optional[SprintStoryState]:
+    if rows is not None and (SprintStoryState, story_id) in rows:
+        return rows[(SprintStoryState, story_id)]
+    return session.exec(
+        select(SprintStoryState)
+        .where(SprintStoryState.story_id == story_id)
+        .where(SprintStoryState.valid_to == None)  # noqa: E711
+    ).first()
+
+
+def _open(session: Session, rows: Optional[dict], sprint_id: str, story_id: str, status: str, points: int, ts: datetime) -> None:
+    state = SprintStoryState(sprint_id=sprint_id, story_id=story_id, status=status, points=points, valid_from=ts)
+    session.add(state)
+    if rows is not None:
+        rows[(SprintStoryState, story_id)] = state
+
+
+def _transition(session: Session, rows: Optional[dict], story_id: str, ts: datetime, **changes: Any) -> Optional[SprintStoryState]:
+    """Close a story's current interval and open one with `changes` applied."""
+    state = _current(session, story_id, rows)
+    if state is None:
+        return None
+    if all(getattr(state, k) == v for k, v in changes.items()):
+        return state
+    state.valid_to = ts
+    session.add(state)
+    values = {"status": state.status, "points": state.points, **changes}
+    _open(session, rows, state.sprint_id, story_id, values["status"], values["points"], ts)
+    return state
+
+
+def apply_story_event(session: Session, event: Any, p: dict, rows: Optional[dict] = None) -> None:
+    """
+    Fold one user_story_* event into sprint_story_states. `rows` is the same
+    optional, complete cache projections.apply_event uses for day rows.
+    """
+    from app.services.archive import naive_utc  # local import to avoid a cycle
+
+    ts = naive_utc(event.ts)
+    if event.type == "user_story_created":
+        story_id, sprint_id = p.get("storyId"), p.get("sprintId")
+        if not story_id or not sprint_id:
+            return
+        state = _current(session, story_id, rows)
+        if state is not None:
+            state.valid_to = ts
+            session.add(state)
+        _open(session, rows, sprint_id, story_id, "TODO", p.get("storyPoints") or 0, ts)
+    elif event.type == "user_story_status_changed" and p.get("storyId") and p.get("newStatus"):
+        _transition(session, rows, p["storyId"], ts, status=p["newStatus"])
+    elif event.type == "user_story_points_changed" and p.get("storyId"):
+        _transition(session, rows, p["storyId"], ts, points=p.get("newPoints") or 0)
+    elif event.type == "user_story_deleted" and p.get("storyId"):
+        _transition(session, rows, p["storyId"], ts, status="DELETED")
+    elif event.type == "user_story_carried_forward" and p.get("originalStoryId"):
+        original = _transition(session, rows, p["originalStoryId"], ts, status="CARRIED_OVER")
+        if p.get("newStoryId") and p.get("toSprintId"):
+            points = p["storyPoints"] if "storyPoints" in p else (original.points if original else 0)
+            _open(session, rows, p["toSprintId"], p["newStoryId"], "TODO", points or 0, ts)
+
+
+def rebuild_story_states(session: Session, tables: Optional[List[Any]] = None) -> int:
+    """
+    Drop sprint_story_states and replay the story events, oldest first.
+    Does not commit; returns the number of events replayed.
+    """
+    from app.services.archive import event_tables  # local import to avoid a cycle
+    from app.services.rollup_cache import note_everything
+
+    note_everything(session)
+    session.exec(delete(SprintStoryState))
+    session.flush()
+
+    rows: Dict[Tuple[type, str], Any] = {}
+    replayed = 0
+    with session.no_autoflush:
+        for table in tables if tables is not None else event_tables(session):
+            events = session.exec(
+                select(table.c.type, table.c.payload, table.c.ts)
+                .where(table.c.type.in_(STORY_EVENT_TYPES))
+                .order_by(table.c.ts, table.c.id)
+                .execution_options(yield_per=_REBUILD_YIELD_PER)
+            )
+            for event in events:
+                p = json.loads(event.payload)
+                # The table starts empty, so unknown stories have no interval yet.
+                for story_id in story_event_ids(p):
+                    rows.setdefault((SprintStoryState, story_id), None)
+                apply_story_event(session, event, p, rows)
+                replayed += 1
+    return replayed
+
+
+# ── Burndown ─────────────────────────────────────────────────────────────────
+
+def _scope(state: Optional[SprintStoryState]) -> Tuple[bool, int]:
+    """(in scope, points counted towards scope) for an interval."""
+    if state is None or state.status not in IN_SCOPE_STATUSES:
+        return False, 0
+    return True, state.points
+
+
+def _scope_change(story_id: str, day: date, before: Optional[SprintStoryState], after: SprintStoryState) -> Optional[Dict[str, Any]]:
+    was_in, old_points = _scope(before)
+    is_in, new_points = _scope(after)
+    if was_in == is_in and old_points == new_points:
+        return None
+    change = "reestimated" if was_in and is_in else ("added" if is_in else "removed")
+    return {"date": day.isoformat(), "storyId": story_id, "change": change, "pointsDelta": new_points - old_points}
+
+
+def get_sprint_burndown(session: Session, sprint: SprintDefinition, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Daily scope, remaining and completed points / stories over a sprint's
+    days, plus the scope changes made after its first day. Days after
+    `today` (UTC) carry None.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    states = session.exec(
+        select(SprintStoryState)
+        .where(SprintStoryState.sprint_id == sprint.id)
+        .order_by(SprintStoryState.valid_from, SprintStoryState.id)
+    ).all()
+
+    current: Dict[str, SprintStoryState] = {}
+    scope_changes: List[Dict[str, Any]] = []
+    days: List[Dict[str, Any]] = []
+    pending = iter(states)
+    upcoming = next(pending, None)
+    day = sprint.start_date
+    while day <= sprint.end_date:
+        if day > today:
+            days.append({
+                "date": day.isoformat(), "scopePoints": None, "scopeStories": None,
+                "remainingPoints": None, "remainingStories": None,
+                "completedPoints": None, "completedStories": None,
+            })
+            day += timedelta(days=1)
+            continue
+        end_of_day = datetime.combine(day + timedelta(days=1), time.min)
+        while upcoming is not None and upcoming.valid_from < end_of_day:
+            if day > sprint.start_date:
+                marker = _scope_change(upcoming.story_id, day, current.get(upcoming.story_id), upcoming)
+                if marker:
+                    scope_changes.append(marker)
+            current[upcoming.story_id] = upcoming
+            upcoming = next(pending, None)
+
+        in_scope = [s for s in current.values() if s.status in IN_SCOPE_STATUSES]
+        remaining = [s for s in in_scope if s.status in REMAINING_STATUSES]
+        done = [s for s in in_scope if s.status not in REMAINING_STATUSES]
+        days.append({
+            "date": day.isoformat(),
+            "scopePoints": sum(s.points for s in in_scope),
+            "scopeStories": len(in_scope),
+            "remainingPoints": sum(s.points for s in remaining),
+            "remainingStories": len(remaining),
+            "completedPoints": sum(s.points for s in done),
+            "completedStories": len(done),
+        })
+        day += timedelta(days=1)
+
+    return {
+        "sprintId": sprint.id,
+        "startDate": sprint.start_date.isoformat(),
+        "endDate": sprint.end_date.isoformat(),
+        "days": days,
+        "scopeChanges": scope_changes,
+    }
@@ -0,0 +1,226 @@
+"""
+Columnar period metrics — an optional pandas engine for period rollups.
+
+The default engine folds period events into dicts one at a time (see
+snapshots.fold_period_event), decoding each payload with json.loads. This
+engine instead loads the fields it needs into columns once — blockId, date
+and storyId from event_log's denormalized columns, the rest through SQLite's
+json_extract — and derives block state with group-bys, following the same
+rules:
+
+  - a block event counts only once the block has been started in the scope;
+    a start resets the block, so its final state is given by the events from
+    its last start on
+  - every interruption of a started block counts towards its reason code,
+    even when the block is restarted afterwards
+  - blocks keep the order of their first start
+
+It returns the same shape and values as rollups._compute_period_metrics.
+It always reads the window from the log and never uses rollup snapshots.
+
+pandas is not a hard dependency: set WORKOBS_METRICS_ENGINE=pandas to
+require it, or "auto" to use it whenever it is installed.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, or_
+from sqlmodel import Session, select
+
+from app.services.archive import event_tables, naive_utc
+from app.services.snapshots import PERIOD_EVENT_TYPES, TODO_PERIOD_EVENT_TYPES
+from app.services.time_buckets import bucket_minutes_to_label, bucket_total_day
+from app.settings import settings
+
+try:
+    import pandas as pd
+except ImportError:  # optional: pip install pandas
+    pd = None
+
+AVAILABLE = pd is not None
+
+ENGINES = ("python", "pandas", "auto")
+
+_STARTED, _INTERRUPTED, _ENDED = "intent_block_started", "intent_block_interrupted", "intent_block_ended"
+_BLOCK_TYPES = [_STARTED, _INTERRUPTED, _ENDED]
+
+# Payload keys read by the fold: denormalized event_log columns, then keys
+# without a column of their own, extracted only for the event types that use them.
+_DENORMALIZED = {"blockId": "block_id", "storyId": "story_id", "date": "payload_date"}
+_EXTRACTED = {
+    "intent": [_STARTED],
+    "notes": [_STARTED],
+    "reasonCode": [_INTERRUPTED],
+    "durationMinutes": [_ENDED, "recovery_block_ended"],
+    "actualOutcome": [_ENDED],
+    "completed": ["todo_settled"],
+}
+_COLUMNS = ["type", "project_id", *_DENORMALIZED, *_EXTRACTED]
+
+# Keys of a block dict, as built by snapshots._fold_scope.
+_BLOCK_KEYS = [
+    "blockId", "storyId", "intent", "notes", "date", "interrupted",
+    "durationMinutes", "reasonCode", "actualOutcome", "durationLabel",
+]
+
+
+def enabled() -> bool:
+    """True when WORKOBS_METRICS_ENGINE selects this engine."""
+    engine = settings.WORKOBS_METRICS_ENGINE.lower()
+    if engine not in ENGINES:
+        raise RuntimeError(
+            f"WORKOBS_METRICS_ENGINE must be 'python', 'pandas' or 'auto', got {settings.WORKOBS_METRICS_ENGINE!r}"
+        )
+    if engine == "pandas" and not AVAILABLE:
+        raise RuntimeError("WORKOBS_METRICS_ENGINE=pandas requires pandas (pip install pandas)")
+    return engine == "pandas" or (engine == "auto" and AVAILABLE)
+
+
+def load_period_events(
+    session: Session,
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[str] = None,
+) -> "pd.DataFrame":
+    """
+    Period events logged in [start_date, end_date) as one frame in (ts, id)
+    order, one column per payload field (object dtype, raw values). With
+    project_id, block and recovery events are limited to that project.
+    """
+    frames = []
+    for table in event_tables(session):
+        c = table.c
+        query = (
+            select(
+                c.type,
+                c.project_id,
+                *[c[column] for column in _DENORMALIZED.values()],
+                *[
+                    case((c.type.in_(types), func.json_extract(c.payload, f"$.{key}")))
+                    for key, types in _EXTRACTED.items()
+                ],
+            )
+            .where(c.type.in_(PERIOD_EVENT_TYPES))
+            .where(c.ts >= naive_utc(start_date))
+            .where(c.ts < naive_utc(end_date))
+            .order_by(c.ts, c.id)
+        )
+        if project_id:
+            query = query.where(or_(c.project_id == project_id, c.type.in_(TODO_PERIOD_EVENT_TYPES)))
+        rows = session.execute(query).all()
+        if rows:
+            frames.append(pd.DataFrame(rows, columns=_COLUMNS, dtype=object))
+    if not frames:
+        return pd.DataFrame(columns=_COLUMNS, dtype=object)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _todos_completed(events: "pd.DataFrame") -> int:
+    todos = events[events["type"].isin(TODO_PERIOD_EVENT_TYPES)]
+    return int(((todos["type"] == "todo_completed") | todos["completed"].astype(bool)).sum())
+
+
+def _last_per_block(frame: "pd.DataFrame") -> "pd.DataFrame":
+    return frame.drop_duplicates("blockId", keep="last").set_index("blockId")
+
+
+def _column(frame: "pd.DataFrame", name: str, index: "pd.Index", default: Any = None) -> List[Any]:
+    """frame[name] aligned to index, with `default` for missing blocks."""
+    present = index.isin(frame.index)
+    values = frame[name].reindex(index).astype(object)
+    return values.where(present, default).tolist()
+
+
+def _scope_metrics(events: "pd.DataFrame", todos_completed: int) -> Dict[str, Any]:
+    """Metrics for one scope's block and recovery events (see module docstring)."""
+    recovery = events[events["type"] == "recovery_block_ended"]
+    recovery_minutes = pd.to_numeric(recovery["durationMinutes"], errors="coerce").fillna(0).sum()
+
+    blocks = events[events["type"].isin(_BLOCK_TYPES) & events["blockId"].notna() & (events["blockId"] != "")]
+    is_start = blocks["type"] == _STARTED
+    # Position of the latest start of the same block at or before each event.
+    start_pos = pd.Series(blocks.index, index=blocks.index).where(is_start)
+    start_pos = start_pos.groupby(blocks["blockId"], sort=False).ffill()
+    started = blocks[start_pos.notna()]
+    start_pos = start_pos[started.index]
+
+    interrupts = started[started["type"] == _INTERRUPTED]
+    codes = interrupts["reasonCode"][interrupts["reasonCode"].notna() & (interrupts["reasonCode"] != "")]
+    fragmenters = codes.groupby(codes, sort=False).size()
+
+    # The events from each block's last start on decide its final state.
+    segment = started[start_pos == start_pos.groupby(started["blockId"], sort=False).transform("max")]
+    order = pd.Index(blocks.loc[is_start, "blockId"].drop_duplicates(), dtype=object)
+    last_start = _last_per_block(segment[segment["type"] == _STARTED])
+    last_interrupt = _last_per_block(segment[segment["type"] == _INTERRUPTED])
+    last_end = _last_per_block(segment[segment["type"] == _ENDED])
+
+    interrupted = order.isin(last_interrupt.index)
+    ended = order.isin(last_end.index)
+    durations = [d or 0 for d in _column(last_end, "durationMinutes", order, 0)]
+    minutes = pd.to_numeric(pd.Series(durations, dtype=object)) if durations else pd.Series([], dtype="int64")
+    labels = {d: bucket_minutes_to_label(d) or "" for d in set(durations)}
+
+    block_columns = {
+        "blockId": list(order),
+        "storyId": _column(last_start, "storyId", order),
+        "intent": _column(last_start, "intent", order),
+        "notes": _column(last_start, "notes", order),
+        "date": _column(last_start, "date", order),
+        "interrupted": interrupted.tolist(),
+        "durationMinutes": durations,
+        "reasonCode": _column(last_interrupt, "reasonCode", order),
+        "actualOutcome": _column(last_end, "actualOutcome", order),
+        "durationLabel": [labels[d] if e else "" for d, e in zip(durations, ended)],
+    }
+    blocks_list = [dict(zip(_BLOCK_KEYS, values)) for values in zip(*(block_columns[k] for k in _BLOCK_KEYS))]
+
+    total_blocks = len(order)
+    interrupted_blocks = int(interrupted.sum())
+    focus_blocks = int(((~interrupted) & (minutes >= 30).to_numpy()).sum())
+    total_active_minutes = minutes.sum().item() if total_blocks else 0
+    top_fragmenters = [{"code": k, "count": int(v)} for k, v in fragmenters.items()]
+    top_fragmenters.sort(key=lambda x: x["count"], reverse=True)
+
+    return {
+        "totalBlocks": total_blocks,
+        "interruptedBlocks": interrupted_blocks,
+        "fragmentationRate": round(interrupted_blocks / total_blocks, 2) if total_blocks else 0.0,
+        "focusBlocks": focus_blocks,
+        "topFragmenters": top_fragmenters,
+        "totalActiveMinutes": total_active_minutes,
+        "totalActiveLabel": bucket_total_day(total_active_minutes),
+        "totalRecoveryMinutes": int(recovery_minutes),
+        "totalRecoveryLabel": bucket_total_day(int(recovery_minutes)) if recovery_minutes > 0 else "~0 mins",
+        "todosCompleted": todos_completed,
+        "blocks": blocks_list,
+    }
+
+
+def period_metrics(
+    session: Session,
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Block, recovery and todo metrics for [start_date, end_date), optionally for one project."""
+    events = load_period_events(session, start_date, end_date, project_id)
+    scope = events[~events["type"].isin(TODO_PERIOD_EVENT_TYPES)]
+    if project_id:
+        scope = scope[scope["project_id"] == project_id]
+    return _scope_metrics(scope, _todos_completed(events))
+
+
+def projects_period_metrics(
+    session: Session,
+    start_date: datetime,
+    end_date: datetime,
+    project_ids: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """period_metrics for each of project_ids from a single load of the window."""
+    events = load_period_events(session, start_date, end_date)
+    todos_completed = _todos_completed(events)
+    scoped = events[~events["type"].isin(TODO_PERIOD_EVENT_TYPES) & events["project_id"].isin(project_ids)]
+    by_project = {pid: frame for pid, frame in scoped.groupby("project_id", sort=False)}
+    empty = events.iloc[0:0]
+    return {pid: _scope_metrics(by_project.get(pid, empty), todos_completed) for pid in project_ids}
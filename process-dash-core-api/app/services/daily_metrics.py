@@ -0,0 +1,203 @@
+"""
+Daily metrics cube — one row per (date, project, reason code).
+
+Every day projection row contributes to the cells of its day:
+
+  - a DayBlock to (date, project, ""): one block, interrupted / focus flags,
+    its active minutes and (for a focus block) its focus minutes; and to
+    (date, project, reason code) its interruptions with that code, so that
+    topFragmenters counts every interruption, as the period rollups do
+  - a DayRecovery to (date, "", ""): its recovery minutes
+  - a completed, not deleted DayTodo to (completionDate, "", ""): one
+    completed todo
+
+apply_event() takes a block / recovery / todo's contribution before and
+after the event and upserts the difference, so the cube moves in the same
+transaction as the projections. rebuild_daily_metrics() recomputes it from
+the projection tables.
+
+Range questions (a week, a month, a sprint, a financial year) are then a sum
+over the cube's rows instead of a replay of the log. Blocks and recovery are
+placed on the day they belong to (their start payload's date), not on the
+time their events were logged.
+"""
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.models import DailyMetric, DayBlock, DayRecovery, DayTodo
+from app.services.time_buckets import bucket_total_day
+
+METRIC_COLUMNS = [
+    "blocks", "interrupted_blocks", "focus_blocks", "active_minutes", "focus_minutes",
+    "recovery_minutes", "todos_completed", "interruptions",
+]
+
+# Minimum uninterrupted duration for a block to count as focus (as in the day rollup).
+FOCUS_MINUTES = 30
+
+Cell = Tuple[str, str, str]                      # (date, project_id, reason_code)
+Contribution = Tuple[Tuple[Cell, Tuple[int, ...]], ...]
+
+_REBUILD_YIELD_PER = 1000
+
+
+def contribution(row: Any) -> Contribution:
+    """The cells a projection row counts towards and the amounts it adds to each."""
+    if row is None:
+        return ()
+    if isinstance(row, DayBlock):
+        minutes = int(row.duration_minutes or 0)
+        focus = not row.interrupted and minutes >= FOCUS_MINUTES
+        project = row.project_id or ""
+        interruptions = json.loads(row.interruptions or "{}")
+        return (
+            ((row.date, project, ""), (
+                1, int(bool(row.interrupted)), int(focus), minutes, minutes if focus else 0, 0, 0, 0,
+            )),
+            *(((row.date, project, code), (0, 0, 0, 0, 0, 0, 0, n)) for code, n in sorted(interruptions.items())),
+        )
+    if isinstance(row, DayRecovery):
+        return (((row.date, "", ""), (0, 0, 0, 0, 0, int(row.duration_minutes or 0), 0, 0)),)
+    if isinstance(row, DayTodo):
+        if not row.completed or row.deleted or not row.completion_date:
+            return ()
+        return (((row.completion_date, "", ""), (0, 0, 0, 0, 0, 0, 1, 0)),)
+    return ()
+
+
+def add_delta(deltas: Dict[Cell, List[int]], before: Contribution, after: Contribution) -> None:
+    """Accumulate `after - before` into per-cell deltas."""
+    if before == after:
+        return
+    for items, sign in ((before, -1), (after, 1)):
+        for cell, amounts in items:
+            total = deltas.setdefault(cell, [0] * len(METRIC_COLUMNS))
+            for i, amount in enumerate(amounts):
+                total[i] += sign * amount
+
+
+def _cell_rows(cells: Dict[Cell, List[int]]) -> List[Dict[str, Any]]:
+    return [
+        {"date": d, "project_id": p, "reason_code": r, **dict(zip(METRIC_COLUMNS, amounts))}
+        for (d, p, r), amounts in cells.items()
+        if any(amounts)
+    ]
+
+
+def apply_deltas(session: Session, deltas: Dict[Cell, List[int]]) -> None:
+    """Upsert accumulated deltas into daily_metrics in one statement."""
+    rows = _cell_rows(deltas)
+    if not rows:
+        return
+    stmt = sqlite_insert(DailyMetric.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "project_id", "reason_code"],
+        set_={c: DailyMetric.__table__.c[c] + stmt.excluded[c] for c in METRIC_COLUMNS},
+    )
+    session.execute(stmt, rows)
+
+
+def rebuild_daily_metrics(session: Session) -> int:
+    """
+    Recompute daily_metrics from the day projections. Does not commit.
+    Returns the number of cells written.
+    """
+    session.flush()
+    session.exec(delete(DailyMetric))
+    cells: Dict[Cell, List[int]] = {}
+    for model in (DayBlock, DayRecovery, DayTodo):
+        for row in session.exec(select(model).execution_options(yield_per=_REBUILD_YIELD_PER)):
+            add_delta(cells, (), contribution(row))
+    rows = _cell_rows(cells)
+    if rows:
+        session.execute(insert(DailyMetric.__table__), rows)
+    return len(rows)
+
+
+# ── Range queries ────────────────────────────────────────────────────────────
+
+def metric_rows(session: Session, from_date: date, to_date: date, project_id: Optional[str], *group_by) -> List[Any]:
+    """
+    Cube rows in the inclusive range, summed per `group_by` columns of
+    daily_metrics. Pass at least reason_code (and project_id when filtering
+    by project) for summarize_metrics.
+    """
+    c = DailyMetric.__table__.c
+    query = (
+        select(*group_by, *[func.sum(c[name]).label(name) for name in METRIC_COLUMNS])
+        .where(c.date >= from_date.isoformat())
+        .where(c.date <= to_date.isoformat())
+        .group_by(*group_by)
+    )
+    if project_id:
+        # Unscoped cells hold recovery and todos; see summarize_metrics.
+        query = query.where(or_(c.project_id == project_id, c.project_id == ""))
+    return session.exec(query).all()
+
+
+def summarize_metrics(rows: List[Any], project_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fold cube rows (grouped at least by project_id and reason_code) into the
+    period metrics shape. With project_id, unscoped cells contribute their
+    todo completions only, as in a project-filtered period rollup.
+    """
+    totals = dict.fromkeys(METRIC_COLUMNS, 0)
+    fragmenters: Dict[str, int] = {}
+    for row in rows:
+        if project_id and row.project_id != project_id:
+            totals["todos_completed"] += row.todos_completed or 0
+            continue
+        for name in METRIC_COLUMNS:
+            totals[name] += getattr(row, name) or 0
+        if row.reason_code and row.interruptions:
+            fragmenters[row.reason_code] = fragmenters.get(row.reason_code, 0) + row.interruptions
+    blocks = totals["blocks"]
+    top_fragmenters = [{"code": k, "count": v} for k, v in fragmenters.items()]
+    top_fragmenters.sort(key=lambda x: x["count"], reverse=True)
+    return {
+        "totalBlocks": blocks,
+        "interruptedBlocks": totals["interrupted_blocks"],
+        "fragmentationRate": round(totals["interrupted_blocks"] / blocks, 2) if blocks else 0.0,
+        "focusBlocks": totals["focus_blocks"],
+        "focusMinutes": totals["focus_minutes"],
+        "topFragmenters": top_fragmenters,
+        "totalActiveMinutes": totals["active_minutes"],
+        "totalActiveLabel": bucket_total_day(totals["active_minutes"]),
+        "totalRecoveryMinutes": totals["recovery_minutes"],
+        "totalRecoveryLabel": (
+            bucket_total_day(totals["recovery_minutes"]) if totals["recovery_minutes"] > 0 else "~0 mins"
+        ),
+        "todosCompleted": totals["todos_completed"],
+    }
+
+
+def get_metrics_range(
+    session: Session,
+    from_date: date,
+    to_date: date,
+    project_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Metrics for the inclusive [from_date, to_date] range, plus a per-project breakdown."""
+    c = DailyMetric.__table__.c
+    rows = metric_rows(session, from_date, to_date, project_id, c.project_id, c.reason_code)
+
+    by_project: Dict[str, List[Any]] = {}
+    for row in rows:
+        if row.project_id:
+            by_project.setdefault(row.project_id, []).append(row)
+
+    return {
+        "from": from_date.isoformat(),
+        "to": to_date.isoformat(),
+        "projectId": project_id,
+        "metrics": summarize_metrics(rows, project_id),
+        "byProject": [
+            {"projectId": pid, "metrics": summarize_metrics(project_rows)}
+            for pid, project_rows in sorted(by_project.items())
+        ],
+    }
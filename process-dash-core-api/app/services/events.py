@@ -1,8 +1,59 @@
+import base64
+import binascii
 import json
-from datetime import datetime, timezone
-from typing import Optional
-from sqlmodel import Session
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlmodel import Session, select
 from app.models import EventLog
+from app.services.projections import apply_event, apply_events
+from app.services.search import index_events
+from app.services.write_behind import get_writer, has_uncommitted_writes
+
+
+# Payload keys copied into indexed event_log columns (see EventLog).
+PAYLOAD_COLUMNS = {
+    "payload_date": "date",
+    "block_id": "blockId",
+    "todo_id": "todoId",
+    "sprint_id": "sprintId",
+    "story_id": "storyId",
+}
+
+
+def payload_columns(payload: dict) -> dict:
+    """Extract the denormalized event_log column values from a payload."""
+    columns = {}
+    for column, key in PAYLOAD_COLUMNS.items():
+        value = payload.get(key)
+        columns[column] = value if isinstance(value, str) else None
+    return columns
+
+
+def new_event(
+    event_type: str,
+    payload: dict,
+    local_id: str = None,
+    project_id: str = None,
+    occurred_at: Optional[datetime] = None,
+    ts: Optional[datetime] = None,
+) -> EventLog:
+    """Build an unsaved EventLog row, including its denormalized payload columns."""
+    from app.services.archive import naive_utc  # local import to avoid a cycle
+
+    now = ts or datetime.now(timezone.utc)
+    event = EventLog(
+        type=event_type,
+        payload=json.dumps(payload),
+        ts=now,
+        # Stored as naive UTC like ts, whatever offset the client sent.
+        occurred_at=naive_utc(occurred_at) if occurred_at is not None else now,
+        project_id=project_id,
+        **payload_columns(payload),
+    )
+    if local_id:
+        event.id = local_id
+    return event
 
 
 def log_event(
@@ -20,27 +71,131 @@ def log_event(
     occurred_at — when the event actually happened. Defaults to ts when not
                   supplied. Pass explicitly for retroactive logging (e.g. "I
                   finished that block two hours ago").
+
+    Day projections and the search index are updated in the same transaction
+    as the event, and cached rollups it affects are invalidated when it commits.
+
+    With write-behind enabled, an event logged from a session with no other
+    pending changes is committed by the group-commit writer instead; the call
+    still returns only once the event is durable. Sessions carrying their own
+    changes (e.g. a story plus its event), including changes already flushed,
+    keep committing inline so both land in one transaction.
     """
-    now = datetime.now(timezone.utc)
-    event = EventLog(
-        type=event_type,
-        payload=json.dumps(payload),
-        ts=now,
-        occurred_at=occurred_at if occurred_at is not None else now,
-        project_id=project_id,
-    )
-    if local_id:
-        event.id = local_id
+    event = new_event(event_type, payload, local_id, project_id, occurred_at)
+
+    writer = get_writer(session.get_bind())
+    if writer is not None and not has_uncommitted_writes(session):
+        session.commit()  # end any read transaction before handing off
+        return writer.submit(event).result()
+
+    from app.services.rollup_cache import note_events  # local import to avoid a cycle
 
     session.add(event)
+    apply_event(session, event, payload)
+    index_events(session, [event], [payload])
+    note_events(session, [event], [payload])
     session.commit()
     session.refresh(event)
     return event
 
-def get_events(session: Session, event_type: str = None, after: datetime = None):
-    query = session.query(EventLog).order_by(EventLog.ts)
-    if event_type:
-        query = query.filter(EventLog.type == event_type)
+
+def log_events(session: Session, events: List[EventLog]) -> List[EventLog]:
+    """
+    Append many events in one transaction.
+
+    Rows are written with a single executemany INSERT, the day projections are
+    folded in order, and the whole batch is committed once. Events are
+    re-stamped with strictly increasing ts values so replays keep the batch
+    order; occurred_at follows ts unless it was supplied explicitly.
+    """
+    if not events:
+        return []
+
+    now = datetime.now(timezone.utc)
+    for offset, event in enumerate(events):
+        defaulted_occurred_at = event.occurred_at is None or event.occurred_at == event.ts
+        event.ts = now + timedelta(microseconds=offset)
+        if defaulted_occurred_at:
+            event.occurred_at = event.ts
+
+    from app.services.rollup_cache import note_events
+
+    session.execute(EventLog.__table__.insert(), [event.model_dump() for event in events])
+    apply_events(session, events)
+    index_events(session, events)
+    note_events(session, events)
+    session.commit()
+    return events
+
+
+def encode_cursor(event: Any) -> str:
+    """Opaque keyset cursor for the (ts, id) position of an event row."""
+    raw = f"{event.ts.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        ts_raw, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts_raw), event_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _events_query(table, types: Optional[List[str]] = None, after: Optional[str] = None):
+    query = select(*table.c).order_by(table.c.ts, table.c.id)
+    if types:
+        query = query.where(table.c.type.in_(types))
     if after:
-        query = query.filter(EventLog.ts > after)
-    return query.all()
+        after_ts, after_id = decode_cursor(after)
+        query = query.where(tuple_(table.c.ts, table.c.id) > tuple_(after_ts, after_id))
+    return query
+
+
+def get_events_page(
+    session: Session,
+    types: Optional[List[str]] = None,
+    after: Optional[str] = None,
+    limit: int = 500,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One keyset page of the log (archived partitions first) in (ts, id) order.
+    Returns the event rows and the cursor for the next page (None at the end).
+    """
+    from app.services.archive import event_tables  # local import to avoid a cycle
+
+    events: List[Any] = []
+    for table in event_tables(session):
+        query = _events_query(table, types, after).limit(limit + 1 - len(events))
+        events.extend(session.exec(query).all())
+        if len(events) > limit:
+            break
+    if len(events) <= limit:
+        return events, None
+    events = events[:limit]
+    return events, encode_cursor(events[-1])
+
+
+def iter_events(
+    session: Session,
+    types: Optional[List[str]] = None,
+    after: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[Any]:
+    """Stream the log (archived partitions first) in (ts, id) order in constant memory."""
+    from app.services.archive import event_tables
+
+    for table in event_tables(session):
+        yield from session.exec(_events_query(table, types, after).execution_options(yield_per=batch_size))
+
+
+def event_to_dict(event: Any) -> dict:
+    return {
+        "id": event.id,
+        "type": event.type,
+        "ts": event.ts.isoformat() if event.ts else None,
+        "occurredAt": event.occurred_at.isoformat() if event.occurred_at else None,
+        "projectId": event.project_id,
+        "payload": json.loads(event.payload),
+    }
@@ -0,0 +1,112 @@
+"""
+Focus heatmap — focus minutes and interruptions by weekday × hour of day.
+
+Computed in SQLite from the day_blocks projection: one range scan on its date
+index, with the binning done by GROUP BY instead of per-day rollups, so the
+cost follows the number of blocks in the range and the result is always 7×24.
+
+  - a focus block (uninterrupted, at least FOCUS_MINUTES long) spreads its
+    minutes over the hours it spans from its start: 09:40 + 45 minutes puts
+    20 minutes in 09:00 and 25 in 10:00
+  - an interrupted block counts one interruption in the hour it started
+
+A block starts when its start event happened (DayBlock.occurred_at), so blocks
+logged after the fact or synced from an offline client land in the hour they
+were worked; rows projected before occurred_at was tracked fall back to the
+time the start was logged (started_at). Both are UTC; tz_offset_minutes shifts
+them to local time before binning.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Integer, cast, func, literal
+from sqlmodel import Session, select
+
+from app.models import DayBlock
+from app.services.daily_metrics import FOCUS_MINUTES
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Longest block spread over the grid; minutes past this are not binned.
+MAX_SPAN_HOURS = 48
+
+
+def _grid() -> List[List[int]]:
+    return [[0] * 24 for _ in WEEKDAYS]
+
+
+def _weekday_hour(moment):
+    """(Monday-first weekday, hour) SQL expressions for a datetime expression."""
+    return (cast(func.strftime("%w", moment), Integer) + 6) % 7, cast(func.strftime("%H", moment), Integer)
+
+
+def get_focus_heatmap(
+    session: Session,
+    from_date: date,
+    to_date: date,
+    project_id: Optional[str] = None,
+    tz_offset_minutes: int = 0,
+) -> Dict[str, Any]:
+    """Focus minutes and interruptions for blocks dated in [from_date, to_date]."""
+    started = func.coalesce(DayBlock.occurred_at, DayBlock.started_at)
+    local_start = func.datetime(started, f"{tz_offset_minutes:+d} minutes")
+    in_range = [DayBlock.date >= from_date.isoformat(), DayBlock.date <= to_date.isoformat()]
+    if project_id:
+        in_range.append(DayBlock.project_id == project_id)
+
+    # Bin each focus block's start once, then join it with the hour offsets
+    # it overlaps; the cell of offset k follows by integer arithmetic.
+    weekday, hour = _weekday_hour(local_start)
+    blocks = (
+        select(
+            weekday.label("start_weekday"),
+            hour.label("start_hour"),
+            cast(func.strftime("%M", local_start), Integer).label("minute"),
+            DayBlock.duration_minutes.label("duration"),
+        )
+        .where(*in_range)
+        .where(DayBlock.interrupted == False)  # noqa: E712
+        .where(DayBlock.duration_minutes >= FOCUS_MINUTES)
+        .cte("focus_blocks")
+        .prefix_with("MATERIALIZED")   # compute each block's bin once, not once per span
+    )
+    spans = select(literal(0).label("k")).cte("spans", recursive=True)
+    spans = spans.union_all(select(spans.c.k + 1).where(spans.c.k < MAX_SPAN_HOURS - 1))
+    b, k = blocks.c, spans.c.k
+    end_minute = b.minute + b.duration
+    focus_query = (
+        select(
+            ((b.start_weekday + (b.start_hour + k) // 24) % 7).label("weekday"),
+            ((b.start_hour + k) % 24).label("hour"),
+            func.sum(func.min(end_minute, (k + 1) * 60) - func.max(b.minute, k * 60)).label("minutes"),
+        )
+        .select_from(blocks)
+        .join(spans, k * 60 < end_minute)
+        .group_by("weekday", "hour")
+    )
+
+    interruption_query = (
+        select(weekday.label("weekday"), hour.label("hour"), func.count().label("count"))
+        .where(*in_range)
+        .where(DayBlock.interrupted == True)  # noqa: E712
+        .group_by("weekday", "hour")
+    )
+
+    focus, interruptions = _grid(), _grid()
+    for row in session.exec(focus_query):
+        focus[row.weekday][row.hour] = int(row.minutes)
+    for row in session.exec(interruption_query):
+        interruptions[row.weekday][row.hour] = row.count
+
+    return {
+        "from": from_date.isoformat(),
+        "to": to_date.isoformat(),
+        "projectId": project_id,
+        "tzOffsetMinutes": tz_offset_minutes,
+        "weekdays": WEEKDAYS,
+        "hours": list(range(24)),
+        "focusMinutes": focus,
+        "interruptions": interruptions,
+        "totalFocusMinutes": sum(map(sum, focus)),
+        "totalInterruptions": sum(map(sum, interruptions)),
+    }
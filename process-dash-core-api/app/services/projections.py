@@ -0,0 +1,275 @@
+"""
+Day projections — per-date read models derived from event_log.
+
+log_event() calls apply_event() before committing, so every projection row is
+written in the same transaction as the event that produced it. The replay
+rules mirror the ones get_day_rollup used to run over the whole log:
+
+  - a block / recovery block / todo belongs to the date in its start payload
+  - follow-up events only apply to an entity that has already been started
+  - a deleted todo is kept as a tombstone and hidden from reads
+
+Story events are folded into the sprint story states behind the burndown
+(app.services.burndown) the same way.
+
+rebuild_projections() drops the projected rows and replays the log once,
+archived partitions included, then rebuilds the daily metrics cube
+(app.services.daily_metrics) from the result and the story states.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models import DayBlock, DayRecovery, DayTodo
+from app.services.burndown import STORY_EVENT_TYPES, apply_story_event, preload_story_states, rebuild_story_states, story_event_ids
+from app.services.daily_metrics import add_delta, apply_deltas, contribution, rebuild_daily_metrics
+
+BLOCK_EVENT_TYPES = [
+    "intent_block_started", "intent_block_interrupted", "intent_block_ended",
+]
+RECOVERY_EVENT_TYPES = ["recovery_block_started", "recovery_block_ended"]
+TODO_EVENT_TYPES = ["todo_added", "todo_completed", "todo_uncompleted", "todo_deleted", "todo_settled"]
+
+PROJECTED_EVENT_TYPES = BLOCK_EVENT_TYPES + RECOVERY_EVENT_TYPES + TODO_EVENT_TYPES
+
+_PRIMARY_KEYS = {DayBlock: "block_id", DayRecovery: "block_id", DayTodo: "todo_id"}
+
+_REBUILD_YIELD_PER = 1000
+
+
+def apply_event(
+    session: Session,
+    event: Any,
+    payload: Optional[dict] = None,
+    rows: Optional[Dict[Tuple[type, str], Any]] = None,
+    deltas: Optional[Dict[Any, List[int]]] = None,
+) -> None:
+    """
+    Fold a single event into the day projections and the daily metrics cube.
+
+    `event` is an EventLog (or any row exposing type/ts/project_id/payload).
+    Pass `payload` when the caller already has it decoded.
+
+    `rows` is an optional preloaded cache of projection rows keyed by
+    (model, primary key). When given it is treated as complete: lookups never
+    hit the database, and new rows are added to it (see apply_events).
+
+    `deltas` collects daily_metrics changes for the caller to apply once (see
+    apply_events); without it they are written immediately.
+    """
+    if event.type in STORY_EVENT_TYPES:
+        apply_story_event(session, event, payload if payload is not None else json.loads(event.payload), rows)
+        return
+    if event.type not in PROJECTED_EVENT_TYPES:
+        return
+    p = payload if payload is not None else json.loads(event.payload)
+
+    if event.type in BLOCK_EVENT_TYPES:
+        model, key, handler = DayBlock, p.get("blockId"), _apply_block_event
+    elif event.type in RECOVERY_EVENT_TYPES:
+        model, key, handler = DayRecovery, p.get("blockId"), _apply_recovery_event
+    else:
+        model, key, handler = DayTodo, p.get("todoId"), _apply_todo_event
+    if not key:
+        return
+
+    row = _get_row(session, model, key, rows)
+    before = contribution(row)
+    row = handler(session, event, p, key, row, rows)
+    if deltas is None:
+        single: Dict[Any, List[int]] = {}
+        add_delta(single, before, contribution(row))
+        apply_deltas(session, single)
+    else:
+        add_delta(deltas, before, contribution(row))
+
+
+def apply_events(session: Session, events: List[Any]) -> None:
+    """
+    Fold a batch of events, in order, with one preload query per projection
+    table instead of a lookup per event, and one daily_metrics upsert.
+    """
+    keys: Dict[type, set] = {DayBlock: set(), DayRecovery: set(), DayTodo: set()}
+    story_ids: set = set()
+    decoded = []
+    for event in events:
+        if event.type not in PROJECTED_EVENT_TYPES and event.type not in STORY_EVENT_TYPES:
+            continue
+        p = json.loads(event.payload)
+        decoded.append((event, p))
+        if event.type in STORY_EVENT_TYPES:
+            story_ids.update(story_event_ids(p))
+        elif event.type in BLOCK_EVENT_TYPES and p.get("blockId"):
+            keys[DayBlock].add(p["blockId"])
+        elif event.type in RECOVERY_EVENT_TYPES and p.get("blockId"):
+            keys[DayRecovery].add(p["blockId"])
+        elif p.get("todoId"):
+            keys[DayTodo].add(p["todoId"])
+
+    rows: Dict[Tuple[type, str], Any] = {}
+    for model, ids in keys.items():
+        if not ids:
+            continue
+        pk = _PRIMARY_KEYS[model]
+        for row in session.exec(select(model).where(getattr(model, pk).in_(ids))).all():
+            rows[(model, getattr(row, pk))] = row
+    preload_story_states(session, story_ids, rows)
+
+    deltas: Dict[Any, List[int]] = {}
+    with session.no_autoflush:
+        for event, p in decoded:
+            apply_event(session, event, p, rows, deltas)
+    apply_deltas(session, deltas)
+
+
+def _get_row(session: Session, model: type, key: str, rows: Optional[dict]):
+    if rows is None:
+        return session.get(model, key)
+    return rows.get((model, key))
+
+
+def _add_row(session: Session, model: type, key: str, row: Any, rows: Optional[dict]) -> None:
+    session.add(row)
+    if rows is not None:
+        rows[(model, key)] = row
+
+
+# Each handler receives the current projection row (None if there is none yet)
+# and returns the row as it stands after the event.
+
+def _apply_block_event(session: Session, event: Any, p: dict, block_id: str, block: Optional[DayBlock], rows: Optional[dict]) -> Optional[DayBlock]:
+    if event.type == "intent_block_started":
+        if not p.get("date"):
+            return block
+        block = block or DayBlock(block_id=block_id, date=p["date"], started_at=event.ts)
+        block.date = p["date"]
+        block.project_id = event.project_id
+        block.story_id = p.get("storyId")
+        block.intent = p.get("intent")
+        block.notes = p.get("notes")
+        block.started_at = event.ts
+        block.occurred_at = event.occurred_at
+        block.interrupted = False
+        block.reason_code = None
+        # interruptions is kept: like the period rollups, every interruption
+        # of a block counts towards its reason code, even across a restart.
+        block.actual_outcome = None
+        block.duration_minutes = None
+        _add_row(session, DayBlock, block_id, block, rows)
+        return block
+
+    if not block:
+        return None
+    if event.type == "intent_block_interrupted":
+        block.interrupted = True
+        block.reason_code = p.get("reasonCode")
+        if block.reason_code:
+            counts = json.loads(block.interruptions or "{}")
+            counts[block.reason_code] = counts.get(block.reason_code, 0) + 1
+            block.interruptions = json.dumps(counts)
+    elif event.type == "intent_block_ended":
+        block.actual_outcome = p.get("actualOutcome")
+        block.duration_minutes = p.get("durationMinutes")
+    session.add(block)
+    return block
+
+
+def _apply_recovery_event(session: Session, event: Any, p: dict, block_id: str, recovery: Optional[DayRecovery], rows: Optional[dict]) -> Optional[DayRecovery]:
+    if event.type == "recovery_block_started":
+        if not p.get("date"):
+            return recovery
+        recovery = recovery or DayRecovery(block_id=block_id, date=p["date"], started_at=event.ts)
+        recovery.date = p["date"]
+        recovery.kind = p.get("kind")
+        recovery.started_at = event.ts
+        recovery.duration_minutes = None
+        _add_row(session, DayRecovery, block_id, recovery, rows)
+        return recovery
+
+    if recovery:
+        recovery.duration_minutes = p.get("durationMinutes")
+        session.add(recovery)
+    return recovery
+
+
+def _apply_todo_event(session: Session, event: Any, p: dict, todo_id: str, todo: Optional[DayTodo], rows: Optional[dict]) -> Optional[DayTodo]:
+    if event.type == "todo_added":
+        if not p.get("date"):
+            return todo
+        todo = todo or DayTodo(todo_id=todo_id, date=p["date"], added_at=event.ts)
+        todo.date = p["date"]
+        todo.text = p.get("text", "")
+        todo.added_at = event.ts
+        todo.completed = False
+        todo.completion_date = None
+        _add_row(session, DayTodo, todo_id, todo, rows)
+        return todo
+
+    if event.type == "todo_settled":
+        # A compacted history (see app.services.archive): the terminal state.
+        if not p.get("date"):
+            return todo
+        added_at = datetime.fromisoformat(p["addedAt"]) if p.get("addedAt") else event.ts
+        todo = todo or DayTodo(todo_id=todo_id, date=p["date"], added_at=added_at)
+        todo.date = p["date"]
+        todo.text = p.get("text", "")
+        todo.added_at = added_at
+        todo.completed = bool(p.get("completed"))
+        todo.completion_date = p.get("completionDate")
+        todo.deleted = bool(p.get("deleted"))
+        _add_row(session, DayTodo, todo_id, todo, rows)
+        return todo
+
+    if not todo:
+        return None
+    if event.type == "todo_completed":
+        todo.completed = True
+        todo.completion_date = p.get("completionDate")
+    elif event.type == "todo_uncompleted":
+        todo.completed = False
+        todo.completion_date = None
+    elif event.type == "todo_deleted":
+        todo.deleted = True
+    session.add(todo)
+    return todo
+
+
+def rebuild_projections(session: Session) -> int:
+    """
+    Drop every projected row, replay the event log once (every partition,
+    oldest first), and rebuild daily_metrics and the sprint story states.
+    Commits the result and returns the number of events replayed.
+    """
+    from app.services.archive import event_tables  # local import to avoid a cycle
+    from app.services.rollup_cache import note_everything
+
+    note_everything(session)
+    session.exec(delete(DayBlock))
+    session.exec(delete(DayRecovery))
+    session.exec(delete(DayTodo))
+    session.flush()
+
+    # The tables were just emptied, so an empty cache is complete and the
+    # whole replay runs in memory; rows are flushed once at commit.
+    projected: Dict[Tuple[type, str], Any] = {}
+    ignored_deltas: Dict[Any, List[int]] = {}  # the cube is rebuilt in one pass below
+    replayed = 0
+    with session.no_autoflush:
+        for table in event_tables(session):
+            events = session.exec(
+                select(table.c.type, table.c.payload, table.c.ts, table.c.occurred_at, table.c.project_id)
+                .where(table.c.type.in_(PROJECTED_EVENT_TYPES))
+                .order_by(table.c.ts, table.c.id)
+                .execution_options(yield_per=_REBUILD_YIELD_PER)
+            )
+            for event in events:
+                apply_event(session, event, rows=projected, deltas=ignored_deltas)
+                replayed += 1
+
+    rebuild_daily_metrics(session)
+    replayed += rebuild_story_states(session)
+    session.commit()
+    return replayed
@@ -0,0 +1,324 @@
+"""
+Rollup result cache — day, sprint and project rollups kept between requests.
+
+Rollups are pure functions of the event log and a handful of tables, so a
+result stays valid until a write touches one of its inputs. Entries are held
+per engine in a size-bounded LRU (WORKOBS_ROLLUP_CACHE_SIZE, 0 disables) and
+keyed by (kind, id):
+
+  - ("day", "YYYY-MM-DD")    get_day_rollup
+  - ("sprint", sprint_id)    get_sprint_rollup
+  - ("project", project_id)  get_project_data
+  - ("project", project_id, "v2")  get_project_summary
+
+A key may carry a variant after (kind, id); invalidation matches on (kind, id)
+alone, so every variant of a rollup is dropped together.
+
+Writes record what they affect on the session and the affected entries are
+dropped when that session commits:
+
+  - log_event / log_events note each event: the payload date of
+    daily_intents_set, the sprintId of sprint_summary_saved, and for period
+    events their ts (every cached sprint whose window contains it) and
+    project (every project for todo events, which are never project-scoped).
+  - Projection rows changed by an event (DayBlock, DayRecovery, DayTodo) name
+    the day they belong to — the blockId / todoId lookup — including the day
+    a restarted block moved away from.
+  - Direct table writes to SprintDefinition, SprintRollupSnapshot, UserStory
+    and Project name the sprint or project they belong to. Bulk statements
+    bypass the flush, so their callers note the keys (note_keys).
+
+A result computed while an invalidation landed is returned but not stored,
+so a read racing a commit can never cache the pre-commit state.
+
+Log rewrites committed by another process (archive_events.py --compact) never
+reach this process's commit hooks. They bump the persisted "*" scope version
+instead, which every cached read checks first (one primary-key lookup) and
+which empties the cache when it moves.
+
+The same changes also bump the persistent scope versions behind the rollup
+ETags (app.services.scope_versions), just before the commit.
+"""
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import get_history
+
+from app.models import DayBlock, DayRecovery, DayTodo, Project, SprintDefinition, SprintRollupSnapshot, UserStory
+from app.services.archive import naive_utc
+from app.services.snapshots import PERIOD_EVENT_TYPES, TODO_PERIOD_EVENT_TYPES
+
+# Request header: "bypass" recomputes without reading or filling the cache.
+# The response carries the same header with hit / miss / bypass.
+CACHE_HEADER = "X-Rollup-Cache"
+BYPASS = "bypass"
+
+CacheKey = Tuple[str, ...]
+Window = Tuple[datetime, datetime]
+
+_PENDING_KEY = "rollup_cache_pending"
+
+
+def day_key(date_str: str) -> CacheKey:
+    return ("day", date_str)
+
+
+def sprint_key(sprint_id: str) -> CacheKey:
+    return ("sprint", sprint_id)
+
+
+def project_key(project_id: str) -> CacheKey:
+    return ("project", project_id)
+
+
+def project_summary_key(project_id: str) -> CacheKey:
+    return ("project", project_id, "v2")
+
+
+class Invalidation:
+    """What a transaction changed, in the terms cache entries are keyed by."""
+
+    def __init__(self):
+        self.keys: Set[CacheKey] = set()
+        self.timestamps: Set[datetime] = set()
+        self.kinds: Set[str] = set()
+        self.everything = False
+
+    def __bool__(self) -> bool:
+        return bool(self.keys or self.timestamps or self.kinds or self.everything)
+
+
+class RollupCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key -> (value, window); window is the [start, end) a sprint covers
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, Optional[Window]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._everything: Optional[str] = None
+        self._stats = {"hits": 0, "misses": 0, "bypasses": 0, "invalidations": 0, "evictions": 0}
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[0]
+
+    def put(self, key: CacheKey, value: Any, epoch: int, window: Optional[Window] = None) -> bool:
+        """Store a value computed since `epoch`, unless anything was invalidated meanwhile."""
+        if self.max_size <= 0:
+            return False
+        with self._lock:
+            if epoch != self._epoch:
+                return False
+            self._entries[key] = (value, window)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            return True
+
+    def sync(self, everything: Optional[str]) -> None:
+        """Empty the cache if the persisted "*" version moved since the last sync."""
+        with self._lock:
+            if everything == self._everything:
+                return
+            self._everything = everything
+        self.clear()
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypasses"] += 1
+
+    def invalidate(self, changes: Invalidation) -> int:
+        """Drop every entry the changes affect. Returns the number dropped."""
+        with self._lock:
+            self._epoch += 1
+            if changes.everything:
+                doomed = list(self._entries)
+            else:
+                doomed = [
+                    key for key, (_, window) in self._entries.items()
+                    if key[:2] in changes.keys
+                    or key[0] in changes.kinds
+                    or (window is not None and any(window[0] <= ts < window[1] for ts in changes.timestamps))
+                ]
+            for key in doomed:
+                del self._entries[key]
+            self._stats["invalidations"] += len(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        changes = Invalidation()
+        changes.everything = True
+        self.invalidate(changes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["maxSize"] = self.max_size
+        lookups = stats["hits"] + stats["misses"]
+        stats["hitRate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_caches: "weakref.WeakKeyDictionary[Any, RollupCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_cache(bind: Any) -> RollupCache:
+    """The rollup cache for an engine, created on first use."""
+    from app.settings import settings
+
+    with _caches_lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = RollupCache(settings.WORKOBS_ROLLUP_CACHE_SIZE)
+            _caches[bind] = cache
+        return cache
+
+
+def cached(
+    session: OrmSession,
+    key: CacheKey,
+    compute: Callable[[], Any],
+    bypass: bool = False,
+    window: Optional[Window] = None,
+) -> Tuple[Any, str]:
+    """
+    Return (value, status) for a cache key, computing it on a miss. status is
+    "hit", "miss" or "bypass". Cached values are shared: treat them as
+    read-only.
+    """
+    cache = get_cache(session.get_bind())
+    if bypass:
+        cache.record_bypass()
+        return compute(), BYPASS
+    if cache.max_size > 0:
+        from app.services.scope_versions import everything_version
+
+        cache.sync(everything_version(session))
+    found, value = cache.get(key)
+    if found:
+        return value, "hit"
+    # Reads are not pinned to a snapshot (pysqlite only opens a transaction
+    # for writes), so anything committed before this epoch is visible below.
+    epoch = cache.epoch
+    value = compute()
+    cache.put(key, value, epoch, window)
+    return value, "miss"
+
+
+# ── Recording changes ────────────────────────────────────────────────────────
+
+def _pending(session: OrmSession) -> Invalidation:
+    pending = session.info.get(_PENDING_KEY)
+    if pending is None:
+        pending = session.info[_PENDING_KEY] = Invalidation()
+    return pending
+
+
+def note_events(session: OrmSession, events: List[Any], payloads: Optional[List[dict]] = None) -> None:
+    """Record the rollups a batch of events affects, for invalidation on commit."""
+    pending = _pending(session)
+    if payloads is None:
+        payloads = [json.loads(e.payload) for e in events]
+    for event, p in zip(events, payloads):
+        if event.type == "daily_intents_set" and isinstance(p.get("date"), str):
+            pending.keys.add(day_key(p["date"]))
+        elif event.type == "sprint_summary_saved" and isinstance(p.get("sprintId"), str):
+            pending.keys.add(sprint_key(p["sprintId"]))
+        elif event.type in PERIOD_EVENT_TYPES:
+            if event.ts is not None:
+                pending.timestamps.add(naive_utc(event.ts))
+            if event.type in TODO_PERIOD_EVENT_TYPES:
+                pending.kinds.add("project")
+            elif event.project_id:
+                pending.keys.add(project_key(event.project_id))
+
+
+def note_keys(session: OrmSession, keys: List[CacheKey]) -> None:
+    """Record rollups a bulk UPDATE / DELETE changed (those skip the flush hooks below)."""
+    _pending(session).keys.update(keys)
+
+
+def note_everything(session: OrmSession) -> None:
+    """Record that every cached rollup may be stale (bulk rewrites of the log)."""
+    _pending(session).everything = True
+
+
+def _values(obj: Any, attr: str) -> Set[Any]:
+    """Current value plus the value it replaced in this flush, if any."""
+    history = get_history(obj, attr)
+    values = set(history.added) | set(history.unchanged) | set(history.deleted)
+    return {v for v in values if v is not None}
+
+
+def _note_instance(pending: Invalidation, obj: Any) -> None:
+    if isinstance(obj, (DayBlock, DayRecovery, DayTodo)):
+        pending.keys.update(day_key(d) for d in _values(obj, "date"))
+    elif isinstance(obj, SprintDefinition):
+        pending.keys.add(sprint_key(obj.id))
+        pending.keys.update(project_key(p) for p in _values(obj, "project_id"))
+    elif isinstance(obj, SprintRollupSnapshot):
+        pending.keys.add(sprint_key(obj.sprint_id))
+    elif isinstance(obj, UserStory):
+        pending.keys.update(sprint_key(s) for s in _values(obj, "sprint_id"))
+    elif isinstance(obj, Project):
+        pending.keys.add(project_key(obj.id))
+
+
+_WATCHED_MODELS = (DayBlock, DayRecovery, DayTodo, SprintDefinition, SprintRollupSnapshot, UserStory, Project)
+
+
+@sa_event.listens_for(OrmSession, "after_flush")
+def _after_flush(session: OrmSession, flush_context: Any) -> None:
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, _WATCHED_MODELS):
+            pending = pending or _pending(session)
+            _note_instance(pending, obj)
+
+
+@sa_event.listens_for(OrmSession, "before_commit")
+def _before_commit(session: OrmSession) -> None:
+    # Flush first so after_flush has seen every change, then persist the
+    # scope versions the ETags read in the same transaction.
+    session.flush()
+    pending = session.info.get(_PENDING_KEY)
+    if pending:
+        from app.services.scope_versions import record_changes
+
+        record_changes(session, pending)
+
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def _after_commit(session: OrmSession) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    bind = session.get_bind()
+    with _caches_lock:
+        cache = _caches.get(bind)
+    if cache is not None:
+        cache.invalidate(pending)
+
+
+@sa_event.listens_for(OrmSession, "after_rollback")
+def _after_rollback(session: OrmSession) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,97 +1,75 @@
+import base64
+import binascii
+import bisect
+import calendar
 import json
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Optional, Any, Tuple
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import and_, case, func, or_, tuple_
 from sqlmodel import Session, select
-from app.models import EventLog, SprintDefinition, Project, UserStory
-
-def _parse_payload(event: EventLog) -> dict:
+from app.models import DailyMetric, DayBlock, DayRecovery, DayTodo, FinancialYear, RollupSnapshot, SprintDefinition, SprintRollupSnapshot, Project, UserStory
+from app.services import columnar_metrics
+from app.services.archive import all_events, naive_utc
+from app.services.daily_metrics import metric_rows, summarize_metrics
+from app.services.rollup_cache import cached, day_key, project_key, project_summary_key, sprint_key
+from app.services.snapshots import ALL_SCOPE, block_totals, fold_period_event, iter_period_events, latest_snapshot, new_period_state, schedule_snapshot
+from app.settings import settings
+
+def _parse_payload(event: Any) -> dict:
     return json.loads(event.payload)
 
 # Use the new time_buckets service
 from app.services.time_buckets import bucket_minutes_to_label, bucket_total_day
 
-def get_day_rollup(session: Session, date_str: str) -> Dict[str, Any]:
-    # ... (fetching logic)
-    
-    # 1. Get Daily Intents
-    intent_events = session.exec(
-        select(EventLog)
-        .where(EventLog.type == "daily_intents_set")
-        .where(EventLog.payload.contains(f'"date": "{date_str}"'))
-        .order_by(EventLog.ts.desc())
-    ).all()
-    
-    daily_intents = []
-    for evt in intent_events:
-        p = _parse_payload(evt)
-        if p.get("date") == date_str:
-            daily_intents = p.get("intents", [])
-            break
-            
-    # 2. Reconstruct Blocks (Work & Recovery)
-    block_types = [
-        "intent_block_started", "intent_block_interrupted", "intent_block_ended",
-        "recovery_block_started", "recovery_block_ended"
-    ]
-    events = session.exec(
-        select(EventLog)
-        .where(EventLog.type.in_(block_types))
-        .order_by(EventLog.ts)
-    ).all()
-    
-    blocks_map = {}
-    recovery_map = {}
-    for evt in events:
-        p = _parse_payload(evt)
-        block_id = p.get("blockId")
-        if not block_id:
-            continue
-            
-        if evt.type == "intent_block_started":
-            if p.get("date") == date_str:
-                blocks_map[block_id] = {
-                    "blockId": block_id,
-                    "storyId": p.get("storyId"),
-                    "intent": p.get("intent"),
-                    "notes": p.get("notes"),
-                    "date": p.get("date"),
-                    "startedAt": evt.ts.isoformat() if evt.ts else None,
-                    "interrupted": False,
-                    "reasonCode": None,
-                    "actualOutcome": None,
-                    "durationMinutes": None,
-                    "durationLabel": "" # Guaranteed string
-                }
-
-        if evt.type == "recovery_block_started":
-            if p.get("date") == date_str:
-                recovery_map[block_id] = {
-                    "blockId": block_id,
-                    "kind": p.get("kind"),
-                    "date": p.get("date"),
-                    "startedAt": evt.ts.isoformat() if evt.ts else None,
-                    "durationMinutes": None,
-                    "durationLabel": ""
-                }
-        elif block_id in blocks_map:
-            if evt.type == "intent_block_interrupted":
-                blocks_map[block_id]["interrupted"] = True
-                blocks_map[block_id]["reasonCode"] = p.get("reasonCode")
-            elif evt.type == "intent_block_ended":
-                blocks_map[block_id]["actualOutcome"] = p.get("actualOutcome")
-                dur = p.get("durationMinutes")
-                blocks_map[block_id]["durationMinutes"] = dur
-                # Ensure label
-                blocks_map[block_id]["durationLabel"] = bucket_minutes_to_label(dur) or ""
-        elif block_id in recovery_map:
-            if evt.type == "recovery_block_ended":
-                dur = p.get("durationMinutes")
-                recovery_map[block_id]["durationMinutes"] = dur
-                recovery_map[block_id]["durationLabel"] = bucket_minutes_to_label(dur) or ""
-
-    blocks_list = list(blocks_map.values())
-    
-    # 3. Compute Metrics
+
+def _day_block_to_dict(block: DayBlock) -> Dict[str, Any]:
+    return {
+        "blockId": block.block_id,
+        "storyId": block.story_id,
+        "intent": block.intent,
+        "notes": block.notes,
+        "date": block.date,
+        "startedAt": block.started_at.isoformat() if block.started_at else None,
+        "interrupted": block.interrupted,
+        "reasonCode": block.reason_code,
+        "actualOutcome": block.actual_outcome,
+        "durationMinutes": block.duration_minutes,
+        "durationLabel": bucket_minutes_to_label(block.duration_minutes) or "",  # Guaranteed string
+    }
+
+
+def _day_recovery_to_dict(recovery: DayRecovery) -> Dict[str, Any]:
+    return {
+        "blockId": recovery.block_id,
+        "kind": recovery.kind,
+        "date": recovery.date,
+        "startedAt": recovery.started_at.isoformat() if recovery.started_at else None,
+        "durationMinutes": recovery.duration_minutes,
+        "durationLabel": bucket_minutes_to_label(recovery.duration_minutes) or "",
+    }
+
+
+def _day_todo_to_dict(todo: DayTodo) -> Dict[str, Any]:
+    return {
+        "todoId": todo.todo_id,
+        "text": todo.text,
+        "date": todo.date,
+        "completed": todo.completed,
+        "completionDate": todo.completion_date,
+    }
+
+
+def _build_day_rollup(
+    date_str: str,
+    daily_intents: List[str],
+    day_blocks: List[DayBlock],
+    day_recovery: List[DayRecovery],
+    day_todos: List[DayTodo],
+) -> Dict[str, Any]:
+    blocks_list = [_day_block_to_dict(b) for b in day_blocks]
+    recovery_list = [_day_recovery_to_dict(r) for r in day_recovery]
+
+    # Compute Metrics
     total_blocks = len(blocks_list)
     interrupted_blocks = sum(1 for b in blocks_list if b["interrupted"])
     focus_blocks = sum(1 for b in blocks_list if not b["interrupted"] and (b["durationMinutes"] or 0) >= 30)
@@ -99,7 +77,6 @@ def get_day_rollup(session: Session, date_str: str) -> Dict[str, Any]:
     total_active_minutes = sum((b["durationMinutes"] or 0) for b in blocks_list)
     total_active_label = bucket_total_day(total_active_minutes)
     
-    recovery_list = list(recovery_map.values())
     total_recovery_minutes = sum((b["durationMinutes"] or 0) for b in recovery_list)
     total_recovery_label = bucket_total_day(total_recovery_minutes) if total_recovery_minutes > 0 else "~0 mins"
 
@@ -108,39 +85,8 @@ def get_day_rollup(session: Session, date_str: str) -> Dict[str, Any]:
     if total_blocks > 0:
         fragmentation_rate = interrupted_blocks / total_blocks
 
-    # 4. Replay todo events — todos created on date_str, completions counted by completionDate (Option A)
-    todo_events = session.exec(
-        select(EventLog)
-        .where(EventLog.type.in_(["todo_added", "todo_completed", "todo_uncompleted", "todo_deleted"]))
-        .order_by(EventLog.ts)
-    ).all()
-
-    todos_map: Dict[str, Any] = {}
-    deleted_todo_ids: set = set()
-
-    for evt in todo_events:
-        p = _parse_payload(evt)
-        todo_id = p.get("todoId")
-        if not todo_id:
-            continue
-        if evt.type == "todo_added" and p.get("date") == date_str:
-            todos_map[todo_id] = {
-                "todoId": todo_id,
-                "text": p.get("text", ""),
-                "date": p.get("date"),
-                "completed": False,
-                "completionDate": None,
-            }
-        elif evt.type == "todo_completed" and todo_id in todos_map:
-            todos_map[todo_id]["completed"] = True
-            todos_map[todo_id]["completionDate"] = p.get("completionDate")
-        elif evt.type == "todo_uncompleted" and todo_id in todos_map:
-            todos_map[todo_id]["completed"] = False
-            todos_map[todo_id]["completionDate"] = None
-        elif evt.type == "todo_deleted":
-            deleted_todo_ids.add(todo_id)
-
-    todos_list = [t for tid, t in todos_map.items() if tid not in deleted_todo_ids]
+    # Todos created on date_str, completions counted by completionDate (Option A)
+    todos_list = [_day_todo_to_dict(t) for t in day_todos]
     todos_added = len(todos_list)
     # Count completions where completionDate == date_str (Option A: counts toward the day it was ticked off)
     todos_completed = sum(
@@ -167,84 +113,171 @@ def get_day_rollup(session: Session, date_str: str) -> Dict[str, Any]:
         }
     }
 
-def _compute_period_metrics(session: Session, start_date: datetime, end_date: datetime, project_id: Optional[str] = None) -> Dict[str, Any]:
-    block_types = [
-        "intent_block_started", "intent_block_interrupted", "intent_block_ended",
-        "recovery_block_ended"
+
+def get_day_rollup(session: Session, date_str: str) -> Dict[str, Any]:
+    # 1. Get Daily Intents
+    events = all_events(session)
+    latest_intents = session.exec(
+        select(events.c.id, events.c.payload)
+        .where(events.c.type == "daily_intents_set")
+        .where(events.c.payload_date == date_str)
+        .order_by(events.c.ts.desc())
+    ).first()
+    daily_intents = _parse_payload(latest_intents).get("intents", []) if latest_intents else []
+            
+    # 2. Load Blocks (Work & Recovery) and todos from the day projections
+    day_blocks = session.exec(
+        select(DayBlock)
+        .where(DayBlock.date == date_str)
+        .order_by(DayBlock.started_at)
+    ).all()
+    day_recovery = session.exec(
+        select(DayRecovery)
+        .where(DayRecovery.date == date_str)
+        .order_by(DayRecovery.started_at)
+    ).all()
+    day_todos = session.exec(
+        select(DayTodo)
+        .where(DayTodo.date == date_str)
+        .where(DayTodo.deleted == False)  # noqa: E712
+        .order_by(DayTodo.added_at)
+    ).all()
+
+    return _build_day_rollup(date_str, daily_intents, day_blocks, day_recovery, day_todos)
+
+
+def get_days_range(session: Session, from_date: date, to_date: date) -> Dict[str, Any]:
+    """
+    Day rollups for every date in [from_date, to_date] plus range totals.
+    Same shape per day as get_day_rollup, but one query per source for the
+    whole range instead of one set of queries per day.
+    """
+    dates = [(from_date + timedelta(days=i)).isoformat() for i in range((to_date - from_date).days + 1)]
+    first, last = dates[0], dates[-1]
+
+    # Latest daily_intents_set per date: walk newest first, keep the first seen.
+    events = all_events(session)
+    intents_by_date: Dict[str, List[str]] = {}
+    for evt in session.exec(
+        select(events.c.payload_date, events.c.payload)
+        .where(events.c.type == "daily_intents_set")
+        .where(events.c.payload_date >= first)
+        .where(events.c.payload_date <= last)
+        .order_by(events.c.ts.desc())
+    ):
+        if evt.payload_date not in intents_by_date:
+            intents_by_date[evt.payload_date] = _parse_payload(evt).get("intents", [])
+
+    blocks_by_date: Dict[str, List[DayBlock]] = {}
+    for b in session.exec(
+        select(DayBlock).where(DayBlock.date >= first).where(DayBlock.date <= last).order_by(DayBlock.started_at)
+    ):
+        blocks_by_date.setdefault(b.date, []).append(b)
+
+    recovery_by_date: Dict[str, List[DayRecovery]] = {}
+    for r in session.exec(
+        select(DayRecovery).where(DayRecovery.date >= first).where(DayRecovery.date <= last).order_by(DayRecovery.started_at)
+    ):
+        recovery_by_date.setdefault(r.date, []).append(r)
+
+    todos_by_date: Dict[str, List[DayTodo]] = {}
+    for t in session.exec(
+        select(DayTodo)
+        .where(DayTodo.date >= first)
+        .where(DayTodo.date <= last)
+        .where(DayTodo.deleted == False)  # noqa: E712
+        .order_by(DayTodo.added_at)
+    ):
+        todos_by_date.setdefault(t.date, []).append(t)
+
+    days = [
+        _build_day_rollup(
+            d,
+            intents_by_date.get(d, []),
+            blocks_by_date.get(d, []),
+            recovery_by_date.get(d, []),
+            todos_by_date.get(d, []),
+        )
+        for d in dates
     ]
-    query = (
-        select(EventLog)
-        .where(EventLog.type.in_(block_types))
-        .where(EventLog.ts >= start_date)
-        .where(EventLog.ts < end_date)
-    )
-    if project_id:
-        query = query.where(EventLog.project_id == project_id)
 
-    events = session.exec(query).all()
+    summed = ["totalBlocks", "interruptedBlocks", "focusBlocks", "totalActiveMinutes",
+              "totalRecoveryMinutes", "todosAdded", "todosCompleted"]
+    totals: Dict[str, Any] = {key: sum(day["metrics"][key] for day in days) for key in summed}
+    totals["fragmentationRate"] = (
+        round(totals["interruptedBlocks"] / totals["totalBlocks"], 2) if totals["totalBlocks"] else 0.0
+    )
+    totals["totalActiveLabel"] = bucket_total_day(totals["totalActiveMinutes"])
+    totals["totalRecoveryLabel"] = (
+        bucket_total_day(totals["totalRecoveryMinutes"]) if totals["totalRecoveryMinutes"] > 0 else "~0 mins"
+    )
 
-    blocks_map: Dict[str, Dict[str, Any]] = {}
-    recovery_minutes = 0.0
-    fragmenter_counts: Dict[str, int] = {}
+    return {"from": first, "to": last, "days": days, "totals": totals}
 
-    for evt in events:
-        p = _parse_payload(evt)
-        block_id = p.get("blockId")
 
-        if evt.type == "recovery_block_ended":
-            recovery_minutes += (p.get("durationMinutes") or 0)
-            continue
+def _snapshot_covers(snapshot: RollupSnapshot, start_date: datetime, end_date: datetime) -> bool:
+    """True when every event the snapshot folded lies inside [start_date, end_date)."""
+    if snapshot.first_ts is not None and naive_utc(start_date) > snapshot.first_ts:
+        return False
+    return naive_utc(end_date) > snapshot.hwm_ts
 
-        if not block_id:
-            continue
 
-        if evt.type == "intent_block_started":
-            blocks_map[block_id] = {
-                "blockId": block_id,
-                "storyId": p.get("storyId"),
-                "intent": p.get("intent"),
-                "notes": p.get("notes"),
-                "date": p.get("date"),
-                "interrupted": False,
-                "durationMinutes": 0,
-                "reasonCode": None,
-                "actualOutcome": None,
-                "durationLabel": ""
-            }
-        elif block_id in blocks_map:
-            if evt.type == "intent_block_interrupted":
-                blocks_map[block_id]["interrupted"] = True
-                code = p.get("reasonCode")
-                blocks_map[block_id]["reasonCode"] = code
-                if code:
-                    fragmenter_counts[code] = fragmenter_counts.get(code, 0) + 1
-            elif evt.type == "intent_block_ended":
-                blocks_map[block_id]["actualOutcome"] = p.get("actualOutcome")
-                dur = p.get("durationMinutes") or 0
-                blocks_map[block_id]["durationMinutes"] = dur
-                blocks_map[block_id]["durationLabel"] = bucket_minutes_to_label(dur) or ""
-
-    blocks_list = list(blocks_map.values())
-    total_blocks = len(blocks_list)
-    interrupted_blocks = sum(1 for b in blocks_list if b["interrupted"])
-    focus_blocks = sum(1 for b in blocks_list if not b["interrupted"] and b["durationMinutes"] >= 30)
-    total_active_minutes = sum(b["durationMinutes"] for b in blocks_list)
+def _compute_period_state(
+    session: Session,
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[str] = None,
+    with_blocks: bool = True,
+) -> Dict[str, Any]:
+    """
+    Fold the period events logged in [start_date, end_date) into a period
+    state (see snapshots.new_period_state) holding every project's scope.
+    With project_id, only that project's scope is guaranteed complete.
+
+    Without with_blocks, when the latest rollup snapshot lies entirely inside
+    the window (lifetime rollups), its state is loaded and only the events
+    after its high-water mark are replayed. Its ended blocks are settled into
+    totals, so a state that must list every block never starts from one.
+    """
+    snapshot = latest_snapshot(session)
+    if snapshot is not None and not with_blocks and _snapshot_covers(snapshot, start_date, end_date):
+        state = json.loads(snapshot.state)
+        events = iter_period_events(session, snapshot=snapshot, end=naive_utc(end_date), project_id=project_id)
+        snapshot_usable = True
+    else:
+        state = new_period_state()
+        events = iter_period_events(session, start=naive_utc(start_date), end=naive_utc(end_date), project_id=project_id)
+        snapshot_usable = snapshot is None
+
+    replayed = 0
+    for evt in events:
+        fold_period_event(state, evt, _parse_payload(evt))
+        replayed += 1
+
+    threshold = settings.WORKOBS_SNAPSHOT_EVERY_EVENTS
+    if threshold and replayed > threshold and snapshot_usable:
+        schedule_snapshot(session.get_bind())
+    return state
+
+
+def _period_metrics_from_state(
+    state: Dict[str, Any],
+    project_id: Optional[str] = None,
+    with_blocks: bool = True,
+) -> Dict[str, Any]:
+    scope = state["scopes"].get(project_id or ALL_SCOPE, {"blocks": {}, "recoveryMinutes": 0.0, "fragmenters": {}})
+    recovery_minutes = scope["recoveryMinutes"]
+    total_blocks, interrupted_blocks, focus_blocks, total_active_minutes = block_totals(scope)
     total_active_label = bucket_total_day(total_active_minutes)
     total_recovery_label = bucket_total_day(int(recovery_minutes)) if recovery_minutes > 0 else "~0 mins"
     frag_rate = (interrupted_blocks / total_blocks) if total_blocks > 0 else 0.0
-    top_fragmenters = [{"code": k, "count": v} for k, v in fragmenter_counts.items()]
+    top_fragmenters = [{"code": k, "count": v} for k, v in scope["fragmenters"].items()]
     top_fragmenters.sort(key=lambda x: x["count"], reverse=True)
 
     # Count todos completed within this period (Option A: by completionDate timestamp)
-    todo_completion_events = session.exec(
-        select(EventLog)
-        .where(EventLog.type == "todo_completed")
-        .where(EventLog.ts >= start_date)
-        .where(EventLog.ts < end_date)
-    ).all()
-    todos_completed = len(todo_completion_events)
+    todos_completed = state["todosCompleted"]
 
-    return {
+    metrics = {
         "totalBlocks": total_blocks,
         "interruptedBlocks": interrupted_blocks,
         "fragmentationRate": round(frag_rate, 2),
@@ -255,23 +288,64 @@ def _compute_period_metrics(session: Session, start_date: datetime, end_date: da
         "totalRecoveryMinutes": int(recovery_minutes),
         "totalRecoveryLabel": total_recovery_label,
         "todosCompleted": todos_completed,
-        "blocks": blocks_list,
     }
+    if with_blocks:
+        metrics["blocks"] = list(scope["blocks"].values())
+    return metrics
+
+
+def _without_blocks(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in metrics.items() if k != "blocks"}
 
 
-def get_projects_dashboard(session: Session) -> List[Dict[str, Any]]:
+def _compute_period_metrics(
+    session: Session,
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[str] = None,
+    with_blocks: bool = True,
+) -> Dict[str, Any]:
+    """
+    Block, recovery and todo metrics for events logged in [start_date, end_date),
+    optionally limited to events tagged with project_id. with_blocks adds the
+    block list; without it, lifetime windows are served from the snapshot.
+    """
+    if columnar_metrics.enabled():
+        metrics = columnar_metrics.period_metrics(session, start_date, end_date, project_id)
+        return metrics if with_blocks else _without_blocks(metrics)
+    state = _compute_period_state(session, start_date, end_date, project_id=project_id, with_blocks=with_blocks)
+    return _period_metrics_from_state(state, project_id, with_blocks=with_blocks)
+
+
+def get_projects_dashboard(
+    session: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Metrics for every active project over [start_date, end_date) (lifetime
+    by default). The window is folded once, grouped by project_id, instead
+    of once per project. Metrics carry no block lists (see
+    /reports/projects/{id}/blocks), so lifetime views start from the snapshot.
+    """
     projects = session.exec(select(Project).where(Project.is_active == True)).all()
+    start = start_date or datetime.min.replace(tzinfo=timezone.utc)
+    end = end_date or datetime.max.replace(tzinfo=timezone.utc)
+    if projects and columnar_metrics.enabled():
+        metrics = {
+            pid: _without_blocks(m)
+            for pid, m in columnar_metrics.projects_period_metrics(session, start, end, [p.id for p in projects]).items()
+        }
+    else:
+        state = _compute_period_state(session, start, end, with_blocks=False) if projects else new_period_state()
+        metrics = {p.id: _period_metrics_from_state(state, p.id, with_blocks=False) for p in projects}
     dashboard = []
-    # Lifetime stats
-    start = datetime.min.replace(tzinfo=timezone.utc)
-    end = datetime.max.replace(tzinfo=timezone.utc)
     for p in projects:
-        metrics = _compute_period_metrics(session, start, end, project_id=p.id)
         dashboard.append({
             "id": p.id,
             "name": p.name,
             "description": p.description,
-            "metrics": metrics
+            "metrics": metrics[p.id]
         })
     return dashboard
 
@@ -282,33 +356,183 @@ def get_project_data(session: Session, project_id: str) -> Dict[str, Any]:
     start = datetime.min.replace(tzinfo=timezone.utc)
     end = datetime.max.replace(tzinfo=timezone.utc)
     metrics = _compute_period_metrics(session, start, end, project_id=project_id)
-    
-    sprints_payload = []
-    sprints = list_sprint_definitions(session, project_id=project_id)
-    for s in sprints:
-        sprints_payload.append({
-            "id": s.id,
-            "name": s.name,
-            "startDate": s.start_date.isoformat(),
-            "endDate": s.end_date.isoformat(),
-            "durationDays": s.duration_days,
-        })
-        
     return {
         "id": project.id,
         "name": project.name,
         "metrics": metrics,
-        "sprints": sprints_payload,
+        "sprints": _project_sprints(session, project_id),
         "blocks": metrics.get("blocks", [])
     }
 
 
-def _get_latest_sprint_summary_event(session: Session, sprint_id: str) -> Optional[EventLog]:
+def get_project_summary(session: Session, project_id: str) -> Dict[str, Any]:
+    """
+    Version 2 of the project data view: get_project_data's metrics and
+    sprints, without the block lists.
+    """
+    project = session.get(Project, project_id)
+    if not project:
+        return {}
+    start = datetime.min.replace(tzinfo=timezone.utc)
+    end = datetime.max.replace(tzinfo=timezone.utc)
+    return {
+        "id": project.id,
+        "name": project.name,
+        "metrics": _compute_period_metrics(session, start, end, project_id=project_id, with_blocks=False),
+        "sprints": _project_sprints(session, project_id),
+    }
+
+
+def _project_sprints(session: Session, project_id: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": s.id,
+            "name": s.name,
+            "startDate": s.start_date.isoformat(),
+            "endDate": s.end_date.isoformat(),
+            "durationDays": s.duration_days,
+        }
+        for s in list_sprint_definitions(session, project_id=project_id)
+    ]
+
+
+# ── Project blocks ───────────────────────────────────────────────────────────
+
+PROJECT_BLOCKS_PAGE_SIZE = 100
+MAX_PROJECT_BLOCKS_PAGE_SIZE = 1000
+
+
+def _encode_block_cursor(block: DayBlock) -> str:
+    """Opaque keyset cursor for the (date, started_at, block_id) position of a block."""
+    raw = f"{block.date}|{block.started_at.isoformat()}|{block.block_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_block_cursor(cursor: str) -> Tuple[str, datetime, str]:
+    """Inverse of _encode_block_cursor. Raises ValueError on malformed input."""
+    try:
+        day, started_raw, block_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 2)
+        return day, datetime.fromisoformat(started_raw), block_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _project_blocks_query(
+    project_id: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    after: Optional[str] = None,
+):
+    query = (
+        select(DayBlock)
+        .where(DayBlock.project_id == project_id)
+        .order_by(DayBlock.date.desc(), DayBlock.started_at.desc(), DayBlock.block_id.desc())
+    )
+    if from_date:
+        query = query.where(DayBlock.date >= from_date.isoformat())
+    if to_date:
+        query = query.where(DayBlock.date <= to_date.isoformat())
+    if after:
+        query = query.where(
+            tuple_(DayBlock.date, DayBlock.started_at, DayBlock.block_id) < tuple_(*decode_block_cursor(after))
+        )
+    return query
+
+
+def get_project_blocks_page(
+    session: Session,
+    project_id: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    after: Optional[str] = None,
+    limit: int = PROJECT_BLOCKS_PAGE_SIZE,
+) -> Dict[str, Any]:
+    """
+    One keyset page of a project's blocks, newest day first, read from the
+    day_blocks projection. nextCursor is None on the last page.
+    """
+    blocks = session.exec(_project_blocks_query(project_id, from_date, to_date, after).limit(limit + 1)).all()
+    next_cursor = _encode_block_cursor(blocks[limit - 1]) if len(blocks) > limit else None
+    return {"items": [_day_block_to_dict(b) for b in blocks[:limit]], "nextCursor": next_cursor}
+
+
+def iter_project_blocks(
+    session: Session,
+    project_id: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    after: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """A project's blocks in get_project_blocks_page order, in constant memory."""
+    query = _project_blocks_query(project_id, from_date, to_date, after).execution_options(yield_per=batch_size)
+    for block in session.exec(query):
+        yield _day_block_to_dict(block)
+
+
+TODOS_MAX_PAGE_SIZE = 1000
+
+
+def _encode_todo_cursor(todo: DayTodo) -> str:
+    """Opaque keyset cursor for the (date, added_at, todo_id) position of a todo."""
+    raw = f"{todo.date}|{todo.added_at.isoformat()}|{todo.todo_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_todo_cursor(cursor: str) -> Tuple[str, datetime, str]:
+    """Inverse of _encode_todo_cursor. Raises ValueError on malformed input."""
+    try:
+        day, added_raw, todo_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 2)
+        return day, datetime.fromisoformat(added_raw), todo_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def list_todos(
+    session: Session,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    completed: Optional[bool] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Non-deleted todos from the day_todos projection, newest date first and in
+    the order they were added within a date. Without a limit every matching
+    todo is returned; with one, nextCursor continues the list (None on the
+    last page).
+    """
+    query = (
+        select(DayTodo)
+        .where(DayTodo.deleted == False)  # noqa: E712
+        .order_by(DayTodo.date.desc(), DayTodo.added_at, DayTodo.todo_id)
+    )
+    if completed is not None:
+        query = query.where(DayTodo.completed == completed)
+    if from_date:
+        query = query.where(DayTodo.date >= from_date.isoformat())
+    if to_date:
+        query = query.where(DayTodo.date <= to_date.isoformat())
+    if after:
+        day, added_at, todo_id = decode_todo_cursor(after)
+        query = query.where(or_(
+            DayTodo.date < day,
+            and_(DayTodo.date == day, tuple_(DayTodo.added_at, DayTodo.todo_id) > tuple_(added_at, todo_id)),
+        ))
+    if limit is None:
+        return {"todos": [_day_todo_to_dict(t) for t in session.exec(query).all()], "nextCursor": None}
+    todos = session.exec(query.limit(limit + 1)).all()
+    next_cursor = _encode_todo_cursor(todos[limit - 1]) if len(todos) > limit else None
+    return {"todos": [_day_todo_to_dict(t) for t in todos[:limit]], "nextCursor": next_cursor}
+
+
+def _get_latest_sprint_summary_event(session: Session, sprint_id: str) -> Optional[Any]:
+    events = all_events(session)
     return session.exec(
-        select(EventLog)
-        .where(EventLog.type == "sprint_summary_saved")
-        .where(EventLog.payload.contains(f'"sprintId": "{sprint_id}"'))
-        .order_by(EventLog.ts.desc())
+        select(*events.c)
+        .where(events.c.type == "sprint_summary_saved")
+        .where(events.c.sprint_id == sprint_id)
+        .order_by(events.c.ts.desc())
     ).first()
 
 
@@ -348,34 +572,21 @@ def get_sprint_story_metrics(session: Session, sprint_id: str) -> Dict[str, Any]
     }
 
 
-def get_sprint_rollup(session: Session, sprint_id: str) -> Dict[str, Any]:
-    sprint = session.get(SprintDefinition, sprint_id)
-    if not sprint:
-        return {
-            "sprintId": sprint_id,
-            "metrics": {
-                "totalBlocks": 0,
-                "interruptedBlocks": 0,
-                "fragmentationRate": 0.0,
-                "focusBlocks": 0,
-                "topFragmenters": [],
-                "totalActiveMinutes": 0,
-                "totalActiveLabel": "~0 mins",
-                "totalRecoveryMinutes": 0,
-                "totalRecoveryLabel": "~0 mins",
-            },
-            "reflection": {
-                "topFragmenters": [],
-                "notPerformanceIssues": [],
-                "oneChangeNextWeek": "",
-            },
-        }
+# Metrics reported for a sprint id with no SprintDefinition.
+_EMPTY_SPRINT_METRICS: Dict[str, Any] = {
+    "totalBlocks": 0,
+    "interruptedBlocks": 0,
+    "fragmentationRate": 0.0,
+    "focusBlocks": 0,
+    "topFragmenters": [],
+    "totalActiveMinutes": 0,
+    "totalActiveLabel": "~0 mins",
+    "totalRecoveryMinutes": 0,
+    "totalRecoveryLabel": "~0 mins",
+}
 
-    start_dt = datetime.combine(sprint.start_date, datetime.min.time())
-    end_dt = datetime.combine(sprint.end_date + timedelta(days=1), datetime.min.time())
-    metrics = _compute_period_metrics(session, start_dt, end_dt)
-    story_metrics = get_sprint_story_metrics(session, sprint_id)
 
+def _get_sprint_reflection(session: Session, sprint_id: str) -> Dict[str, Any]:
     reflection = {
         "topFragmenters": [],
         "notPerformanceIssues": [],
@@ -387,7 +598,15 @@ def get_sprint_rollup(session: Session, sprint_id: str) -> Dict[str, Any]:
         reflection["topFragmenters"] = p.get("topFragmenters", [])
         reflection["notPerformanceIssues"] = p.get("notPerformanceIssues", [])
         reflection["oneChangeNextWeek"] = p.get("oneChangeNextWeek", "")
+    return reflection
 
+
+def _sprint_rollup_dict(
+    sprint: SprintDefinition,
+    metrics: Dict[str, Any],
+    story_metrics: Dict[str, Any],
+    reflection: Dict[str, Any],
+) -> Dict[str, Any]:
     return {
         "sprintId": sprint.id,
         "projectId": sprint.project_id,
@@ -401,6 +620,115 @@ def get_sprint_rollup(session: Session, sprint_id: str) -> Dict[str, Any]:
     }
 
 
+def _compute_sprint_rollup(session: Session, sprint: SprintDefinition) -> Dict[str, Any]:
+    start_dt = datetime.combine(sprint.start_date, datetime.min.time())
+    end_dt = datetime.combine(sprint.end_date + timedelta(days=1), datetime.min.time())
+    return _sprint_rollup_dict(
+        sprint,
+        _compute_period_metrics(session, start_dt, end_dt),
+        get_sprint_story_metrics(session, sprint.id),
+        _get_sprint_reflection(session, sprint.id),
+    )
+
+
+def get_sprint_rollup(session: Session, sprint_id: str) -> Dict[str, Any]:
+    sprint = session.get(SprintDefinition, sprint_id)
+    if not sprint:
+        return {
+            "sprintId": sprint_id,
+            "metrics": dict(_EMPTY_SPRINT_METRICS),
+            "reflection": {
+                "topFragmenters": [],
+                "notPerformanceIssues": [],
+                "oneChangeNextWeek": "",
+            },
+        }
+
+    frozen = session.get(SprintRollupSnapshot, sprint_id)
+    if frozen is not None:
+        return _sprint_rollup_dict(
+            sprint,
+            json.loads(frozen.metrics),
+            json.loads(frozen.stories),
+            json.loads(frozen.reflection),
+        )
+    return _compute_sprint_rollup(session, sprint)
+
+
+# ── Frozen sprint rollups ──────────────────────────────────────────────────────
+# A closed sprint's rollup is computed once and stored in sprint_rollup_snapshots.
+# None of these commit; the caller commits with its own changes.
+
+def freeze_sprint_rollup(session: Session, sprint: SprintDefinition) -> SprintRollupSnapshot:
+    """(Re)compute the sprint's rollup from the log and store it as its frozen snapshot."""
+    rollup = _compute_sprint_rollup(session, sprint)
+    frozen = session.get(SprintRollupSnapshot, sprint.id) or SprintRollupSnapshot(
+        sprint_id=sprint.id, metrics="", stories="", reflection=""
+    )
+    frozen.metrics = json.dumps(rollup["metrics"])
+    frozen.stories = json.dumps(rollup["stories"])
+    frozen.reflection = json.dumps(rollup["reflection"])
+    frozen.frozen_at = datetime.now(timezone.utc)
+    session.add(frozen)
+    return frozen
+
+
+def thaw_sprint_rollup(session: Session, sprint_id: str) -> bool:
+    """Drop the sprint's frozen snapshot, if any, so it is recomputed on read."""
+    frozen = session.get(SprintRollupSnapshot, sprint_id)
+    if frozen is None:
+        return False
+    session.delete(frozen)
+    return True
+
+
+def update_frozen_sprint_rollup(
+    session: Session,
+    sprint_id: str,
+    stories: bool = False,
+    reflection: bool = False,
+) -> None:
+    """
+    Refresh the parts of a frozen snapshot that the closing workflow itself
+    still changes — carried-over stories and the saved reflection. The block
+    metrics stay frozen.
+    """
+    frozen = session.get(SprintRollupSnapshot, sprint_id)
+    if frozen is None:
+        return
+    if stories:
+        frozen.stories = json.dumps(get_sprint_story_metrics(session, sprint_id))
+    if reflection:
+        frozen.reflection = json.dumps(_get_sprint_reflection(session, sprint_id))
+    session.add(frozen)
+
+
+# ── Cached rollups (see app.services.rollup_cache) ─────────────────────────────
+# Each returns (rollup, cache status); bypass recomputes without the cache.
+
+def cached_day_rollup(session: Session, date_str: str, bypass: bool = False) -> Tuple[Dict[str, Any], str]:
+    return cached(session, day_key(date_str), lambda: get_day_rollup(session, date_str), bypass)
+
+
+def cached_sprint_rollup(session: Session, sprint_id: str, bypass: bool = False) -> Tuple[Dict[str, Any], str]:
+    sprint = session.get(SprintDefinition, sprint_id)
+    window = None
+    if sprint:
+        window = (
+            datetime.combine(sprint.start_date, datetime.min.time()),
+            datetime.combine(sprint.end_date + timedelta(days=1), datetime.min.time()),
+        )
+    return cached(session, sprint_key(sprint_id), lambda: get_sprint_rollup(session, sprint_id), bypass, window)
+
+
+def cached_project_data(session: Session, project_id: str, bypass: bool = False) -> Tuple[Dict[str, Any], str]:
+    return cached(session, project_key(project_id), lambda: get_project_data(session, project_id), bypass)
+
+
+def cached_project_summary(session: Session, project_id: str, bypass: bool = False) -> Tuple[Dict[str, Any], str]:
+    return cached(session, project_summary_key(project_id), lambda: get_project_summary(session, project_id), bypass)
+
+
 def list_sprint_definitions(session: Session, project_id: Optional[str] = None) -> List[SprintDefinition]:
     query = select(SprintDefinition).where(SprintDefinition.is_archived == False)  # noqa: E712
     if project_id:
@@ -412,39 +740,99 @@ def has_saved_sprint_summary(session: Session, sprint_id: str) -> bool:
     return _get_latest_sprint_summary_event(session, sprint_id) is not None
 
 
+def _merge_windows(windows: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    merged: List[Tuple[datetime, datetime]] = []
+    for lo, hi in sorted(windows):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _compute_sprint_metrics(session: Session, sprints: List[SprintDefinition]) -> Dict[str, Dict[str, Any]]:
+    """
+    _compute_period_metrics for many sprint windows at once: one ordered pass
+    over the events inside any of the windows, each event folded into every
+    sprint whose window contains it.
+    """
+    windows = sorted(
+        (
+            datetime.combine(s.start_date, datetime.min.time()),
+            datetime.combine(s.end_date + timedelta(days=1), datetime.min.time()),
+            s.id,
+        )
+        for s in sprints
+    )
+    states = {sprint_id: new_period_state() for _, _, sprint_id in windows}
+    if windows:
+        # Sweep: events arrive in ts order, so a window becomes active once
+        # its start is reached and is retired once its end has passed.
+        pending = 0
+        active: List[Tuple[datetime, datetime, str]] = []
+        for evt in iter_period_events(session, windows=_merge_windows([(lo, hi) for lo, hi, _ in windows])):
+            while pending < len(windows) and windows[pending][0] <= evt.ts:
+                active.append(windows[pending])
+                pending += 1
+            active = [w for w in active if w[1] > evt.ts]
+            if not active:
+                continue
+            p = _parse_payload(evt)
+            for _, _, sprint_id in active:
+                fold_period_event(states[sprint_id], evt, p, by_project=False)
+    return {sprint_id: _period_metrics_from_state(state) for sprint_id, state in states.items()}
+
+
 def list_sprint_summaries(session: Session, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    events = all_events(session)
     summary_events = session.exec(
-        select(EventLog)
-        .where(EventLog.type == "sprint_summary_saved")
-        .order_by(EventLog.ts.desc())
+        select(*events.c)
+        .where(events.c.type == "sprint_summary_saved")
+        .order_by(events.c.ts.desc())
     ).all()
 
-    latest_by_sprint: Dict[str, EventLog] = {}
+    latest_by_sprint: Dict[str, Any] = {}
     for evt in summary_events:
-        payload = _parse_payload(evt)
-        sprint_id = payload.get("sprintId")
+        sprint_id = evt.sprint_id or _parse_payload(evt).get("sprintId")
         if sprint_id and sprint_id not in latest_by_sprint:
             latest_by_sprint[sprint_id] = evt
 
+    # One IN query for the definitions, with the project filter applied
+    # before any metrics are computed.
+    query = select(SprintDefinition).where(SprintDefinition.id.in_(list(latest_by_sprint)))
+    if project_id:
+        query = query.where(SprintDefinition.project_id == project_id)
+    sprints = {s.id: s for s in session.exec(query).all()} if latest_by_sprint else {}
+    # Closed sprints are served from their frozen snapshots; only the rest are folded.
+    metrics_by_sprint = {
+        frozen.sprint_id: json.loads(frozen.metrics)
+        for frozen in session.exec(
+            select(SprintRollupSnapshot).where(SprintRollupSnapshot.sprint_id.in_(list(sprints)))
+        ).all()
+    } if sprints else {}
+    metrics_by_sprint.update(_compute_sprint_metrics(
+        session, [s for s in sprints.values() if s.id not in metrics_by_sprint]
+    ))
+
     items: List[Dict[str, Any]] = []
     for sprint_id, evt in latest_by_sprint.items():
-        rollup = get_sprint_rollup(session, sprint_id)
-        if project_id and rollup.get("projectId") != project_id:
+        sprint = sprints.get(sprint_id)
+        if sprint is None and project_id:
             continue
         payload = _parse_payload(evt)
         items.append(
             {
                 "sprintId": sprint_id,
-                "projectId": rollup.get("projectId"),
-                "name": rollup.get("name"),
-                "startDate": rollup.get("startDate"),
-                "endDate": rollup.get("endDate"),
-                "durationDays": rollup.get("durationDays"),
+                "projectId": sprint.project_id if sprint else None,
+                "name": sprint.name if sprint else None,
+                "startDate": sprint.start_date.isoformat() if sprint else None,
+                "endDate": sprint.end_date.isoformat() if sprint else None,
+                "durationDays": sprint.duration_days if sprint else None,
                 "savedAt": evt.ts.isoformat() if evt.ts else None,
                 "topFragmenters": payload.get("topFragmenters", []),
                 "notPerformanceIssues": payload.get("notPerformanceIssues", []),
                 "oneChangeNextWeek": payload.get("oneChangeNextWeek", ""),
-                "metrics": rollup.get("metrics", {}),
+                "metrics": metrics_by_sprint[sprint_id] if sprint else dict(_EMPTY_SPRINT_METRICS),
             }
         )
 
@@ -452,4 +840,102 @@ def list_sprint_summaries(session: Session, project_id: Optional[str] = None) ->
     return items
 
 
+# ── Financial year rollup ──────────────────────────────────────────────────────
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.month - 1 + months
+    year, month = d.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def _fy_periods(start: date, end: date) -> Dict[str, List[Tuple[str, date, date]]]:
+    """Quarters (from the FY start), calendar months and ISO weeks, clipped to [start, end]."""
+    periods: Dict[str, List[Tuple[str, date, date]]] = {"quarters": [], "months": [], "weeks": []}
+    cursor, number = start, 1
+    while cursor <= end:
+        following = _add_months(start, 3 * number)
+        periods["quarters"].append((f"Q{number}", cursor, min(following - timedelta(days=1), end)))
+        cursor, number = following, number + 1
+    cursor = start
+    while cursor <= end:
+        following = _add_months(cursor.replace(day=1), 1)
+        periods["months"].append((cursor.strftime("%Y-%m"), cursor, min(following - timedelta(days=1), end)))
+        cursor = following
+    cursor = start
+    while cursor <= end:
+        iso = cursor.isocalendar()
+        week_end = min(cursor + timedelta(days=6 - cursor.weekday()), end)
+        periods["weeks"].append((f"{iso[0]}-W{iso[1]:02d}", cursor, week_end))
+        cursor = week_end + timedelta(days=1)
+    return periods
+
+
+def _story_totals(rows: List[Any]) -> Dict[str, Any]:
+    return {
+        "sprintsEnded": len(rows),
+        "pointsCommitted": sum(r.points_committed or 0 for r in rows),
+        "pointsDelivered": sum(r.points_delivered or 0 for r in rows),
+        "storiesDone": sum(r.stories_done or 0 for r in rows),
+        "storiesCarriedOver": sum(r.stories_carried_over or 0 for r in rows),
+    }
+
+
+def get_financial_year_rollup(session: Session, fy: FinancialYear) -> Dict[str, Any]:
+    """
+    Year, quarter, month and ISO-week metrics for a financial year.
+
+    Block metrics are summed from daily_metrics (one row per day and reason
+    code, so at most a few thousand rows for a year). Velocity and carried-over
+    counts come from one grouped query over the stories of sprints ending in
+    the year, each sprint counted in the period holding its end date.
+    """
+    c = DailyMetric.__table__.c
+    day_rows = metric_rows(session, fy.start_date, fy.end_date, None, c.date, c.reason_code)
+
+    sprint_rows = session.exec(
+        select(
+            SprintDefinition.id,
+            SprintDefinition.end_date,
+            func.sum(func.coalesce(UserStory.story_points, 0)).label("points_committed"),
+            func.sum(case((UserStory.status == "DONE", func.coalesce(UserStory.story_points, 0)), else_=0)).label("points_delivered"),
+            func.sum(case((UserStory.status == "DONE", 1), else_=0)).label("stories_done"),
+            func.sum(case((UserStory.status == "CARRIED_OVER", 1), else_=0)).label("stories_carried_over"),
+        )
+        .select_from(SprintDefinition)
+        .outerjoin(UserStory, (UserStory.sprint_id == SprintDefinition.id) & (UserStory.is_deleted == False))  # noqa: E712
+        .where(SprintDefinition.is_archived == False)  # noqa: E712
+        .where(SprintDefinition.end_date >= fy.start_date)
+        .where(SprintDefinition.end_date <= fy.end_date)
+        .group_by(SprintDefinition.id, SprintDefinition.end_date)
+    ).all()
+
+    periods = _fy_periods(fy.start_date, fy.end_date)
+    breakdowns: Dict[str, Any] = {}
+    for name, buckets in periods.items():
+        starts = [lo.isoformat() for _, lo, _ in buckets]
+        metrics_rows: List[List[Any]] = [[] for _ in buckets]
+        story_rows: List[List[Any]] = [[] for _ in buckets]
+        for row in day_rows:
+            metrics_rows[bisect.bisect_right(starts, row.date) - 1].append(row)
+        for row in sprint_rows:
+            story_rows[bisect.bisect_right(starts, row.end_date.isoformat()) - 1].append(row)
+        breakdowns[name] = [
+            {
+                "key": key,
+                "from": lo.isoformat(),
+                "to": hi.isoformat(),
+                "metrics": summarize_metrics(metrics_rows[i]),
+                "stories": _story_totals(story_rows[i]),
+            }
+            for i, (key, lo, hi) in enumerate(buckets)
+        ]
 
+    return {
+        "financialYearId": fy.id,
+        "label": fy.label,
+        "startDate": fy.start_date.isoformat(),
+        "endDate": fy.end_date.isoformat(),
+        "metrics": summarize_metrics(day_rows),
+        "stories": _story_totals(sprint_rows),
+        **breakdowns,
+    }
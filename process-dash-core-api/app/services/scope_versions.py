@@ -0,0 +1,136 @@
+"""
+Scope versions — persistent change tokens behind the rollup ETags.
+
+Every commit that the rollup cache sees as touching a rollup (see
+rollup_cache.Invalidation) also replaces the version token of the matching
+scopes in scope_versions, in the same transaction:
+
+  - "day:<date>", "sprint:<id>", "project:<id>"  one rollup's inputs
+  - "<kind>:*"                                    every rollup of a kind
+                                                  (todo events: all projects)
+  - "projects"                                    any project's metrics
+                                                  (the projects dashboard)
+  - "*"                                           everything (log rewrites)
+
+A period event's ts names the sprints whose window contains it. An ETag is a
+digest of the tokens of the scopes a response reads, so answering
+If-None-Match costs one indexed lookup instead of a rollup. Tokens are random,
+never counters, so a restored backup cannot reuse a token for other data.
+
+The "*" token doubles as the cross-process signal for log rewrites:
+archive_events.py --compact bumps it from its own process, and the rollup
+cache drops its entries when it sees the token move (everything_version).
+"""
+import hashlib
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.models import ScopeVersion, SprintDefinition
+
+EVERYTHING = "*"
+ALL_PROJECTS = "projects"
+
+
+def key_scope(key) -> str:
+    """Scope name of a rollup cache key, e.g. ("day", "2026-03-02") -> "day:2026-03-02"."""
+    return f"{key[0]}:{key[1]}"
+
+
+def changed_scopes(session: Session, changes) -> Set[str]:
+    """The scopes an Invalidation (see rollup_cache) touches."""
+    if changes.everything:
+        return {EVERYTHING}
+    scopes = {key_scope(key) for key in changes.keys}
+    scopes.update(f"{kind}:*" for kind in changes.kinds)
+    if changes.timestamps:
+        days = {ts.date() for ts in changes.timestamps}
+        sprint_ids = session.exec(
+            select(SprintDefinition.id).where(
+                or_(*[and_(SprintDefinition.start_date <= d, SprintDefinition.end_date >= d) for d in days])
+            )
+        ).all()
+        scopes.update(f"sprint:{sprint_id}" for sprint_id in sprint_ids)
+    if any(scope.startswith("project:") for scope in scopes):
+        scopes.add(ALL_PROJECTS)
+    return scopes
+
+
+def bump(session: Session, scopes: Iterable[str]) -> None:
+    """Give each scope a new version token. Does not commit."""
+    now = datetime.now(timezone.utc)
+    rows = [{"scope": scope, "version": uuid.uuid4().hex, "updated_at": now} for scope in sorted(scopes)]
+    if not rows:
+        return
+    stmt = sqlite_insert(ScopeVersion.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope"],
+        set_={"version": stmt.excluded.version, "updated_at": stmt.excluded.updated_at},
+    )
+    session.execute(stmt, rows)
+
+
+_has_table: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _table_exists(session: Session) -> bool:
+    bind = session.get_bind()
+    if bind not in _has_table:
+        _has_table[bind] = inspect(session.connection()).has_table(ScopeVersion.__tablename__)
+    return _has_table[bind]
+
+
+def record_changes(session: Session, changes) -> None:
+    """
+    Bump the scopes a transaction's changes touch, before it commits.
+    Skipped on databases without scope_versions yet (mid-migration).
+    """
+    if _table_exists(session):
+        bump(session, changed_scopes(session, changes))
+
+
+def everything_version(session: Session) -> Optional[str]:
+    """The current "*" token (None if it was never bumped, or mid-migration)."""
+    if not _table_exists(session):
+        return None
+    return session.exec(select(ScopeVersion.version).where(ScopeVersion.scope == EVERYTHING)).first()
+
+
+def etag(session: Session, scopes: List[str], variant: str = "") -> str:
+    """
+    A strong ETag over the current tokens of `scopes` (plus "*"). `variant`
+    tells apart representations built from the same scopes.
+    """
+    scopes = [EVERYTHING] + [s for s in scopes if s != EVERYTHING]
+    tokens = dict(session.exec(
+        select(ScopeVersion.scope, ScopeVersion.version).where(ScopeVersion.scope.in_(scopes))
+    ).all())
+    parts = [f"{s}={tokens.get(s, '0')}" for s in scopes] + ([variant] if variant else [])
+    digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def rollup_etag(session: Session, key) -> str:
+    """ETag for one cached rollup: its own scope plus its kind's (and its variant)."""
+    return etag(session, [f"{key[0]}:*", key_scope(key)], "|".join(key[2:]))
+
+
+def etag_matches(if_none_match: Optional[str], current: str) -> bool:
+    """True when an If-None-Match header lists the current ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == current:
+            return True
+    return False
+
+
+def etag_headers(current: str) -> Dict[str, str]:
+    # no-cache: clients may keep the body but must revalidate before reusing it.
+    return {"ETag": current, "Cache-Control": "no-cache"}
@@ -0,0 +1,318 @@
+"""
+Full-text search — an SQLite FTS5 index over the text the app records.
+
+Each searchable thing is one document: a row in search_documents (kind,
+ref_id, date, project_id) plus a row with the same rowid in the search_fts
+virtual table (title, body):
+
+  kind            ref_id      title                body
+  story           story id    title                description, acceptance criteria
+  block           block id    intent               notes, actual outcome
+  todo            todo id     text
+  intents         date                             the day's intents
+  sprint_summary  sprint id   sprint name          one change, fragmenters, not-performance issues
+
+Documents follow their source in the same transaction:
+
+  - stories, blocks and todos are re-indexed from their rows on every flush
+    that touches them (UserStory, DayBlock, DayTodo), whichever path wrote them
+  - daily intents and sprint summaries exist only as events, so log_event /
+    log_events index those events directly (index_events)
+  - a sprint summary's title, date and project come from its sprint, so a
+    flush that renames, moves or re-dates a SprintDefinition rewrites them
+
+A deleted story or todo loses its document. rebuild_search_index()
+recomputes everything from the tables and the log. The FTS table uses the
+porter stemmer, so "debugging" finds "debugged".
+
+Indexed text is stored as written. search() HTML-escapes titles and snippets
+and adds the <mark> tags itself, so results are safe to render as HTML.
+"""
+import html
+import json
+import re
+import weakref
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event as sa_event, inspect, insert, select, text, update
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import get_history
+from sqlmodel import Session
+
+from app.models import DayBlock, DayTodo, SearchDocument, SprintDefinition, UserStory
+
+FTS_TABLE = "search_fts"   # created with search_documents (see models.SEARCH_FTS_DDL)
+
+KINDS = ("story", "block", "todo", "intents", "sprint_summary")
+EVENT_KINDS = {"daily_intents_set": "intents", "sprint_summary_saved": "sprint_summary"}
+
+MAX_RESULTS = 100
+SNIPPET_TOKENS = 16
+MARK = ("<mark>", "</mark>")
+# Private-use characters FTS5 puts around matches; swapped for MARK after escaping.
+_SENTINELS = ("\ue000", "\ue001")
+
+Document = Optional[Dict[str, Any]]   # date, project_id, title, body; None removes it
+DocKey = Tuple[str, str]               # (kind, ref_id)
+
+_documents = SearchDocument.__table__
+
+
+def _join(*parts: Any) -> str:
+    return "\n".join(str(p) for p in parts if p)
+
+
+# ── Documents ────────────────────────────────────────────────────────────────
+
+def _row_document(obj: Any) -> Tuple[DocKey, Document]:
+    if isinstance(obj, UserStory):
+        doc = None if obj.is_deleted else {
+            "date": obj.created_at.date().isoformat() if obj.created_at else None,
+            "project_id": obj.project_id,
+            "title": obj.title,
+            "body": _join(obj.description, obj.acceptance_criteria),
+        }
+        return ("story", obj.id), doc
+    if isinstance(obj, DayBlock):
+        return ("block", obj.block_id), {
+            "date": obj.date,
+            "project_id": obj.project_id,
+            "title": obj.intent or "",
+            "body": _join(obj.notes, obj.actual_outcome),
+        }
+    doc = None if obj.deleted else {"date": obj.date, "project_id": None, "title": obj.text, "body": ""}
+    return ("todo", obj.todo_id), doc
+
+
+def _event_document(session: Session, event_type: str, p: dict) -> Optional[Tuple[DocKey, Document]]:
+    if event_type == "daily_intents_set" and isinstance(p.get("date"), str):
+        return ("intents", p["date"]), {
+            "date": p["date"], "project_id": None, "title": "", "body": _join(*(p.get("intents") or [])),
+        }
+    if event_type == "sprint_summary_saved" and isinstance(p.get("sprintId"), str):
+        sprint = session.get(SprintDefinition, p["sprintId"])
+        return ("sprint_summary", p["sprintId"]), {
+            **_sprint_fields(sprint),
+            "body": _join(p.get("oneChangeNextWeek"), *(p.get("topFragmenters") or []), *(p.get("notPerformanceIssues") or [])),
+        }
+    return None
+
+
+def _sprint_fields(sprint: Optional[SprintDefinition]) -> Dict[str, Any]:
+    """The parts of a sprint summary document that come from the sprint itself."""
+    return {
+        "date": sprint.end_date.isoformat() if sprint else None,
+        "project_id": sprint.project_id if sprint else None,
+        "title": sprint.name if sprint else "",
+    }
+
+
+def _sprint_summary_document(conn: Any, sprint: SprintDefinition) -> Document:
+    """The sprint's summary document with the sprint's current fields (None if it has none)."""
+    body = conn.execute(
+        text(f"""
+            SELECT f.body FROM {FTS_TABLE} f JOIN search_documents d ON d.id = f.rowid
+            WHERE d.kind = 'sprint_summary' AND d.ref_id = :ref_id
+        """),
+        {"ref_id": sprint.id},
+    ).scalar()
+    return None if body is None else {**_sprint_fields(sprint), "body": body}
+
+
+def _put(conn: Any, key: DocKey, doc: Document) -> None:
+    """Insert, replace or (doc=None) remove one document."""
+    kind, ref_id = key
+    doc_id = conn.execute(
+        select(_documents.c.id).where(_documents.c.kind == kind).where(_documents.c.ref_id == ref_id)
+    ).scalar()
+    if doc_id is not None:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": doc_id})
+        if doc is None:
+            conn.execute(delete(_documents).where(_documents.c.id == doc_id))
+            return
+        conn.execute(
+            update(_documents).where(_documents.c.id == doc_id).values(date=doc["date"], project_id=doc["project_id"])
+        )
+    elif doc is None:
+        return
+    else:
+        doc_id = conn.execute(
+            insert(_documents).values(kind=kind, ref_id=ref_id, date=doc["date"], project_id=doc["project_id"])
+        ).inserted_primary_key[0]
+    conn.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (:id, :title, :body)"),
+        {"id": doc_id, "title": _unmarked(doc["title"]), "body": _unmarked(doc["body"])},
+    )
+
+
+def _unmarked(value: Optional[str]) -> str:
+    """Indexed text without the highlight sentinels, so only search() can place MARK tags."""
+    return (value or "").replace(_SENTINELS[0], "").replace(_SENTINELS[1], "")
+
+
+_has_index: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _index_ready(session: OrmSession) -> bool:
+    """False on databases without the search tables yet (mid-migration)."""
+    bind = session.get_bind()
+    if bind not in _has_index:
+        _has_index[bind] = inspect(session.connection()).has_table(FTS_TABLE)
+    return _has_index[bind]
+
+
+def index_events(session: Session, events: List[Any], payloads: Optional[List[dict]] = None) -> None:
+    """Index the daily intents and sprint summaries among a batch of events."""
+    if not any(e.type in EVENT_KINDS for e in events) or not _index_ready(session):
+        return
+    if payloads is None:
+        payloads = [json.loads(e.payload) if e.type in EVENT_KINDS else None for e in events]
+    conn = session.connection()
+    for event, p in zip(events, payloads):
+        if event.type in EVENT_KINDS:
+            found = _event_document(session, event.type, p)
+            if found:
+                _put(conn, *found)
+
+
+_INDEXED_MODELS = (UserStory, DayBlock, DayTodo)
+_SPRINT_SUMMARY_FIELDS = ("name", "end_date", "project_id")
+
+
+@sa_event.listens_for(OrmSession, "after_flush")
+def _after_flush(session: OrmSession, flush_context: Any) -> None:
+    changed: Dict[DocKey, Document] = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, _INDEXED_MODELS):
+            key, doc = _row_document(obj)
+            changed[key] = doc
+    for obj in session.deleted:
+        if isinstance(obj, _INDEXED_MODELS):
+            changed[_row_document(obj)[0]] = None
+    sprints = [
+        obj for obj in session.dirty
+        if isinstance(obj, SprintDefinition)
+        and any(get_history(obj, name).has_changes() for name in _SPRINT_SUMMARY_FIELDS)
+    ]
+    if not (changed or sprints) or not _index_ready(session):
+        return
+    conn = session.connection()
+    for key, doc in changed.items():
+        _put(conn, key, doc)
+    for sprint in sprints:
+        doc = _sprint_summary_document(conn, sprint)
+        if doc is not None:
+            _put(conn, ("sprint_summary", sprint.id), doc)
+
+
+def rebuild_search_index(session: Session) -> int:
+    """
+    Recompute every document from user_stories, day_blocks, day_todos and the
+    latest intents / summary events. Does not commit; returns the document count.
+    """
+    from app.services.archive import all_events  # local import to avoid a cycle
+
+    conn = session.connection()
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    conn.execute(delete(_documents))
+    count = 0
+    for model in _INDEXED_MODELS:
+        for obj in session.exec(select(model).execution_options(yield_per=1000)).scalars():
+            key, doc = _row_document(obj)
+            if doc is not None:
+                _put(conn, key, doc)
+                count += 1
+
+    events = all_events(session)
+    rows = session.exec(
+        select(events.c.type, events.c.payload)
+        .where(events.c.type.in_(list(EVENT_KINDS)))
+        .order_by(events.c.ts, events.c.id)
+    )
+    latest: Dict[DocKey, Document] = {}
+    for row in rows:
+        found = _event_document(session, row.type, json.loads(row.payload))
+        if found:
+            latest[found[0]] = found[1]
+    for key, doc in latest.items():
+        _put(conn, key, doc)
+    return count + len(latest)
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def match_expression(q: str) -> Optional[str]:
+    """
+    An FTS5 query for free text: every word must match, the last one as a
+    prefix. Words are quoted, so FTS5 operators in q are searched literally.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return " ".join(f'"{w}"' for w in words[:-1]) + (" " if len(words) > 1 else "") + f'"{words[-1]}"*'
+
+
+def _marked(fragment: Optional[str]) -> Optional[str]:
+    """HTML-escape a highlight() / snippet() result, then turn its sentinels into MARK tags."""
+    if fragment is None:
+        return None
+    escaped = html.escape(fragment)
+    return escaped.replace(_SENTINELS[0], MARK[0]).replace(_SENTINELS[1], MARK[1])
+
+
+def search(
+    session: Session,
+    q: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    project_id: Optional[str] = None,
+    kinds: Optional[Iterable[str]] = None,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """Documents matching q, best first (bm25), with highlighted title and body snippet."""
+    expression = match_expression(q)
+    if expression is None:
+        raise ValueError("Query has no searchable words")
+    where = [f"{FTS_TABLE} MATCH :q"]
+    params: Dict[str, Any] = {
+        "q": expression, "limit": limit, "open": _SENTINELS[0], "close": _SENTINELS[1], "tokens": SNIPPET_TOKENS,
+    }
+    if from_date:
+        where.append("d.date >= :from_date")
+        params["from_date"] = from_date.isoformat()
+    if to_date:
+        where.append("d.date <= :to_date")
+        params["to_date"] = to_date.isoformat()
+    if project_id:
+        where.append("d.project_id = :project_id")
+        params["project_id"] = project_id
+    if kinds:
+        kinds = list(kinds)
+        where.append("d.kind IN (" + ", ".join(f":kind{i}" for i in range(len(kinds))) + ")")
+        params.update({f"kind{i}": k for i, k in enumerate(kinds)})
+    rows = session.connection().execute(text(f"""
+        SELECT d.kind, d.ref_id, d.date, d.project_id,
+               highlight({FTS_TABLE}, 0, :open, :close) AS title,
+               snippet({FTS_TABLE}, 1, :open, :close, '…', :tokens) AS snippet,
+               bm25({FTS_TABLE}, 2.0, 1.0) AS rank
+        FROM {FTS_TABLE} JOIN search_documents d ON d.id = {FTS_TABLE}.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY rank
+        LIMIT :limit
+    """), params).all()
+    return {
+        "q": q,
+        "items": [
+            {
+                "kind": r.kind,
+                "id": r.ref_id,
+                "date": r.date,
+                "projectId": r.project_id,
+                "title": _marked(r.title),
+                "snippet": _marked(r.snippet),
+                "score": round(-r.rank, 4),
+            }
+            for r in rows
+        ],
+    }
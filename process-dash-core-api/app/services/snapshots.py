@@ -0,0 +1,258 @@
+"""
+Rollup snapshots — periodically persisted period-metrics state.
+
+Lifetime rollups (the projects dashboard and project pages) used to fold every
+block event ever logged on each request. A snapshot stores that fold, for the
+whole log and for each project, together with the (ts, id) high-water mark of
+the last event it covers. A rollup then loads the latest snapshot and replays
+only the events after the mark (the "tail"), so its cost tracks recent
+activity instead of total history.
+
+Snapshots are refreshed in the background once a rollup has to replay more
+than WORKOBS_SNAPSHOT_EVERY_EVENTS tail events. Events younger than
+WORKOBS_SNAPSHOT_SETTLE_SECONDS are never folded into a snapshot, so a write
+that is still in flight cannot end up behind the high-water mark.
+
+A snapshot keeps its size independent of history: a block that has ended by
+the cutoff is settled into its scope's "settled" totals (blocks, interrupted,
+focus, active minutes) and only the blocks still open keep their dicts.
+Rollups served from a snapshot therefore carry no block lists. A settled
+block is final; an event logged for it after the cutoff (a restart, a late
+interruption or a second end) is not applied to the settled totals.
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, or_, tuple_
+from sqlmodel import Session, select
+
+from app.models import RollupSnapshot
+from app.services.archive import event_tables, naive_utc
+from app.services.time_buckets import bucket_minutes_to_label
+
+logger = logging.getLogger("uvicorn.error")
+
+TODO_PERIOD_EVENT_TYPES = ["todo_completed", "todo_settled"]
+PERIOD_EVENT_TYPES = [
+    "intent_block_started", "intent_block_interrupted", "intent_block_ended",
+    "recovery_block_ended",
+] + TODO_PERIOD_EVENT_TYPES
+
+# The unfiltered scope; every other scope key is a project id.
+ALL_SCOPE = ""
+
+_SNAPSHOT_YIELD_PER = 1000
+
+# Minimum uninterrupted duration for a block to count as focus.
+FOCUS_MINUTES = 30
+
+
+def new_period_state() -> Dict[str, Any]:
+    return {"scopes": {}, "todosCompleted": 0}
+
+
+def _scope_state(state: Dict[str, Any], scope: str) -> Dict[str, Any]:
+    return state["scopes"].setdefault(scope, {"blocks": {}, "recoveryMinutes": 0.0, "fragmenters": {}})
+
+
+def fold_period_event(state: Dict[str, Any], event: Any, p: Optional[dict] = None, by_project: bool = True) -> None:
+    """
+    Fold one event into the period state, for the unfiltered scope and (unless
+    by_project is False) for the event's own project, mirroring a
+    `project_id == X` filter.
+    """
+    p = p if p is not None else json.loads(event.payload)
+    if event.type in TODO_PERIOD_EVENT_TYPES:
+        # Completed todos are counted by time window only, never per project.
+        # A compacted (todo_settled) history counts once if it ended completed.
+        if event.type == "todo_completed" or p.get("completed"):
+            state["todosCompleted"] += 1
+        return
+    _fold_scope(_scope_state(state, ALL_SCOPE), event.type, p)
+    if by_project and event.project_id:
+        _fold_scope(_scope_state(state, event.project_id), event.type, p)
+
+
+def _fold_scope(scope: Dict[str, Any], event_type: str, p: dict) -> None:
+    if event_type == "recovery_block_ended":
+        scope["recoveryMinutes"] += (p.get("durationMinutes") or 0)
+        return
+
+    block_id = p.get("blockId")
+    if not block_id:
+        return
+    blocks = scope["blocks"]
+
+    if event_type == "intent_block_started":
+        blocks[block_id] = {
+            "blockId": block_id,
+            "storyId": p.get("storyId"),
+            "intent": p.get("intent"),
+            "notes": p.get("notes"),
+            "date": p.get("date"),
+            "interrupted": False,
+            "durationMinutes": 0,
+            "reasonCode": None,
+            "actualOutcome": None,
+            "durationLabel": ""
+        }
+    elif block_id in blocks:
+        block = blocks[block_id]
+        if event_type == "intent_block_interrupted":
+            block["interrupted"] = True
+            code = p.get("reasonCode")
+            block["reasonCode"] = code
+            if code:
+                scope["fragmenters"][code] = scope["fragmenters"].get(code, 0) + 1
+        elif event_type == "intent_block_ended":
+            block["actualOutcome"] = p.get("actualOutcome")
+            dur = p.get("durationMinutes") or 0
+            block["durationMinutes"] = dur
+            block["durationLabel"] = bucket_minutes_to_label(dur) or ""
+
+
+def settle_blocks(state: Dict[str, Any], ended: Set[str]) -> None:
+    """Fold the dicts of `ended` blocks into their scopes' settled totals."""
+    for scope in state["scopes"].values():
+        settled = scope.setdefault("settled", {"blocks": 0, "interrupted": 0, "focus": 0, "activeMinutes": 0})
+        for block_id in ended & scope["blocks"].keys():
+            block = scope["blocks"].pop(block_id)
+            settled["blocks"] += 1
+            settled["interrupted"] += int(block["interrupted"])
+            settled["focus"] += int(not block["interrupted"] and block["durationMinutes"] >= FOCUS_MINUTES)
+            settled["activeMinutes"] += block["durationMinutes"]
+
+
+def block_totals(scope: Dict[str, Any]) -> Tuple[int, int, int, int]:
+    """(blocks, interrupted, focus, active minutes) of a scope, settled blocks included."""
+    blocks = list(scope["blocks"].values())
+    settled = scope.get("settled") or {}
+    return (
+        len(blocks) + settled.get("blocks", 0),
+        sum(1 for b in blocks if b["interrupted"]) + settled.get("interrupted", 0),
+        sum(1 for b in blocks if not b["interrupted"] and b["durationMinutes"] >= FOCUS_MINUTES)
+        + settled.get("focus", 0),
+        sum(b["durationMinutes"] for b in blocks) + settled.get("activeMinutes", 0),
+    )
+
+
+def latest_snapshot(session: Session) -> Optional[RollupSnapshot]:
+    return session.exec(select(RollupSnapshot).order_by(RollupSnapshot.id.desc()).limit(1)).first()
+
+
+def iter_period_events(
+    session: Session,
+    snapshot: Optional[RollupSnapshot] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    project_id: Optional[str] = None,
+    windows: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Iterator[Any]:
+    """
+    Period events in (ts, id) order across archived and live partitions:
+    those after the snapshot's high-water mark, logged in [start, end) or in
+    any of the [start, end) `windows`, and — with project_id — tagged with
+    that project (todo events are never project-filtered).
+    """
+    for table in event_tables(session):
+        c = table.c
+        query = (
+            select(*c)
+            .where(c.type.in_(PERIOD_EVENT_TYPES))
+            .order_by(c.ts, c.id)
+        )
+        if snapshot is not None:
+            query = query.where(tuple_(c.ts, c.id) > tuple_(snapshot.hwm_ts, snapshot.hwm_id))
+        if start is not None:
+            query = query.where(c.ts >= start)
+        if end is not None:
+            query = query.where(c.ts < end)
+        if windows:
+            query = query.where(or_(*[and_(c.ts >= lo, c.ts < hi) for lo, hi in windows]))
+        if project_id:
+            query = query.where(or_(c.project_id == project_id, c.type.in_(TODO_PERIOD_EVENT_TYPES)))
+        yield from session.exec(query.execution_options(yield_per=_SNAPSHOT_YIELD_PER))
+
+
+def create_snapshot(session: Session, settle_seconds: Optional[int] = None) -> Optional[RollupSnapshot]:
+    """
+    Fold the latest snapshot plus every settled event after it into a new
+    snapshot and drop the older ones. Returns None when there was nothing new.
+    """
+    from app.settings import settings
+
+    if settle_seconds is None:
+        settle_seconds = settings.WORKOBS_SNAPSHOT_SETTLE_SECONDS
+    cutoff = naive_utc(datetime.now(timezone.utc) - timedelta(seconds=settle_seconds))
+
+    previous = latest_snapshot(session)
+    if previous is not None:
+        state = json.loads(previous.state)
+        first_ts, event_count = previous.first_ts, previous.event_count
+    else:
+        state, first_ts, event_count = new_period_state(), None, 0
+
+    last = None
+    ended: Set[str] = set()   # blocks whose latest event is their end
+    for event in iter_period_events(session, snapshot=previous, end=cutoff):
+        p = json.loads(event.payload)
+        fold_period_event(state, event, p)
+        if event.type == "intent_block_ended":
+            ended.add(p.get("blockId"))
+        elif event.type == "intent_block_started":
+            ended.discard(p.get("blockId"))
+        if first_ts is None:
+            first_ts = event.ts
+        last = (event.ts, event.id)
+        event_count += 1
+
+    if last is None:
+        return None
+    settle_blocks(state, ended)
+
+    snapshot = RollupSnapshot(
+        first_ts=first_ts,
+        hwm_ts=last[0],
+        hwm_id=last[1],
+        event_count=event_count,
+        state=json.dumps(state),
+    )
+    session.add(snapshot)
+    session.flush()
+    session.exec(delete(RollupSnapshot).where(RollupSnapshot.id != snapshot.id))
+    session.commit()
+    session.refresh(snapshot)
+    return snapshot
+
+
+_running: set = set()
+_running_lock = threading.Lock()
+
+
+def schedule_snapshot(engine) -> bool:
+    """
+    Refresh the snapshot on a background thread, unless one is already
+    running for this engine. Returns True when a refresh was started.
+    """
+    with _running_lock:
+        if engine in _running:
+            return False
+        _running.add(engine)
+
+    def _run():
+        try:
+            with Session(engine) as session:
+                snapshot = create_snapshot(session)
+            if snapshot is not None:
+                logger.info("Rollup snapshot refreshed: %d events covered", snapshot.event_count)
+        except Exception:
+            logger.exception("Rollup snapshot refresh failed")
+        finally:
+            with _running_lock:
+                _running.discard(engine)
+
+    threading.Thread(target=_run, name="rollup-snapshot", daemon=True).start()
+    return True
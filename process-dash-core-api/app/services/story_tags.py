@@ -0,0 +1,92 @@
+"""
+Story tags — the story_tags table behind tag filters and facets.
+
+UserStory.tags keeps each story's tags as written (a JSON array); story_tags
+holds the same tags lower-cased, one row per (story, tag), so a tag filter is
+an indexed lookup instead of decoding every story's JSON. The story create,
+update and carry-forward paths call sync_story_tags() in the transaction that
+writes the story; rebuild_story_tags() recomputes the table from user_stories.
+"""
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import delete, func, insert
+from sqlmodel import Session, select
+
+from app.models import StoryTag, UserStory
+
+TAG_MODES = ("any", "all")
+
+
+def normalise_tags(raw: Optional[str]) -> Set[str]:
+    """Lower-cased, stripped tags of a UserStory.tags value."""
+    if not raw:
+        return set()
+    try:
+        tags = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return set()
+    if not isinstance(tags, list):
+        return set()
+    return {str(t).strip().lower() for t in tags if str(t).strip()}
+
+
+def sync_story_tags(session: Session, story: UserStory) -> None:
+    """Replace a story's story_tags rows with its current tags. Does not commit."""
+    sync_stories_tags(session, [story])
+
+
+def sync_stories_tags(session: Session, stories: List[UserStory]) -> None:
+    """sync_story_tags() for many stories: one DELETE and one INSERT. Does not commit."""
+    if not stories:
+        return
+    session.exec(delete(StoryTag).where(StoryTag.story_id.in_([s.id for s in stories])))
+    rows = [{"story_id": s.id, "tag_lower": t} for s in stories for t in sorted(normalise_tags(s.tags))]
+    if rows:
+        session.execute(insert(StoryTag), rows)
+
+
+def rebuild_story_tags(session: Session) -> int:
+    """Recompute story_tags from user_stories. Does not commit; returns the row count."""
+    session.exec(delete(StoryTag))
+    rows: List[Dict[str, str]] = []
+    stories = session.exec(select(UserStory.id, UserStory.tags).where(UserStory.tags != None))  # noqa: E711
+    for story_id, raw in stories:
+        rows.extend({"story_id": story_id, "tag_lower": t} for t in sorted(normalise_tags(raw)))
+    if rows:
+        session.execute(insert(StoryTag), rows)
+    return len(rows)
+
+
+def normalise_tag_filter(tags: Optional[List[str]]) -> List[str]:
+    """Lower-cased, stripped, distinct tags of a `tag` filter; blank ones are dropped."""
+    return sorted({t.strip().lower() for t in tags or [] if t.strip()})
+
+
+def tagged_story_ids(tags: List[str], mode: str = "any"):
+    """
+    Subquery of the ids of stories carrying any (mode="any") or every
+    (mode="all") of `tags`, compared case-insensitively. An empty `tags`
+    matches nothing: callers skip the filter instead (see normalise_tag_filter).
+    """
+    wanted = normalise_tag_filter(tags)
+    query = select(StoryTag.story_id).where(StoryTag.tag_lower.in_(wanted))
+    if mode == "all":
+        query = query.group_by(StoryTag.story_id).having(func.count() == len(wanted))
+    return query
+
+
+def tag_facets(session: Session, stories_query: Any) -> List[Dict[str, Any]]:
+    """
+    Story count per tag over the stories `stories_query` (a select of
+    UserStory) matches, most used first.
+    """
+    story_ids = stories_query.with_only_columns(UserStory.id).order_by(None).subquery()
+    count = func.count().label("count")
+    rows = session.exec(
+        select(StoryTag.tag_lower, count)
+        .join(story_ids, story_ids.c.id == StoryTag.story_id)
+        .group_by(StoryTag.tag_lower)
+        .order_by(count.desc(), StoryTag.tag_lower)
+    ).all()
+    return [{"tag": tag, "count": n} for tag, n in rows]
@@ -0,0 +1,196 @@
+"""
+Group-commit write-behind queue for event_log.
+
+When enabled (WORKOBS_WRITE_BEHIND=true), log_event hands events to a single
+writer thread per engine instead of committing them itself. The writer drains
+the queue and commits events in small batches through log_events(), so many
+concurrent requests share one SQLite write transaction (and one fsync) rather
+than queueing on the write lock one commit at a time.
+
+Callers block on a Future until their batch is committed, so the durability
+contract of log_event is unchanged: when it returns, the event is on disk.
+Sessions that have already written in their open transaction (flushed rows,
+bulk statements) keep committing inline; see has_uncommitted_writes().
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession, SessionTransaction
+from sqlmodel import Session
+
+from app.models import EventLog
+
+logger = logging.getLogger("uvicorn.error")
+
+_STOP = object()
+
+_WRITES_KEY = "write_behind_has_writes"
+
+
+# ── Uncommitted-write tracking ───────────────────────────────────────────────
+
+@sa_event.listens_for(OrmSession, "after_flush")
+def _note_flush(session: OrmSession, flush_context) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@sa_event.listens_for(OrmSession, "do_orm_execute")
+def _note_statement(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WRITES_KEY] = True
+
+
+@sa_event.listens_for(OrmSession, "after_transaction_end")
+def _clear_writes(session: OrmSession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WRITES_KEY, None)
+
+
+def has_uncommitted_writes(session: OrmSession) -> bool:
+    """
+    True when the session holds changes its next commit would write: pending
+    objects, or rows already flushed / statements already executed in the
+    open transaction. Such a session must commit its event inline, so the
+    event and those writes land (or fail) together.
+    """
+    return bool(session.new or session.dirty or session.deleted or session.info.get(_WRITES_KEY))
+
+
+class EventWriter:
+    def __init__(self, engine: Engine, flush_interval_ms: float = 2.0, max_batch_size: int = 256):
+        self.engine = engine
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "events": 0,
+            "failedEvents": 0,
+            "lastBatchSize": 0,
+            "maxBatchSize": 0,
+            "lastFlushMs": 0.0,
+            "maxFlushMs": 0.0,
+            "totalFlushMs": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, event: EventLog) -> Future:
+        future: Future = Future()
+        self._queue.put((event, future))
+        return future
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush everything already queued, then stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        stats["avgBatchSize"] = round(stats["events"] / batches, 2) if batches else 0.0
+        stats["avgFlushMs"] = round(stats.pop("totalFlushMs") / batches, 3) if batches else 0.0
+        stats["queueDepth"] = self._queue.qsize()
+        stats["flushIntervalMs"] = self.flush_interval * 1000.0
+        stats["maxBatchSizeLimit"] = self.max_batch_size
+        return stats
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[EventLog, Future]]) -> None:
+        from app.services.events import log_events  # local import to avoid a cycle
+
+        started = time.perf_counter()
+        try:
+            with Session(self.engine) as session:
+                log_events(session, [event for event, _ in batch])
+        except Exception:
+            # One bad event (e.g. a duplicate local id) must not fail its
+            # neighbours: retry one by one so only the offender sees the error.
+            logger.exception("Event writer batch of %d failed; retrying individually", len(batch))
+            self._flush_individually(batch)
+        else:
+            for event, future in batch:
+                future.set_result(event)
+        self._record(len(batch), (time.perf_counter() - started) * 1000.0)
+
+    def _flush_individually(self, batch: List[Tuple[EventLog, Future]]) -> None:
+        from app.services.events import log_events
+
+        for event, future in batch:
+            try:
+                with Session(self.engine) as session:
+                    log_events(session, [event])
+            except Exception as exc:
+                with self._lock:
+                    self._stats["failedEvents"] += 1
+                future.set_exception(exc)
+            else:
+                future.set_result(event)
+
+    def _record(self, batch_size: int, flush_ms: float) -> None:
+        with self._lock:
+            s = self._stats
+            s["batches"] += 1
+            s["events"] += batch_size
+            s["lastBatchSize"] = batch_size
+            s["maxBatchSize"] = max(s["maxBatchSize"], batch_size)
+            s["lastFlushMs"] = round(flush_ms, 3)
+            s["maxFlushMs"] = round(max(s["maxFlushMs"], flush_ms), 3)
+            s["totalFlushMs"] += flush_ms
+
+
+_writers: Dict[Engine, EventWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def start_writer(engine: Engine, flush_interval_ms: float = 2.0, max_batch_size: int = 256) -> EventWriter:
+    with _writers_lock:
+        writer = _writers.get(engine)
+        if writer is None:
+            writer = EventWriter(engine, flush_interval_ms, max_batch_size)
+            _writers[engine] = writer
+            logger.info(
+                "Event writer: write-behind enabled (flush=%sms, max batch=%d)",
+                flush_interval_ms, max_batch_size,
+            )
+        return writer
+
+
+def stop_writer(engine: Engine) -> None:
+    with _writers_lock:
+        writer = _writers.pop(engine, None)
+    if writer is not None:
+        writer.stop()
+
+
+def get_writer(engine) -> Optional[EventWriter]:
+    return _writers.get(engine)
@@ -10,6 +10,31 @@ class Settings(BaseSettings):
     WORKOBS_DB_PATH: str | None = None
     WORKOBS_BACKUP_DIR: str | None = None
     WORKOBS_DB_STRICT_PATH: bool = False
+    WORKOBS_WRITE_BEHIND: bool = False
+    WORKOBS_WRITE_BEHIND_FLUSH_MS: float = 2.0
+    WORKOBS_WRITE_BEHIND_MAX_BATCH: int = 256
+
+    # Rollup snapshots: refresh in the background once a rollup has to replay
+    # more than this many events past the latest snapshot (0 disables).
+    WORKOBS_SNAPSHOT_EVERY_EVENTS: int = 5000
+    # Events newer than this are left to the tail, so a write still in flight
+    # can never land behind a snapshot's high-water mark.
+    WORKOBS_SNAPSHOT_SETTLE_SECONDS: int = 60
+    # Day / sprint / project rollups kept in memory per engine (0 disables).
+    WORKOBS_ROLLUP_CACHE_SIZE: int = 1024
+    # Period metrics engine: "python" folds events one by one, "pandas" uses the
+    # columnar engine (requires pandas), "auto" uses pandas when it is installed.
+    WORKOBS_METRICS_ENGINE: str = "python"
+
+    # SQLite storage profile. "performance" applies the pragmas below on every
+    # new connection; "default" leaves SQLite's built-in settings untouched.
+    WORKOBS_SQLITE_PROFILE: str = "performance"
+    WORKOBS_SQLITE_JOURNAL_MODE: str = "WAL"
+    WORKOBS_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    WORKOBS_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    WORKOBS_SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    WORKOBS_SQLITE_CACHE_SIZE: int = -64 * 1024   # negative = KiB, i.e. 64 MiB
+    WORKOBS_SQLITE_TEMP_STORE: str = "MEMORY"
 
     def _default_db_path(self) -> Path:
         # OS-specific defaults
@@ -64,4 +89,21 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"sqlite:///{self.db_path}"
 
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        if self.WORKOBS_SQLITE_PROFILE.lower() == "default":
+            return {}
+        if self.WORKOBS_SQLITE_PROFILE.lower() != "performance":
+            raise RuntimeError(
+                f"WORKOBS_SQLITE_PROFILE must be 'performance' or 'default', got {self.WORKOBS_SQLITE_PROFILE!r}"
+            )
+        return {
+            "journal_mode": self.WORKOBS_SQLITE_JOURNAL_MODE,
+            "synchronous": self.WORKOBS_SQLITE_SYNCHRONOUS,
+            "busy_timeout": self.WORKOBS_SQLITE_BUSY_TIMEOUT_MS,
+            "mmap_size": self.WORKOBS_SQLITE_MMAP_SIZE,
+            "cache_size": self.WORKOBS_SQLITE_CACHE_SIZE,
+            "temp_store": self.WORKOBS_SQLITE_TEMP_STORE,
+        }
+
 settings = Settings()
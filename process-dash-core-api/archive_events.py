@@ -0,0 +1,76 @@
+"""
+Move settled event_log history into monthly archive tables.
+
+Events logged before the horizon are moved to event_log_archive_YYYYMM tables
+(registered in event_log_partitions); every read path walks the archives
+transparently. With --compact, the archived history of each settled todo is
+then folded into a single todo_settled event.
+
+    python archive_events.py --horizon financial-year [--compact]
+    python archive_events.py --horizon closed-sprints [--compact]
+    python archive_events.py --before 2025-04-01 [--compact]
+    python archive_events.py --restore
+"""
+import argparse
+import sys
+from datetime import date, datetime, time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel
+
+# ── Bootstrap: ensure /code is on the path regardless of cwd ──────────────────
+CODE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(CODE_DIR))
+
+from app.db import engine  # noqa: E402
+from app.services.archive import (  # noqa: E402
+    archive_events,
+    compact_settled_todos,
+    horizon_after_closed_sprints,
+    horizon_before_current_financial_year,
+    restore_archives,
+)
+from app.settings import settings  # noqa: E402
+
+HORIZONS = {
+    "financial-year": horizon_before_current_financial_year,
+    "closed-sprints": horizon_after_closed_sprints,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--before", type=date.fromisoformat, help="archive events logged before this date (UTC)")
+    group.add_argument("--horizon", choices=sorted(HORIZONS), help="derive the cut-off date from the data")
+    group.add_argument("--restore", action="store_true", help="move every archived event back into event_log")
+    parser.add_argument("--compact", action="store_true", help="fold settled todo histories after archiving")
+    args = parser.parse_args()
+
+    print(f"[archive] Database: {settings.db_path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if args.restore:
+            restored = restore_archives(session)
+            print(f"[archive] Restored {restored} events into event_log.")
+            return 0
+
+        if args.before:
+            before = datetime.combine(args.before, time.min)
+        else:
+            before = HORIZONS[args.horizon](session)
+            if before is None:
+                print(f"[archive] No {args.horizon} horizon found; nothing to do.")
+                return 0
+        print(f"[archive] Horizon: {before.isoformat()}")
+
+        for month in archive_events(session, before):
+            print(f"[archive] {month['month']}: moved {month['moved']} events to {month['table']}")
+        if args.compact:
+            removed = compact_settled_todos(session)
+            print(f"[archive] Compaction removed {removed} superseded todo events.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Benchmark: financial-year rollup latency on a year-sized dataset.
+
+Seeds a fresh SQLite file with a year of blocks (logged through log_events, so
+the day projections and daily_metrics are maintained as in production) plus a
+fortnightly sprint cadence with stories, then times
+get_financial_year_rollup:
+
+    python benchmarks/fy_rollup.py [--blocks-per-day 16] [--runs 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import FinancialYear, SprintDefinition, UserStory  # noqa: E402
+from app.services.events import log_events, new_event  # noqa: E402
+from app.services.rollups import get_financial_year_rollup  # noqa: E402
+
+REASONS = ["MEETING", "DEPENDENCY", "CONTEXT_SWITCH", "TECH_ISSUE", "UNPLANNED_REQUEST"]
+FY_START, FY_END = date(2025, 7, 1), date(2026, 6, 30)
+
+
+def _seed(engine, blocks_per_day: int) -> int:
+    rng = random.Random(7)
+    logged = 0
+    with Session(engine) as session:
+        day = FY_START
+        while day <= FY_END:
+            events = []
+            for _ in range(blocks_per_day):
+                block_id = str(uuid.uuid4())
+                events.append(new_event("intent_block_started", {"blockId": block_id, "date": day.isoformat(), "intent": "seed"}))
+                if rng.random() < 0.3:
+                    events.append(new_event("intent_block_interrupted", {"blockId": block_id, "reasonCode": rng.choice(REASONS)}))
+                events.append(new_event("intent_block_ended", {"blockId": block_id, "durationMinutes": rng.choice([15, 30, 45, 60, 90])}))
+            log_events(session, events)
+            logged += len(events)
+            day += timedelta(days=1)
+
+        start = FY_START
+        while start <= FY_END:
+            sprint = SprintDefinition(name=f"S {start}", start_date=start, end_date=start + timedelta(days=13), duration_days=14)
+            session.add(sprint)
+            session.flush()
+            for i in range(10):
+                session.add(UserStory(
+                    sprint_id=sprint.id,
+                    title=f"Story {i}",
+                    story_points=rng.choice([1, 2, 3, 5, 8]),
+                    status=rng.choice(["TODO", "IN_PROGRESS", "DONE", "DONE", "CARRIED_OVER"]),
+                ))
+            start += timedelta(days=14)
+        session.add(FinancialYear(label="FY 2025-26", start_date=FY_START, end_date=FY_END))
+        session.commit()
+    return logged
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks-per-day", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.sqlite'}")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        logged = _seed(engine, args.blocks_per_day)
+        print(f"seeded {logged} events in {time.perf_counter() - started:.1f}s")
+
+        timings = []
+        with Session(engine) as session:
+            fy = session.exec(select(FinancialYear)).one()
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                rollup = get_financial_year_rollup(session, fy)
+                timings.append((time.perf_counter() - started) * 1000.0)
+        engine.dispose()
+
+    print(f"blocks in year: {rollup['metrics']['totalBlocks']}, weeks: {len(rollup['weeks'])}")
+    print(f"rollup ms: p50={statistics.median(timings):.1f} max={max(timings):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
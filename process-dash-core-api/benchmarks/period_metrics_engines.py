@@ -0,0 +1,109 @@
+"""
+Benchmark: lifetime period metrics, event-by-event fold vs the pandas engine.
+
+Seeds a fresh SQLite file with blocks spread over a few projects, then times a
+lifetime project rollup (_compute_period_metrics) and the projects dashboard
+with WORKOBS_METRICS_ENGINE=python and =pandas, checking both return the same
+result. Rollup snapshots are disabled so the python engine folds the whole log:
+
+    python benchmarks/period_metrics_engines.py [--blocks 50000] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import Project  # noqa: E402
+from app.services import columnar_metrics  # noqa: E402
+from app.services.events import log_events, new_event  # noqa: E402
+from app.services.rollups import _compute_period_metrics, get_projects_dashboard  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+LIFETIME = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+REASONS = ["MEETING", "DEPENDENCY", "CONTEXT_SWITCH", "TECH_ISSUE", "UNPLANNED_REQUEST"]
+BATCH_BLOCKS = 2000
+
+
+def _seed(engine, blocks: int, projects: int) -> list:
+    rng = random.Random(7)
+    with Session(engine) as session:
+        project_ids = []
+        for i in range(projects):
+            project = Project(name=f"Project {i}")
+            session.add(project)
+            session.flush()
+            project_ids.append(project.id)
+        session.commit()
+
+        for offset in range(0, blocks, BATCH_BLOCKS):
+            events = []
+            for n in range(offset, min(offset + BATCH_BLOCKS, blocks)):
+                block_id = str(uuid.uuid4())
+                project_id = rng.choice(project_ids)
+                day = f"2026-{1 + n % 12:02d}-{1 + n % 28:02d}"
+                events.append(new_event("intent_block_started", {"blockId": block_id, "date": day, "intent": "seed"}, project_id=project_id))
+                if rng.random() < 0.3:
+                    events.append(new_event("intent_block_interrupted", {"blockId": block_id, "reasonCode": rng.choice(REASONS)}, project_id=project_id))
+                events.append(new_event("intent_block_ended", {"blockId": block_id, "durationMinutes": rng.choice([15, 30, 45, 60, 90])}, project_id=project_id))
+                if n % 10 == 0:
+                    events.append(new_event("recovery_block_ended", {"blockId": str(uuid.uuid4()), "durationMinutes": 10}))
+            log_events(session, events)
+    return project_ids
+
+
+def _time(fn, runs: int):
+    timings, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return result, timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=50000)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not columnar_metrics.AVAILABLE:
+        print("pandas is not installed: pip install pandas")
+        return 1
+    settings.WORKOBS_SNAPSHOT_EVERY_EVENTS = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.sqlite'}")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        project_ids = _seed(engine, args.blocks, args.projects)
+        print(f"seeded {args.blocks} blocks in {time.perf_counter() - started:.1f}s")
+
+        workloads = {
+            "project rollup": lambda session: _compute_period_metrics(session, *LIFETIME, project_id=project_ids[0]),
+            "projects dashboard": lambda session: get_projects_dashboard(session),
+        }
+        print(f"{'workload':<20} {'engine':<8} {'p50 ms':>9} {'max ms':>9}")
+        with Session(engine) as session:
+            for name, workload in workloads.items():
+                results = {}
+                for engine_name in ("python", "pandas"):
+                    settings.WORKOBS_METRICS_ENGINE = engine_name
+                    results[engine_name], timings = _time(lambda: workload(session), args.runs)
+                    print(f"{name:<20} {engine_name:<8} {statistics.median(timings):>9.1f} {max(timings):>9.1f}")
+                assert results["python"] == results["pandas"], f"{name}: engines disagree"
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Benchmark: full-text search latency over years of blocks.
+
+Seeds a fresh SQLite file with several years of blocks whose intents, notes
+and outcomes are drawn from a small work vocabulary (logged through
+log_events, so the search index is maintained as in production), then times
+search() for a common word, a rare word, a two-word prefix query and a
+date-filtered query:
+
+    python benchmarks/search.py [--years 3] [--blocks-per-day 16] [--runs 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.events import log_events, new_event  # noqa: E402
+from app.services.search import search  # noqa: E402
+
+VERBS = ["debugging", "reviewing", "writing", "refactoring", "testing", "planning", "deploying", "profiling"]
+NOUNS = ["cache", "api", "migration", "dashboard", "sprint report", "importer", "auth flow", "billing job"]
+NOTES = ["stale entries", "flaky test", "slow query", "missing index", "pairing with ops", "waiting on review"]
+RARE = "kubernetes"
+START = date(2023, 1, 2)
+
+
+def _seed(engine, years: int, blocks_per_day: int) -> int:
+    rng = random.Random(11)
+    logged = 0
+    with Session(engine) as session:
+        day, end = START, START + timedelta(days=365 * years)
+        while day < end:
+            events = []
+            for _ in range(blocks_per_day):
+                block_id = str(uuid.uuid4())
+                intent = f"{rng.choice(VERBS)} the {rng.choice(NOUNS)}"
+                if rng.random() < 0.001:
+                    intent += f" on {RARE}"
+                events.append(new_event("intent_block_started", {
+                    "blockId": block_id, "date": day.isoformat(), "intent": intent, "notes": rng.choice(NOTES),
+                }))
+                events.append(new_event("intent_block_ended", {
+                    "blockId": block_id, "durationMinutes": rng.choice([15, 30, 45, 60, 90]),
+                    "actualOutcome": f"{rng.choice(NOTES)} in the {rng.choice(NOUNS)}",
+                }))
+            events.append(new_event("daily_intents_set", {
+                "date": day.isoformat(), "intents": [f"{rng.choice(VERBS)} the {rng.choice(NOUNS)}"],
+            }))
+            log_events(session, events)
+            logged += len(events)
+            day += timedelta(days=1)
+    return logged
+
+
+def _time(session: Session, runs: int, **kwargs) -> str:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = search(session, **kwargs)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return f"{len(result['items']):3d} hits  p50={statistics.median(timings):.1f}ms max={max(timings):.1f}ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--blocks-per-day", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.sqlite'}")
+        SQLModel.metadata.create_all(engine)
+        started = time.perf_counter()
+        logged = _seed(engine, args.years, args.blocks_per_day)
+        print(f"seeded {logged} events in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as session:
+            recent = START + timedelta(days=365 * args.years - 30)
+            print(f"common  'cache':        {_time(session, args.runs, q='cache')}")
+            print(f"rare    '{RARE}':   {_time(session, args.runs, q=RARE)}")
+            print(f"prefix  'slow que':     {_time(session, args.runs, q='slow que')}")
+            print(f"dated   'debug' 30d:    {_time(session, args.runs, q='debug', from_date=recent)}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark: day-view read latency while another thread keeps writing events.
+
+Runs the same workload against a fresh SQLite file for each storage profile
+(WORKOBS_SQLITE_PROFILE) and prints read latency percentiles, write
+throughput and lock errors:
+
+    python benchmarks/sqlite_read_under_write.py [--seconds 5] [--readers 4]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db import apply_sqlite_pragmas  # noqa: E402
+from app.services.events import log_event, log_events, new_event  # noqa: E402
+from app.services.rollups import get_day_rollup  # noqa: E402
+from app.settings import Settings  # noqa: E402
+
+DATES = [f"2026-05-{d:02d}" for d in range(1, 29)]
+
+
+def _seed(engine, blocks_per_day: int) -> None:
+    events = []
+    for date in DATES:
+        for _ in range(blocks_per_day):
+            block_id = str(uuid.uuid4())
+            events.append(new_event("intent_block_started", {"blockId": block_id, "date": date, "intent": "seed"}))
+            events.append(new_event("intent_block_ended", {"blockId": block_id, "durationMinutes": 30}))
+    with Session(engine) as session:
+        log_events(session, events)
+
+
+def run_profile(profile: str, seconds: float, readers: int, blocks_per_day: int) -> dict:
+    tmp = tempfile.mkdtemp(prefix=f"workobs-bench-{profile}-")
+    engine = create_engine(f"sqlite:///{Path(tmp) / 'workobs.sqlite'}", connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, Settings(WORKOBS_SQLITE_PROFILE=profile).sqlite_pragmas)
+    SQLModel.metadata.create_all(engine)
+    _seed(engine, blocks_per_day)
+
+    stop = threading.Event()
+    latencies = []
+    counters = {"writes": 0, "lockErrors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        with Session(engine) as session:
+            while not stop.is_set():
+                try:
+                    log_event(session, "intent_block_started",
+                              {"blockId": str(uuid.uuid4()), "date": random.choice(DATES), "intent": "bench"})
+                    counters["writes"] += 1
+                except OperationalError:
+                    session.rollback()
+                    with lock:
+                        counters["lockErrors"] += 1
+
+    def reader():
+        with Session(engine) as session:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    get_day_rollup(session, random.choice(DATES))
+                    session.rollback()  # end the read transaction, as a request would
+                except OperationalError:
+                    session.rollback()
+                    with lock:
+                        counters["lockErrors"] += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0  # noqa: E731
+    return {
+        "profile": profile,
+        "reads": len(latencies),
+        "p50Ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p95Ms": round(pct(0.95), 2),
+        "p99Ms": round(pct(0.99), 2),
+        "writesPerSec": round(counters["writes"] / seconds, 1),
+        "lockErrors": counters["lockErrors"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--blocks-per-day", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'writes/s':>9} {'lock err':>9}")
+    for profile in ("default", "performance"):
+        r = run_profile(profile, args.seconds, args.readers, args.blocks_per_day)
+        print(f"{r['profile']:<12} {r['reads']:>7} {r['p50Ms']:>8} {r['p95Ms']:>8} {r['p99Ms']:>8} "
+              f"{r['writesPerSec']:>9} {r['lockErrors']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,10 @@ Handles three cases:
   2. Pre-Alembic database (no version) — create_all() + stamp head (tables already exist)
   3. Managed database (version exists) — alembic upgrade head (applies any pending migrations)
 
+Migrations only change the schema. Whenever the revision moves (2, or 3 with
+pending migrations) the read models derived from event_log and user_stories
+are rebuilt with the current code, as rebuild_projections.py does.
+
 Called by start.sh before uvicorn starts.
 """
 import os
@@ -13,21 +17,32 @@ import subprocess
 import sys
 from pathlib import Path
 
-from sqlalchemy import inspect
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, create_engine
 
 # ── Bootstrap: ensure /code is on the path regardless of cwd ──────────────────
 CODE_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(CODE_DIR))
 
 from app.models import (  # noqa: E402, F401 — import ALL models to register metadata
+    DailyMetric,
+    DayBlock,
+    DayRecovery,
+    DayTodo,
     EventLog,
+    EventLogPartition,
     FinancialYear,
     Project,
     ProjectConfiguration,
     ProjectContact,
+    RollupSnapshot,
+    ScopeVersion,
+    SearchDocument,
     SprintDefinition,
+    SprintRollupSnapshot,
+    SprintStoryState,
     SprintTask,
+    StoryTag,
     TeamAllocation,
     TeamMember,
     UserStory,
@@ -57,6 +72,26 @@ def run(cmd: list[str]) -> int:
     return result.returncode
 
 
+def current_revision(engine) -> str | None:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def rebuild_read_models(engine) -> None:
+    """Day projections, daily_metrics, sprint story states, story tags and the search index."""
+    from app.services.projections import rebuild_projections
+    from app.services.search import rebuild_search_index
+    from app.services.story_tags import rebuild_story_tags
+    with Session(engine) as session:
+        replayed = rebuild_projections(session)
+        tagged = rebuild_story_tags(session)
+        indexed = rebuild_search_index(session)
+        session.commit()
+    print(f"[migrate] Day projections rebuilt from {replayed} events.")
+    print(f"[migrate] Story tags rebuilt ({tagged} rows).")
+    print(f"[migrate] Search index rebuilt ({indexed} documents).")
+
+
 def main() -> int:
     print(f"[migrate] Database: {settings.db_path}")
 
@@ -85,15 +120,21 @@ def main() -> int:
             print("[migrate] ERROR: alembic stamp failed.", file=sys.stderr)
             return code
         print("[migrate] Stamp OK.")
+
+        # Fill the read models from the log once (a no-op on a fresh install).
+        rebuild_read_models(engine)
     else:
         # Existing managed DB — apply any pending migrations.
         # Safe every startup: Alembic skips already-applied revisions.
         print("[migrate] Running alembic upgrade head...")
+        before = current_revision(engine)
         code = run(["python", "-m", "alembic", "upgrade", "head"])
         if code != 0:
             print("[migrate] ERROR: alembic upgrade head failed.", file=sys.stderr)
             return code
         print("[migrate] Migrations OK.")
+        if current_revision(engine) != before:
+            rebuild_read_models(engine)
 
     return 0
 
@@ -0,0 +1,54 @@
+"""add denormalized payload columns and composite indexes to event_log
+
+Revision ID: 0b7e5d3c9a21
+Revises: f1a9c2d4e6b8
+Create Date: 2026-07-08
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0b7e5d3c9a21"
+down_revision = "f1a9c2d4e6b8"
+branch_labels = None
+depends_on = None
+
+# column -> payload key (mirrors app.services.events.PAYLOAD_COLUMNS)
+PAYLOAD_COLUMNS = {
+    "payload_date": "date",
+    "block_id": "blockId",
+    "todo_id": "todoId",
+    "sprint_id": "sprintId",
+    "story_id": "storyId",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = inspect(bind)
+    existing_columns = {c["name"] for c in insp.get_columns("event_log")}
+    existing_indexes = {i["name"] for i in insp.get_indexes("event_log")}
+
+    for column in PAYLOAD_COLUMNS:
+        if column not in existing_columns:
+            op.add_column("event_log", sa.Column(column, sa.String(), nullable=True))
+
+    # Backfill from the JSON payload.
+    assignments = ", ".join(
+        f"{column} = json_extract(payload, '$.{key}')" for column, key in PAYLOAD_COLUMNS.items()
+    )
+    op.execute(f"UPDATE event_log SET {assignments} WHERE json_valid(payload)")
+
+    for column in PAYLOAD_COLUMNS:
+        index_name = f"ix_event_log_type_{column}"
+        if index_name not in existing_indexes:
+            op.create_index(index_name, "event_log", ["type", column])
+
+
+def downgrade() -> None:
+    for column in PAYLOAD_COLUMNS:
+        op.drop_index(f"ix_event_log_type_{column}", table_name="event_log")
+    with op.batch_alter_table("event_log") as batch_op:
+        for column in PAYLOAD_COLUMNS:
+            batch_op.drop_column(column)
@@ -0,0 +1,38 @@
+"""add daily_metrics (day x project x reason code aggregate)
+
+Revision ID: 2e6a9c4b8f17
+Revises: 5b8c3e1f7d24
+Create Date: 2026-07-23
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "2e6a9c4b8f17"
+down_revision = "5b8c3e1f7d24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "daily_metrics" not in inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "daily_metrics",
+            sa.Column("date", sa.String(), primary_key=True),
+            sa.Column("project_id", sa.String(), primary_key=True, server_default=""),
+            sa.Column("reason_code", sa.String(), primary_key=True, server_default=""),
+            sa.Column("blocks", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("interrupted_blocks", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("focus_blocks", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("active_minutes", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("recovery_minutes", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("todos_completed", sa.Integer(), nullable=False, server_default="0"),
+        )
+    # The cube is filled from the day projections by rebuild_projections.py,
+    # which migrate.py runs after upgrading.
+
+
+def downgrade() -> None:
+    op.drop_table("daily_metrics")
@@ -0,0 +1,24 @@
+"""add (ts, id) index to event_log for keyset pagination
+
+Revision ID: 3c8d1e7f5a42
+Revises: 0b7e5d3c9a21
+Create Date: 2026-07-10
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "3c8d1e7f5a42"
+down_revision = "0b7e5d3c9a21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing_indexes = {i["name"] for i in inspect(op.get_bind()).get_indexes("event_log")}
+    if "ix_event_log_ts_id" not in existing_indexes:
+        op.create_index("ix_event_log_ts_id", "event_log", ["ts", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_log_ts_id", table_name="event_log")
@@ -0,0 +1,34 @@
+"""add sprint_rollup_snapshots (rollups frozen when a sprint is closed)
+
+Revision ID: 5b8c3e1f7d24
+Revises: 9d2f6a1b8e35
+Create Date: 2026-07-21
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "5b8c3e1f7d24"
+down_revision = "9d2f6a1b8e35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "sprint_rollup_snapshots" in inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "sprint_rollup_snapshots",
+        sa.Column("sprint_id", sa.String(), sa.ForeignKey("sprint_definitions.id"), primary_key=True),
+        sa.Column("metrics", sa.String(), nullable=False),
+        sa.Column("stories", sa.String(), nullable=False),
+        sa.Column("reflection", sa.String(), nullable=False),
+        sa.Column("frozen_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Closed sprints simply go back to being recomputed on every read.
+    op.drop_table("sprint_rollup_snapshots")
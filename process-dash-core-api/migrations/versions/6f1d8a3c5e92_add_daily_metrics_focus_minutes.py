@@ -0,0 +1,31 @@
+"""add daily_metrics.focus_minutes
+
+Revision ID: 6f1d8a3c5e92
+Revises: 2e6a9c4b8f17
+Create Date: 2026-07-25
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "6f1d8a3c5e92"
+down_revision = "2e6a9c4b8f17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the column may already exist.
+    columns = {c["name"] for c in inspect(op.get_bind()).get_columns("daily_metrics")}
+    if "focus_minutes" not in columns:
+        with op.batch_alter_table("daily_metrics") as batch_op:
+            batch_op.add_column(sa.Column("focus_minutes", sa.Integer(), nullable=False, server_default="0"))
+
+    # Existing cells have no focus minutes yet: rebuild_projections.py
+    # (run by migrate.py after upgrading) recomputes the cube.
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("daily_metrics") as batch_op:
+        batch_op.drop_column("focus_minutes")
@@ -0,0 +1,35 @@
+"""add rollup_snapshots
+
+Revision ID: 7a4e2b9c1d63
+Revises: 3c8d1e7f5a42
+Create Date: 2026-07-12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "7a4e2b9c1d63"
+down_revision = "3c8d1e7f5a42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "rollup_snapshots" in inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "rollup_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_ts", sa.DateTime(), nullable=True),
+        sa.Column("hwm_ts", sa.DateTime(), nullable=False),
+        sa.Column("hwm_id", sa.String(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_snapshots")
@@ -0,0 +1,38 @@
+"""add event_log_partitions (registry of monthly event_log archives)
+
+Revision ID: 9d2f6a1b8e35
+Revises: 7a4e2b9c1d63
+Create Date: 2026-07-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "9d2f6a1b8e35"
+down_revision = "7a4e2b9c1d63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "event_log_partitions" in inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "event_log_partitions",
+        sa.Column("table_name", sa.String(), primary_key=True),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("min_ts", sa.DateTime(), nullable=True),
+        sa.Column("max_ts", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_event_log_partitions_month", "event_log_partitions", ["month"])
+
+
+def downgrade() -> None:
+    # The archive tables themselves are data, not schema: move them back into
+    # event_log (python archive_events.py --restore) before downgrading.
+    op.drop_index("ix_event_log_partitions_month", table_name="event_log_partitions")
+    op.drop_table("event_log_partitions")
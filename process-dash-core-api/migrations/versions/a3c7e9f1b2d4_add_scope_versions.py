@@ -0,0 +1,32 @@
+"""add scope_versions (ETag version tokens per rollup scope)
+
+Revision ID: a3c7e9f1b2d4
+Revises: 6f1d8a3c5e92
+Create Date: 2026-08-04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "a3c7e9f1b2d4"
+down_revision = "6f1d8a3c5e92"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "scope_versions" in inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "scope_versions",
+        sa.Column("scope", sa.String(), primary_key=True),
+        sa.Column("version", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Only ETags read the tokens; clients simply refetch once.
+    op.drop_table("scope_versions")
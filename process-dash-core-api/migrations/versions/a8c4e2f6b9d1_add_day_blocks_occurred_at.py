@@ -0,0 +1,30 @@
+"""add day_blocks.occurred_at (when a block started, for the focus heatmap)
+
+Revision ID: a8c4e2f6b9d1
+Revises: f7c2e9a4b1d8
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "a8c4e2f6b9d1"
+down_revision = "f7c2e9a4b1d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the column may already exist.
+    columns = {c["name"] for c in inspect(op.get_bind()).get_columns("day_blocks")}
+    if "occurred_at" not in columns:
+        op.add_column("day_blocks", sa.Column("occurred_at", sa.DateTime(), nullable=True))
+
+    # Filled by replaying the log in rebuild_projections.py, which migrate.py
+    # runs after upgrading. Until then the heatmap falls back to started_at.
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("day_blocks") as batch:
+        batch.drop_column("occurred_at")
@@ -0,0 +1,36 @@
+"""add day_blocks.interruptions and daily_metrics.interruptions (per reason code)
+
+Revision ID: b2d6f8a4c1e7
+Revises: a8c4e2f6b9d1
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = "b2d6f8a4c1e7"
+down_revision = "a8c4e2f6b9d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the columns may already exist.
+    inspector = inspect(op.get_bind())
+    if "interruptions" not in {c["name"] for c in inspector.get_columns("day_blocks")}:
+        op.add_column("day_blocks", sa.Column("interruptions", sa.String(), nullable=True))
+    if "interruptions" not in {c["name"] for c in inspector.get_columns("daily_metrics")}:
+        with op.batch_alter_table("daily_metrics") as batch_op:
+            batch_op.add_column(sa.Column("interruptions", sa.Integer(), nullable=False, server_default="0"))
+
+    # Existing blocks have no interruption counts yet: rebuild_projections.py
+    # (run by migrate.py after upgrading) replays the log and recomputes the cube.
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("daily_metrics") as batch_op:
+        batch_op.drop_column("interruptions")
+    with op.batch_alter_table("day_blocks") as batch_op:
+        batch_op.drop_column("interruptions")
@@ -0,0 +1,24 @@
+"""add ix_day_todos_completed_date (open / done todo lists)
+
+Revision ID: b6e4a2c8f0d5
+Revises: e5b9d7c3a1f6
+Create Date: 2026-08-11
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "b6e4a2c8f0d5"
+down_revision = "e5b9d7c3a1f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing_indexes = {i["name"] for i in inspect(op.get_bind()).get_indexes("day_todos")}
+    if "ix_day_todos_completed_date" not in existing_indexes:
+        op.create_index("ix_day_todos_completed_date", "day_todos", ["completed", "date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_day_todos_completed_date", table_name="day_todos")
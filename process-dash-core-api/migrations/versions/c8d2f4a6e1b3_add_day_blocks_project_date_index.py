@@ -0,0 +1,24 @@
+"""add ix_day_blocks_project_date (paged project block lists)
+
+Revision ID: c8d2f4a6e1b3
+Revises: a3c7e9f1b2d4
+Create Date: 2026-08-06
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "c8d2f4a6e1b3"
+down_revision = "a3c7e9f1b2d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing_indexes = {i["name"] for i in inspect(op.get_bind()).get_indexes("day_blocks")}
+    if "ix_day_blocks_project_date" not in existing_indexes:
+        op.create_index("ix_day_blocks_project_date", "day_blocks", ["project_id", "date", "started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_day_blocks_project_date", table_name="day_blocks")
@@ -0,0 +1,33 @@
+"""add story_tags (indexed, lower-cased story tags)
+
+Revision ID: d9a3f5b7c2e4
+Revises: b6e4a2c8f0d5
+Create Date: 2026-08-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "d9a3f5b7c2e4"
+down_revision = "b6e4a2c8f0d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "story_tags" not in inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "story_tags",
+            sa.Column("story_id", sa.String(), sa.ForeignKey("user_stories.id"), primary_key=True),
+            sa.Column("tag_lower", sa.String(), primary_key=True),
+        )
+        op.create_index("ix_story_tags_tag_lower_story_id", "story_tags", ["tag_lower", "story_id"])
+
+    # Filled from the JSON tags on user_stories by rebuild_projections.py,
+    # which migrate.py runs after upgrading.
+
+
+def downgrade() -> None:
+    op.drop_table("story_tags")
@@ -0,0 +1,39 @@
+"""add sprint_story_states (story status / points intervals behind the burndown)
+
+Revision ID: e5b9d7c3a1f6
+Revises: c8d2f4a6e1b3
+Create Date: 2026-08-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "e5b9d7c3a1f6"
+down_revision = "c8d2f4a6e1b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the table may already exist.
+    if "sprint_story_states" not in inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "sprint_story_states",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sprint_id", sa.String(), nullable=False),
+            sa.Column("story_id", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("points", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("valid_from", sa.DateTime(), nullable=False),
+            sa.Column("valid_to", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_sprint_story_states_sprint_id", "sprint_story_states", ["sprint_id"])
+        op.create_index("ix_sprint_story_states_story_id", "sprint_story_states", ["story_id"])
+
+    # Filled from the story events by rebuild_projections.py, which
+    # migrate.py runs after upgrading.
+
+
+def downgrade() -> None:
+    op.drop_table("sprint_story_states")
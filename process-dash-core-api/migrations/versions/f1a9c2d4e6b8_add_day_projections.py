@@ -0,0 +1,71 @@
+"""add day projections (day_blocks, day_recovery, day_todos)
+
+Revision ID: f1a9c2d4e6b8
+Revises: e8f2a3b14c76
+Create Date: 2026-07-06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "f1a9c2d4e6b8"
+down_revision = "e8f2a3b14c76"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the tables may already exist.
+    existing = set(inspect(op.get_bind()).get_table_names())
+
+    if "day_blocks" not in existing:
+        op.create_table(
+            "day_blocks",
+            sa.Column("block_id", sa.String(), primary_key=True),
+            sa.Column("date", sa.String(), nullable=False),
+            sa.Column("project_id", sa.String(), nullable=True),
+            sa.Column("story_id", sa.String(), nullable=True),
+            sa.Column("intent", sa.String(), nullable=True),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("started_at", sa.DateTime(), nullable=False),
+            sa.Column("interrupted", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("reason_code", sa.String(), nullable=True),
+            sa.Column("actual_outcome", sa.String(), nullable=True),
+            sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        )
+        op.create_index("ix_day_blocks_date", "day_blocks", ["date"])
+        op.create_index("ix_day_blocks_project_id", "day_blocks", ["project_id"])
+
+    if "day_recovery" not in existing:
+        op.create_table(
+            "day_recovery",
+            sa.Column("block_id", sa.String(), primary_key=True),
+            sa.Column("date", sa.String(), nullable=False),
+            sa.Column("kind", sa.String(), nullable=True),
+            sa.Column("started_at", sa.DateTime(), nullable=False),
+            sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        )
+        op.create_index("ix_day_recovery_date", "day_recovery", ["date"])
+
+    if "day_todos" not in existing:
+        op.create_table(
+            "day_todos",
+            sa.Column("todo_id", sa.String(), primary_key=True),
+            sa.Column("date", sa.String(), nullable=False),
+            sa.Column("text", sa.String(), nullable=False, server_default=""),
+            sa.Column("added_at", sa.DateTime(), nullable=False),
+            sa.Column("completed", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("completion_date", sa.String(), nullable=True),
+            sa.Column("deleted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+        op.create_index("ix_day_todos_date", "day_todos", ["date"])
+
+    # The projections are filled from event_log by rebuild_projections.py,
+    # which migrate.py runs after upgrading.
+
+
+def downgrade() -> None:
+    op.drop_table("day_todos")
+    op.drop_table("day_recovery")
+    op.drop_table("day_blocks")
@@ -0,0 +1,47 @@
+"""add search_documents and the search_fts FTS5 index
+
+Revision ID: f7c2e9a4b1d8
+Revises: d9a3f5b7c2e4
+Create Date: 2026-08-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "f7c2e9a4b1d8"
+down_revision = "d9a3f5b7c2e4"
+branch_labels = None
+depends_on = None
+
+
+# app.models.SEARCH_FTS_DDL as of this revision.
+SEARCH_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts "
+    "USING fts5(title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+
+
+def upgrade() -> None:
+    # migrate.py runs create_all() before upgrading, so the tables may already exist.
+    if "search_documents" not in inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "search_documents",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("ref_id", sa.String(), nullable=False),
+            sa.Column("date", sa.String(), nullable=True),
+            sa.Column("project_id", sa.String(), nullable=True),
+        )
+        op.create_index("ix_search_documents_kind_ref_id", "search_documents", ["kind", "ref_id"], unique=True)
+        op.create_index("ix_search_documents_date", "search_documents", ["date"])
+        op.create_index("ix_search_documents_project_id", "search_documents", ["project_id"])
+    op.execute(SEARCH_FTS_DDL)
+
+    # Filled from the stories, day projections and logged intents / summaries
+    # by rebuild_projections.py, which migrate.py runs after upgrading.
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS search_fts")
+    op.drop_table("search_documents")
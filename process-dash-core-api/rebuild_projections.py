@@ -0,0 +1,59 @@
+"""
+Rebuild the day projections (day_blocks, day_recovery, day_todos) from event_log,
+the daily_metrics cube from the projections, the sprint story states behind
+the burndown, story_tags and the full-text search index.
+
+All are normally maintained by log_event in the same transaction as each
+event. Run this after restoring a backup, after `alembic upgrade head` (the
+migrations do not backfill; migrate.py runs the same rebuild), or whenever the
+read models are suspected to have drifted:
+
+    python rebuild_projections.py
+    python rebuild_projections.py --metrics-only   # keep projections, redo the cube
+    python rebuild_projections.py --search-only    # only rebuild the full-text search index
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel
+
+# ── Bootstrap: ensure /code is on the path regardless of cwd ──────────────────
+CODE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(CODE_DIR))
+
+from app.db import engine  # noqa: E402
+from app.services.daily_metrics import rebuild_daily_metrics  # noqa: E402
+from app.services.projections import rebuild_projections  # noqa: E402
+from app.services.search import rebuild_search_index  # noqa: E402
+from app.services.story_tags import rebuild_story_tags  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metrics-only", action="store_true", help="only rebuild daily_metrics from the projections")
+    parser.add_argument("--search-only", action="store_true", help="only rebuild the search index")
+    args = parser.parse_args()
+
+    print(f"[rebuild] Database: {settings.db_path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if args.metrics_only:
+            cells = rebuild_daily_metrics(session)
+            session.commit()
+            print(f"[rebuild] Wrote {cells} daily_metrics cells.")
+            return 0
+        if not args.search_only:
+            replayed = rebuild_projections(session)
+            print(f"[rebuild] Replayed {replayed} events into day projections, daily_metrics and sprint story states.")
+            tagged = rebuild_story_tags(session)
+            print(f"[rebuild] Wrote {tagged} story_tags rows.")
+        documents = rebuild_search_index(session)
+        session.commit()
+    print(f"[rebuild] Indexed {documents} search documents.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
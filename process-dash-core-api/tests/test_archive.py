@@ -0,0 +1,125 @@
+"""
+Tests for the event_log archive (app.services.archive).
+Covers: moving history into monthly partitions, reads across partitions,
+todo compaction (and the rollup cache in another process), restore.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models import EventLog, EventLogPartition
+from app.services.archive import (
+    all_events, archive_events, compact_settled_todos, event_tables, restore_archives,
+)
+from app.services.projections import rebuild_projections
+from app.services.rollup_cache import cached, day_key, note_everything
+from app.services.rollups import _compute_period_metrics
+
+DATE = "2025-01-06"
+LIFETIME = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+
+
+def _log_old_day(client, session: Session):
+    client.post("/api/intents/daily", json={"date": DATE, "intents": ["Ship archive"]})
+    block_id = client.post("/api/blocks/start", json={"date": DATE, "intent": "Archive"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": "MEETING"})
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 45})
+
+    churned = client.post("/api/todos", json={"text": "Churn", "date": DATE}).json()["todoId"]
+    client.patch(f"/api/todos/{churned}/complete", json={"completionDate": DATE})
+    client.patch(f"/api/todos/{churned}/uncomplete", json={"completionDate": DATE})
+    client.patch(f"/api/todos/{churned}/complete", json={"completionDate": DATE})
+    dropped = client.post("/api/todos", json={"text": "Drop", "date": DATE}).json()["todoId"]
+    client.delete(f"/api/todos/{dropped}")
+    done = client.post("/api/todos", json={"text": "Done", "date": DATE}).json()["todoId"]
+    client.patch(f"/api/todos/{done}/complete", json={"completionDate": DATE})
+    undone = client.post("/api/todos", json={"text": "Undone", "date": DATE}).json()["todoId"]
+    client.patch(f"/api/todos/{undone}/complete", json={"completionDate": DATE})
+    client.patch(f"/api/todos/{undone}/uncomplete", json={"completionDate": DATE})
+
+    # Pretend all of it was logged more than a year ago.
+    for event in session.exec(select(EventLog)).all():
+        event.ts = event.ts - timedelta(days=400)
+        session.add(event)
+    session.commit()
+    rebuild_projections(session)
+
+
+def _views(client, session: Session):
+    events = all_events(session)
+    first, last = session.exec(select(func.min(events.c.ts), func.max(events.c.ts))).one()
+    month = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    return {
+        "day": client.get(f"/api/days/{DATE}").json(),
+        "todos": client.get(f"/api/todos/{DATE}").json(),
+        "events": [item["id"] for item in client.get("/api/events").json()["items"]],
+        "metrics": _compute_period_metrics(session, *LIFETIME),
+        "month": _compute_period_metrics(session, month, month + timedelta(days=62)),
+        "fy": client.get(f"/api/reports/metrics?from={first.year - 1}-07-01&to={last.year + 1}-06-30").json(),
+    }
+
+
+def test_reads_are_unchanged_after_archiving(client, session: Session):
+    _log_old_day(client, session)
+    before = _views(client, session)
+
+    moved = archive_events(session, datetime.now(timezone.utc) - timedelta(days=300))
+    assert sum(m["moved"] for m in moved) == len(before["events"])
+    assert session.exec(select(func.count()).select_from(EventLog)).one() == 0
+    assert len(event_tables(session)) == len(moved) + 1
+
+    assert _views(client, session) == before
+    rebuild_projections(session)
+    assert client.get(f"/api/days/{DATE}").json() == before["day"]
+
+
+def test_compaction_folds_settled_todo_history(client, session: Session):
+    _log_old_day(client, session)
+    before = _views(client, session)
+    archive_events(session, datetime.now(timezone.utc) - timedelta(days=300))
+
+    removed = compact_settled_todos(session)
+    # dropped and done: 2 events -> 1 each. churned (completed twice) and
+    # undone (completed, then not) keep their history: period rollups count
+    # each completion.
+    assert removed == 2
+    assert compact_settled_todos(session) == 0
+
+    after = _views(client, session)
+    assert before["metrics"]["todosCompleted"] == 4
+    assert {k: v for k, v in after.items() if k != "events"} == {k: v for k, v in before.items() if k != "events"}
+
+    partitions = session.exec(select(EventLogPartition)).all()
+    assert sum(p.event_count for p in partitions) == len(before["events"]) - removed
+
+    rebuild_projections(session)
+    assert client.get(f"/api/days/{DATE}").json() == before["day"]
+
+
+def test_compaction_in_another_process_empties_the_rollup_cache(tmp_path):
+    # archive_events.py runs in its own process, with its own engine.
+    url = f"sqlite:///{tmp_path / 'workobs.sqlite'}"
+    server, script = create_engine(url), create_engine(url)
+    SQLModel.metadata.create_all(server)
+
+    with Session(server) as session:
+        assert cached(session, day_key(DATE), lambda: "before") == ("before", "miss")
+        assert cached(session, day_key(DATE), lambda: "stale") == ("before", "hit")
+
+    with Session(script) as session:
+        note_everything(session)  # what compact_settled_todos records
+        session.commit()
+
+    with Session(server) as session:
+        assert cached(session, day_key(DATE), lambda: "after") == ("after", "miss")
+        assert cached(session, day_key(DATE), lambda: "stale") == ("after", "hit")
+
+
+def test_restore_moves_archives_back(client, session: Session):
+    _log_old_day(client, session)
+    total = session.exec(select(func.count()).select_from(EventLog)).one()
+    archive_events(session, datetime.now(timezone.utc) - timedelta(days=300))
+
+    assert restore_archives(session) == total
+    assert session.exec(select(func.count()).select_from(EventLog)).one() == total
+    assert session.exec(select(EventLogPartition)).all() == []
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.models import EventLog
+from app.services.burndown import rebuild_story_states
+
+
+def _story(client, sprint_id, title, points=None):
+    return client.post(
+        "/api/stories", json={"sprintId": sprint_id, "title": title, "storyPoints": points}
+    ).json()["id"]
+
+
+def _day(row):
+    return {k: row[k] for k in ("scopePoints", "remainingPoints", "remainingStories", "completedPoints")}
+
+
+def test_burndown_follows_story_events(client, session):
+    today = datetime.now(timezone.utc).date()
+    start = today - timedelta(days=2)
+    sprint = client.post(
+        "/api/sprints", json={"name": "Current", "startDate": start.isoformat(), "durationDays": 5}
+    ).json()
+
+    a = _story(client, sprint["id"], "A", 5)
+    b = _story(client, sprint["id"], "B", 3)
+    c = _story(client, sprint["id"], "C")
+    client.patch(f"/api/stories/{a}/status", json={"status": "DONE"})
+    client.patch(f"/api/stories/{b}", json={"storyPoints": 8})
+    client.delete(f"/api/stories/{c}")
+    d = _story(client, sprint["id"], "D", 2)
+
+    resp = client.get(f"/api/sprints/{sprint['id']}/burndown")
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    days = body["days"]
+    assert [row["date"] for row in days] == [(start + timedelta(days=i)).isoformat() for i in range(5)]
+    assert _day(days[0]) == {"scopePoints": 0, "remainingPoints": 0, "remainingStories": 0, "completedPoints": 0}
+    assert _day(days[2]) == {"scopePoints": 15, "remainingPoints": 10, "remainingStories": 2, "completedPoints": 5}
+    assert days[3]["remainingPoints"] is None and days[4]["scopeStories"] is None
+
+    changes = [(m["storyId"], m["change"], m["pointsDelta"]) for m in body["scopeChanges"]]
+    assert changes == [
+        (a, "added", 5), (b, "added", 3), (c, "added", 0),
+        (b, "reestimated", 5), (c, "removed", 0), (d, "added", 2),
+    ]
+    assert all(m["date"] == today.isoformat() for m in body["scopeChanges"])
+
+    rebuild_story_states(session)
+    session.commit()
+    assert client.get(f"/api/sprints/{sprint['id']}/burndown").json() == body
+
+    assert client.get("/api/sprints/missing/burndown").status_code == 404
+
+
+def test_burndown_rebuilt_from_backdated_log(client, session):
+    sprint = client.post("/api/sprints", json={"name": "March", "startDate": "2026-03-02", "durationDays": 5}).json()
+    nxt = client.post("/api/sprints", json={"name": "Next", "startDate": "2026-03-09", "durationDays": 5}).json()
+    a = _story(client, sprint["id"], "A", 3)
+    b = _story(client, sprint["id"], "B", 5)
+    client.patch(f"/api/stories/{a}/status", json={"status": "DONE"})
+    client.post(f"/api/sprints/{sprint['id']}/carry-forward", json={"storyIds": [b], "targetSprintId": nxt["id"]})
+
+    for event_type, ts in [
+        ("user_story_created", datetime(2026, 3, 1, 9)),
+        ("user_story_status_changed", datetime(2026, 3, 4, 15)),
+        ("user_story_carried_forward", datetime(2026, 3, 5, 17)),
+    ]:
+        session.exec(update(EventLog).where(EventLog.type == event_type).values(ts=ts))
+    session.commit()
+    rebuild_story_states(session)
+    session.commit()
+
+    body = client.get(f"/api/sprints/{sprint['id']}/burndown").json()
+    assert [(row["scopePoints"], row["remainingPoints"], row["completedPoints"]) for row in body["days"]] == [
+        (8, 8, 0), (8, 8, 0), (8, 5, 3), (3, 0, 3), (3, 0, 3),
+    ]
+    assert body["scopeChanges"] == [{"date": "2026-03-05", "storyId": b, "change": "removed", "pointsDelta": -5}]
+
+    target = client.get(f"/api/sprints/{nxt['id']}/burndown").json()
+    assert target["days"][0]["remainingPoints"] == 5 and target["days"][0]["remainingStories"] == 1
+    assert target["scopeChanges"] == []
@@ -0,0 +1,101 @@
+"""
+Parity tests for the optional pandas metrics engine (app.services.columnar_metrics):
+it must return exactly what the event-by-event fold returns.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from sqlmodel import Session  # noqa: E402
+
+from app.services import columnar_metrics  # noqa: E402
+from app.services.events import log_events, new_event  # noqa: E402
+from app.services.rollups import _compute_period_metrics, get_projects_dashboard  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+LIFETIME = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+
+
+def _seed(client, session: Session):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    beta = client.post("/api/projects", json={"name": "Beta"}).json()["id"]
+    day = "2026-03-02"
+    log_events(session, [
+        # Plain, interrupted twice, and float-length blocks.
+        new_event("intent_block_started", {"blockId": "a1", "date": day, "intent": "Deep", "storyId": "s1"}, project_id=alpha),
+        new_event("intent_block_ended", {"blockId": "a1", "durationMinutes": 45, "actualOutcome": "done"}, project_id=alpha),
+        new_event("intent_block_started", {"blockId": "a2", "date": day, "intent": "Talk", "notes": "n"}, project_id=alpha),
+        new_event("intent_block_interrupted", {"blockId": "a2", "reasonCode": "MEETING"}, project_id=alpha),
+        new_event("intent_block_interrupted", {"blockId": "a2", "reasonCode": "TECH_ISSUE"}, project_id=alpha),
+        new_event("intent_block_ended", {"blockId": "a2", "durationMinutes": 20}, project_id=alpha),
+        new_event("intent_block_started", {"blockId": "b1", "date": day, "intent": "Odd"}, project_id=beta),
+        new_event("intent_block_ended", {"blockId": "b1", "durationMinutes": 30.5}, project_id=beta),
+        # Events before a start, an interruption without a code, an empty blockId.
+        new_event("intent_block_interrupted", {"blockId": "early", "reasonCode": "MEETING"}),
+        new_event("intent_block_ended", {"blockId": "early", "durationMinutes": 99}),
+        new_event("intent_block_started", {"blockId": "early", "date": day, "intent": "Late"}),
+        new_event("intent_block_interrupted", {"blockId": "early"}),
+        new_event("intent_block_started", {"blockId": "", "date": day, "intent": "Nothing"}),
+        # Restarted block: the interruption still counts, the block state resets.
+        new_event("intent_block_started", {"blockId": "r1", "date": day, "intent": "First"}, project_id=alpha),
+        new_event("intent_block_interrupted", {"blockId": "r1", "reasonCode": "MEETING"}, project_id=alpha),
+        new_event("intent_block_ended", {"blockId": "r1", "durationMinutes": 10}, project_id=alpha),
+        new_event("intent_block_started", {"blockId": "r1", "date": "2026-03-03", "intent": "Again"}, project_id=alpha),
+        # Started in one project, ended without one: open in the project scope.
+        new_event("intent_block_started", {"blockId": "x1", "date": day, "intent": "Cross"}, project_id=beta),
+        new_event("intent_block_ended", {"blockId": "x1", "durationMinutes": 60}),
+        new_event("recovery_block_ended", {"blockId": "rec1", "durationMinutes": 15}),
+        new_event("recovery_block_ended", {"blockId": "rec2", "durationMinutes": 12.5}, project_id=alpha),
+        new_event("todo_completed", {"todoId": "t1", "completionDate": day}),
+        new_event("todo_settled", {"todoId": "t2", "completed": True}),
+        new_event("todo_settled", {"todoId": "t3", "completed": False}),
+    ])
+    return alpha, beta
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(monkeypatch):
+    def use(name):
+        monkeypatch.setattr(settings, "WORKOBS_METRICS_ENGINE", name)
+    yield use
+
+
+def test_period_metrics_parity(client, session: Session, engine):
+    alpha, beta = _seed(client, session)
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    windows = [LIFETIME, (start, start + timedelta(days=2)), (start - timedelta(days=30), start)]
+
+    for window in windows:
+        for project_id in (None, alpha, beta, "missing"):
+            engine("python")
+            expected = _compute_period_metrics(session, *window, project_id=project_id)
+            engine("pandas")
+            assert _compute_period_metrics(session, *window, project_id=project_id) == expected
+
+    engine("pandas")
+    lifetime = _compute_period_metrics(session, *LIFETIME)
+    assert [b["blockId"] for b in lifetime["blocks"]] == ["a1", "a2", "b1", "early", "r1", "x1"]
+    assert lifetime["topFragmenters"] == [{"code": "MEETING", "count": 2}, {"code": "TECH_ISSUE", "count": 1}]
+    assert lifetime["todosCompleted"] == 2
+
+
+def test_projects_dashboard_parity(client, session: Session, engine):
+    _seed(client, session)
+    client.post("/api/projects", json={"name": "Empty"})
+
+    engine("python")
+    expected = get_projects_dashboard(session)
+    engine("pandas")
+    assert get_projects_dashboard(session) == expected
+
+
+def test_engine_setting(engine):
+    engine("auto")
+    assert columnar_metrics.enabled()
+    engine("python")
+    assert not columnar_metrics.enabled()
+    engine("numpy")
+    with pytest.raises(RuntimeError):
+        columnar_metrics.enabled()
@@ -0,0 +1,131 @@
+from datetime import datetime, timezone
+
+from sqlmodel import select
+
+from app.models import DailyMetric
+from app.services.daily_metrics import rebuild_daily_metrics
+from app.services.events import log_event, log_events, new_event
+from app.services.rollups import _compute_period_metrics
+
+
+def _cube(session):
+    rows = session.exec(select(DailyMetric)).all()
+    return {
+        (r.date, r.project_id, r.reason_code): (
+            r.blocks, r.interrupted_blocks, r.focus_blocks, r.active_minutes, r.focus_minutes,
+            r.recovery_minutes, r.todos_completed, r.interruptions,
+        )
+        for r in rows
+        if any((r.blocks, r.active_minutes, r.recovery_minutes, r.todos_completed, r.interruptions))
+    }
+
+
+def _seed(client):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    for day in ("2024-03-04", "2024-03-05"):
+        focus = client.post("/api/blocks/start", json={"date": day, "intent": "Deep", "projectId": alpha}).json()["blockId"]
+        client.post("/api/blocks/end", json={"blockId": focus, "durationMinutes": 45})
+        meeting = client.post("/api/blocks/start", json={"date": day, "intent": "Talk"}).json()["blockId"]
+        client.post("/api/blocks/interrupt", json={"blockId": meeting, "reasonCode": "MEETING"})
+        client.post("/api/blocks/end", json={"blockId": meeting, "durationMinutes": 20})
+        recovery = client.post("/api/recovery/start", json={"date": day, "kind": "COFFEE"}).json()["blockId"]
+        client.post("/api/recovery/end", json={"blockId": recovery, "durationMinutes": 10})
+        todo = client.post("/api/todos", json={"text": "Ship", "date": day}).json()["todoId"]
+        client.patch(f"/api/todos/{todo}/complete", json={"completionDate": day})
+    return alpha
+
+
+def test_cube_tracks_projections_incrementally(client, session):
+    alpha = _seed(client)
+
+    # Restart a block on another day, uncomplete and delete todos, and log a batch.
+    moved = client.post("/api/blocks/start", json={"date": "2024-03-04", "intent": "Move", "projectId": alpha}).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": moved, "durationMinutes": 60})
+    log_event(session, "intent_block_started", {"blockId": moved, "date": "2024-03-06", "intent": "Move"}, project_id=alpha)
+    todo = client.post("/api/todos", json={"text": "Undo", "date": "2024-03-04"}).json()["todoId"]
+    client.patch(f"/api/todos/{todo}/complete", json={"completionDate": "2024-03-04"})
+    client.patch(f"/api/todos/{todo}/uncomplete", json={"completionDate": "2024-03-04"})
+    gone = client.post("/api/todos", json={"text": "Gone", "date": "2024-03-05"}).json()["todoId"]
+    client.patch(f"/api/todos/{gone}/complete", json={"completionDate": "2024-03-05"})
+    client.delete(f"/api/todos/{gone}")
+    log_events(session, [
+        new_event("intent_block_started", {"blockId": "b1", "date": "2024-03-06", "intent": "Batch"}),
+        new_event("intent_block_interrupted", {"blockId": "b1", "reasonCode": "DEPENDENCY"}),
+        new_event("intent_block_ended", {"blockId": "b1", "durationMinutes": 15}),
+    ])
+
+    incremental = _cube(session)
+    assert incremental[("2024-03-04", alpha, "")] == (1, 0, 1, 45, 45, 0, 0, 0)
+    assert incremental[("2024-03-04", "", "")] == (1, 1, 0, 20, 0, 10, 1, 0)
+    assert incremental[("2024-03-04", "", "MEETING")] == (0, 0, 0, 0, 0, 0, 0, 1)
+    assert incremental[("2024-03-06", alpha, "")] == (1, 0, 0, 0, 0, 0, 0, 0)
+    assert incremental[("2024-03-06", "", "")] == (1, 1, 0, 15, 0, 0, 0, 0)
+    assert incremental[("2024-03-06", "", "DEPENDENCY")] == (0, 0, 0, 0, 0, 0, 0, 1)
+
+    rebuild_daily_metrics(session)
+    session.commit()
+    assert _cube(session) == incremental
+
+
+def test_metrics_range_matches_day_rollups(client):
+    alpha = _seed(client)
+
+    days = client.get("/api/days", params={"from": "2024-03-04", "to": "2024-03-05"}).json()["totals"]
+    resp = client.get("/api/reports/metrics", params={"from": "2024-03-04", "to": "2024-03-05"})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    metrics = body["metrics"]
+    for key in ("totalBlocks", "interruptedBlocks", "fragmentationRate", "focusBlocks",
+                "totalActiveMinutes", "totalRecoveryMinutes", "todosCompleted"):
+        assert metrics[key] == days[key], key
+    assert metrics["topFragmenters"] == [{"code": "MEETING", "count": 2}]
+    assert body["byProject"] == [{"projectId": alpha, "metrics": body["byProject"][0]["metrics"]}]
+    assert body["byProject"][0]["metrics"]["totalActiveMinutes"] == 90
+
+    scoped = client.get("/api/reports/metrics", params={"from": "2024-03-04", "to": "2024-03-05", "projectId": alpha}).json()
+    assert scoped["metrics"]["totalBlocks"] == 2
+    assert scoped["metrics"]["totalRecoveryMinutes"] == 0
+    assert scoped["metrics"]["todosCompleted"] == 2
+
+
+def test_fragmenters_count_every_interruption(client, session):
+    day = datetime.now(timezone.utc).date().isoformat()
+    block = client.post("/api/blocks/start", json={"date": day, "intent": "Deep"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": block, "reasonCode": "MEETING"})
+    client.post("/api/blocks/interrupt", json={"blockId": block, "reasonCode": "DEPENDENCY"})
+    client.post("/api/blocks/end", json={"blockId": block, "durationMinutes": 50})
+    other = client.post("/api/blocks/start", json={"date": day, "intent": "Talk"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": other, "reasonCode": "MEETING"})
+
+    lifetime = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+    replayed = _compute_period_metrics(session, *lifetime)["topFragmenters"]
+    cube = client.get("/api/reports/metrics", params={"from": day, "to": day}).json()["metrics"]
+    assert replayed == [{"code": "MEETING", "count": 2}, {"code": "DEPENDENCY", "count": 1}]
+    assert cube["topFragmenters"] == replayed
+    assert cube["interruptedBlocks"] == 2
+
+
+def test_metrics_range_selectors(client):
+    _seed(client)
+    week = client.get("/api/reports/metrics", params={"week": "2024-W10"}).json()
+    assert (week["from"], week["to"]) == ("2024-03-04", "2024-03-10")
+    assert week["metrics"]["totalBlocks"] == 4
+
+    month = client.get("/api/reports/metrics", params={"month": "2024-02"}).json()
+    assert (month["from"], month["to"]) == ("2024-02-01", "2024-02-29")
+    assert month["metrics"]["totalBlocks"] == 0
+
+    sprint = client.post("/api/sprints", json={"name": "S", "startDate": "2024-03-05", "durationDays": 7}).json()
+    by_sprint = client.get("/api/reports/metrics", params={"sprintId": sprint["id"]}).json()
+    assert by_sprint["metrics"]["totalBlocks"] == 2
+
+    fy = client.post(
+        "/api/financial-years", json={"label": "FY 2023-24", "startDate": "2023-07-01", "endDate": "2024-06-30"}
+    ).json()
+    by_fy = client.get("/api/reports/metrics", params={"financialYearId": fy["id"]}).json()
+    assert by_fy["metrics"]["totalBlocks"] == 4
+
+    assert client.get("/api/reports/metrics", params={"week": "2024-W10", "month": "2024-03"}).status_code == 400
+    assert client.get("/api/reports/metrics").status_code == 400
+    assert client.get("/api/reports/metrics", params={"week": "March"}).status_code == 400
+    assert client.get("/api/reports/metrics", params={"sprintId": "missing"}).status_code == 404
@@ -78,3 +78,37 @@ def test_day_rollup_lifecycle(client):
     assert metrics["totalActiveMinutes"] == 45
     assert metrics["totalActiveLabel"] == "~1 hour"
     assert data["blocks"][0]["durationLabel"] == "~1 hour"
+
+
+def test_days_range_matches_single_day_rollups(client):
+    client.post("/api/intents/daily", json={"date": "2023-10-27", "intents": ["Old"]})
+    client.post("/api/intents/daily", json={"date": "2023-10-27", "intents": ["New"]})
+    first = client.post("/api/blocks/start", json={"date": "2023-10-27", "intent": "A"}).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": first, "durationMinutes": 40})
+    second = client.post("/api/blocks/start", json={"date": "2023-10-29", "intent": "B"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": second, "reasonCode": "MEETING"})
+    client.post("/api/blocks/end", json={"blockId": second, "durationMinutes": 20})
+    todo_id = client.post("/api/todos", json={"text": "T", "date": "2023-10-29"}).json()["todoId"]
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": "2023-10-29"})
+
+    resp = client.get("/api/days", params={"from": "2023-10-27", "to": "2023-10-29"})
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert [d["date"] for d in data["days"]] == ["2023-10-27", "2023-10-28", "2023-10-29"]
+    for day in data["days"]:
+        assert day == client.get(f"/api/days/{day['date']}").json()
+    assert data["days"][0]["intents"] == ["New"]
+
+    totals = data["totals"]
+    assert totals["totalBlocks"] == 2
+    assert totals["interruptedBlocks"] == 1
+    assert totals["fragmentationRate"] == 0.5
+    assert totals["totalActiveMinutes"] == 60
+    assert totals["todosCompleted"] == 1
+
+
+def test_days_range_rejects_bad_ranges(client):
+    assert client.get("/api/days", params={"from": "2023-10-29", "to": "2023-10-27"}).status_code == 400
+    assert client.get("/api/days", params={"from": "2023-01-01", "to": "2024-12-31"}).status_code == 400
+    assert client.get("/api/days", params={"from": "2023-10-27"}).status_code == 422
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+from app.services.scope_versions import etag_matches
+
+
+def _etag(client, url, etag=None, expected=200):
+    resp = client.get(url, headers={"If-None-Match": etag} if etag else {})
+    assert resp.status_code == expected, resp.text
+    assert resp.headers["Cache-Control"] == "no-cache"
+    return resp.headers["ETag"]
+
+
+def test_day_etag_changes_only_with_its_day(client):
+    url = "/api/days/2024-03-04"
+    etag = _etag(client, url)
+    other = _etag(client, "/api/days/2024-03-05")
+    assert _etag(client, url, etag, 304) == etag
+
+    block_id = client.post("/api/blocks/start", json={"date": "2024-03-04", "intent": "Write"}).json()["blockId"]
+    changed = _etag(client, url, etag, 200)
+    assert changed != etag
+    assert _etag(client, "/api/days/2024-03-05", other, 304) == other
+
+    # Follow-up events only carry the blockId.
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 30})
+    assert _etag(client, url, changed, 200) != changed
+
+    # A bypassed read always recomputes.
+    resp = client.get(url, headers={"If-None-Match": etag, "X-Rollup-Cache": "bypass"})
+    assert resp.status_code == 200
+
+
+def test_sprint_and_project_etags(client):
+    today = date.today()
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    sprint = client.post(
+        "/api/sprints",
+        json={"name": "Now", "startDate": (today - timedelta(days=2)).isoformat(), "durationDays": 7},
+    ).json()
+    past = client.post(
+        "/api/sprints",
+        json={"name": "Past", "startDate": (today - timedelta(days=30)).isoformat(), "durationDays": 7},
+    ).json()
+    sprint_url, past_url = f"/api/sprints/{sprint['id']}/rollup", f"/api/sprints/{past['id']}/rollup"
+    project_url, dashboard_url = f"/api/reports/projects/{alpha}/data", "/api/reports/projects"
+
+    etags = {url: _etag(client, url) for url in (sprint_url, past_url, project_url, dashboard_url)}
+    for url, etag in etags.items():
+        _etag(client, url, etag, 304)
+
+    # A block logged now lands in the current sprint's window and in Alpha.
+    client.post("/api/blocks/start", json={"date": today.isoformat(), "intent": "Work", "projectId": alpha})
+    for url in (sprint_url, project_url, dashboard_url):
+        etags[url] = _etag(client, url, etags[url], 200)
+    _etag(client, past_url, etags[past_url], 304)
+
+    client.post("/api/stories", json={"sprintId": past["id"], "title": "Story", "storyPoints": 2})
+    etags[past_url] = _etag(client, past_url, etags[past_url], 200)
+    _etag(client, sprint_url, etags[sprint_url], 304)
+
+    # Completed todos count towards every project.
+    todo_id = client.post("/api/todos", json={"text": "Ship", "date": today.isoformat()}).json()["todoId"]
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": today.isoformat()})
+    _etag(client, project_url, etags[project_url], 200)
+    _etag(client, dashboard_url, etags[dashboard_url], 200)
+
+
+def test_projects_dashboard_etag_follows_its_window(client):
+    url = "/api/reports/projects"
+    lifetime = _etag(client, url)
+    march = _etag(client, f"{url}?from=2024-03-01&to=2024-03-31")
+    april = _etag(client, f"{url}?from=2024-04-01&to=2024-04-30")
+    assert len({lifetime, march, april}) == 3
+    assert _etag(client, f"{url}?from=2024-04-01&to=2024-04-30", march, 200) == april
+    assert _etag(client, f"{url}?from=2024-03-01&to=2024-03-31", march, 304) == march
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
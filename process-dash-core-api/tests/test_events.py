@@ -0,0 +1,172 @@
+"""
+Tests for the event log service and API.
+Covers: denormalized payload columns, batch ingest, keyset paging and streaming.
+"""
+import json
+
+from sqlmodel import Session, select
+
+from app.models import EventLog
+from app.services.events import log_event
+from app.services.rollups import get_day_rollup
+
+
+def test_log_event_denormalizes_hot_payload_keys(session: Session):
+    evt = log_event(session, "user_story_created", {"storyId": "s1", "sprintId": "sp1", "title": "T"})
+    assert evt.story_id == "s1"
+    assert evt.sprint_id == "sp1"
+    assert evt.payload_date is None
+
+    evt = log_event(session, "intent_block_started", {"blockId": "b1", "date": "2026-05-04", "intent": "x"})
+    assert evt.block_id == "b1"
+    assert evt.payload_date == "2026-05-04"
+
+
+def test_intents_lookup_does_not_depend_on_json_spacing(session: Session):
+    # Written with compact separators: the old substring match on '"date": "..."' missed it.
+    session.add(EventLog(
+        type="daily_intents_set",
+        payload=json.dumps({"date": "2026-05-04", "intents": ["Focus"]}, separators=(",", ":")),
+        payload_date="2026-05-04",
+    ))
+    session.commit()
+
+    assert get_day_rollup(session, "2026-05-04")["intents"] == ["Focus"]
+
+
+def test_todos_for_date_use_todo_id_column(client, session: Session):
+    todo_id = client.post("/api/todos", json={"text": "Ship", "date": "2026-05-04"}).json()["todoId"]
+    client.post("/api/todos", json={"text": "Other", "date": "2026-05-05"})
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": "2026-05-06"})
+
+    completed = session.exec(select(EventLog).where(EventLog.type == "todo_completed")).one()
+    assert completed.todo_id == todo_id
+
+    todos = client.get("/api/todos/2026-05-04").json()["todos"]
+    assert [(t["text"], t["completed"], t["completionDate"]) for t in todos] == [("Ship", True, "2026-05-06")]
+
+
+# ── Batch ingest ───────────────────────────────────────────────────────────────
+
+def test_event_batch_logs_a_full_day_in_one_request(client, session: Session):
+    date = "2026-05-04"
+    resp = client.post("/api/events/batch", json={"events": [
+        {"type": "daily_intents_set", "payload": {"date": date, "intents": ["Parser"]}},
+        {"type": "intent_block_started", "payload": {"date": date, "intent": "Parser", "blockId": "b-1"},
+         "occurredAt": "2026-05-04T09:00:00Z"},
+        {"type": "intent_block_interrupted", "payload": {"blockId": "b-1", "reasonCode": "MEETING"}},
+        {"type": "intent_block_ended", "payload": {"blockId": "b-1", "durationMinutes": 50}},
+        {"type": "todo_added", "payload": {"date": date, "text": "Ship"}, "clientId": "evt-todo"},
+    ]})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["count"] == 5
+    assert body["items"][1]["blockId"] == "b-1"
+    assert body["items"][4]["eventId"] == "evt-todo"
+    assert body["items"][4]["todoId"]
+
+    started = session.exec(select(EventLog).where(EventLog.type == "intent_block_started")).one()
+    assert started.occurred_at.isoformat().startswith("2026-05-04T09:00:00")
+
+    day = client.get(f"/api/days/{date}").json()
+    assert day["intents"] == ["Parser"]
+    assert day["blocks"][0]["interrupted"] is True
+    assert day["blocks"][0]["durationMinutes"] == 50
+    assert [t["text"] for t in day["todos"]] == ["Ship"]
+
+
+def test_event_batch_is_all_or_nothing(client, session: Session):
+    resp = client.post("/api/events/batch", json={"events": [
+        {"type": "todo_added", "payload": {"date": "2026-05-04", "text": "Ok"}},
+        {"type": "intent_block_interrupted", "payload": {"blockId": "b", "reasonCode": "NAP"}},
+        {"type": "unknown_event", "payload": {}},
+    ]})
+    assert resp.status_code == 422
+    assert [e["index"] for e in resp.json()["detail"]] == [1, 2]
+    assert session.exec(select(EventLog)).all() == []
+
+
+def test_event_batch_rejects_duplicate_client_ids(client, session: Session):
+    event = {"type": "todo_added", "payload": {"date": "2026-05-04", "text": "Once"}, "clientId": "dup"}
+    assert client.post("/api/events/batch", json={"events": [event]}).status_code == 200
+    assert client.post("/api/events/batch", json={"events": [event]}).status_code == 409
+    assert len(session.exec(select(EventLog)).all()) == 1
+
+
+def test_event_batch_rejects_malformed_entity_ids(client, session: Session):
+    resp = client.post("/api/events/batch", json={"events": [
+        {"type": "intent_block_started", "payload": {"date": "2026-05-04", "intent": "x", "blockId": ""}},
+        {"type": "todo_added", "payload": {"date": "2026-05-04", "text": "t", "todoId": 7}},
+        {"type": "todo_added", "payload": {"date": "2026-05-04", "text": "t", "todoId": None}},
+    ]})
+    assert resp.status_code == 422
+    assert [e["index"] for e in resp.json()["detail"]] == [0, 1]
+    assert session.exec(select(EventLog)).all() == []
+
+
+def test_event_batch_rejects_existing_entity_ids(client, session: Session):
+    day = {"date": "2026-05-04"}
+    ok = client.post("/api/events/batch", json={"events": [
+        {"type": "intent_block_started", "payload": {**day, "intent": "x", "blockId": "b-1"}},
+        {"type": "todo_added", "payload": {**day, "text": "t", "todoId": "t-1"}},
+    ]})
+    assert ok.status_code == 200, ok.text
+
+    resp = client.post("/api/events/batch", json={"events": [
+        {"type": "intent_block_started", "payload": {**day, "intent": "again", "blockId": "b-1"}},
+        {"type": "todo_added", "payload": {**day, "text": "new", "todoId": "t-2"}},
+        {"type": "todo_added", "payload": {**day, "text": "again", "todoId": "t-1"}},
+        {"type": "todo_added", "payload": {**day, "text": "twice", "todoId": "t-2"}},
+    ]})
+    assert resp.status_code == 409
+    assert [e["index"] for e in resp.json()["detail"]] == [0, 2, 3]
+    assert len(session.exec(select(EventLog)).all()) == 2
+
+
+def _log_many(session: Session, n: int):
+    for i in range(n):
+        event_type = "todo_added" if i % 2 == 0 else "todo_deleted"
+        log_event(session, event_type, {"todoId": f"t{i}", "date": "2026-01-01"})
+
+
+def test_events_keyset_pagination_walks_whole_log(client, session: Session):
+    _log_many(session, 7)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["after"] = cursor
+        resp = client.get("/api/events", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(item["payload"]["todoId"] for item in body["items"])
+        pages += 1
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [f"t{i}" for i in range(7)]
+
+
+def test_events_type_filter_and_bad_cursor(client, session: Session):
+    _log_many(session, 4)
+
+    resp = client.get("/api/events", params={"types": "todo_deleted"})
+    assert [item["type"] for item in resp.json()["items"]] == ["todo_deleted", "todo_deleted"]
+
+    assert client.get("/api/events", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_events_stream_is_ndjson_in_log_order(client, session: Session):
+    _log_many(session, 5)
+    first_page = client.get("/api/events", params={"limit": 2}).json()
+
+    resp = client.get("/api/events/stream", params={"after": first_page["nextCursor"]})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["payload"]["todoId"] for row in rows] == ["t2", "t3", "t4"]
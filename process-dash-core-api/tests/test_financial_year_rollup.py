@@ -0,0 +1,65 @@
+def _block(client, day, minutes, reason=None):
+    block_id = client.post("/api/blocks/start", json={"date": day, "intent": "Work"}).json()["blockId"]
+    if reason:
+        client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": reason})
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": minutes})
+
+
+def test_financial_year_rollup_breakdowns(client):
+    fy = client.post(
+        "/api/financial-years", json={"label": "FY 2024-25", "startDate": "2024-07-01", "endDate": "2025-06-30"}
+    ).json()
+
+    _block(client, "2024-07-01", 60)                 # Q1, 2024-07, week 2024-W27
+    _block(client, "2024-07-02", 20, "MEETING")
+    _block(client, "2024-10-15", 45)                 # Q2
+    _block(client, "2025-06-30", 30, "TECH_ISSUE")   # Q4, last day
+    _block(client, "2025-07-01", 90)                 # next year: excluded
+
+    sprint = client.post("/api/sprints", json={"name": "S1", "startDate": "2024-07-01", "durationDays": 14}).json()
+    done = client.post("/api/stories", json={"sprintId": sprint["id"], "title": "Done", "storyPoints": 5}).json()
+    client.patch(f"/api/stories/{done['id']}/status", json={"status": "DONE"})
+    client.post("/api/stories", json={"sprintId": sprint["id"], "title": "Open", "storyPoints": 3})
+    carried = client.post("/api/stories", json={"sprintId": sprint["id"], "title": "Carried", "storyPoints": 2}).json()
+    client.patch(f"/api/stories/{carried['id']}/status", json={"status": "CARRIED_OVER"})
+
+    resp = client.get(f"/api/financial-years/{fy['id']}/rollup")
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+
+    assert body["metrics"]["totalBlocks"] == 4
+    assert body["metrics"]["focusBlocks"] == 2
+    assert body["metrics"]["focusMinutes"] == 105
+    assert body["metrics"]["fragmentationRate"] == 0.5
+    assert body["stories"] == {
+        "sprintsEnded": 1,
+        "pointsCommitted": 10,
+        "pointsDelivered": 5,
+        "storiesDone": 1,
+        "storiesCarriedOver": 1,
+    }
+
+    quarters = body["quarters"]
+    assert [(q["key"], q["from"], q["to"]) for q in quarters] == [
+        ("Q1", "2024-07-01", "2024-09-30"),
+        ("Q2", "2024-10-01", "2024-12-31"),
+        ("Q3", "2025-01-01", "2025-03-31"),
+        ("Q4", "2025-04-01", "2025-06-30"),
+    ]
+    assert [q["metrics"]["totalBlocks"] for q in quarters] == [2, 1, 0, 1]
+    assert quarters[0]["metrics"]["topFragmenters"] == [{"code": "MEETING", "count": 1}]
+    assert quarters[0]["stories"]["pointsDelivered"] == 5
+    assert quarters[1]["stories"]["sprintsEnded"] == 0
+
+    months = body["months"]
+    assert len(months) == 12
+    assert months[0]["key"] == "2024-07" and months[0]["metrics"]["totalActiveMinutes"] == 80
+    assert months[-1]["key"] == "2025-06" and months[-1]["metrics"]["interruptedBlocks"] == 1
+
+    weeks = body["weeks"]
+    assert weeks[0] == {**weeks[0], "key": "2024-W27", "from": "2024-07-01", "to": "2024-07-07"}
+    assert weeks[0]["metrics"]["totalBlocks"] == 2
+    assert weeks[-1]["key"] == "2025-W27" and weeks[-1]["from"] == weeks[-1]["to"] == "2025-06-30"
+    assert sum(w["metrics"]["totalBlocks"] for w in weeks) == 4
+
+    assert client.get("/api/financial-years/missing/rollup").status_code == 404
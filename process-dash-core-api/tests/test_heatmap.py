@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from app.models import DayBlock
+
+
+def _block(client, session, day, started_at, minutes, reason=None, project_id=None):
+    block_id = client.post(
+        "/api/blocks/start", json={"date": day, "intent": "Work", "projectId": project_id}
+    ).json()["blockId"]
+    if reason:
+        client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": reason})
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": minutes})
+    block = session.get(DayBlock, block_id)
+    block.occurred_at = started_at
+    session.add(block)
+    session.commit()
+
+
+def test_focus_heatmap_bins_by_weekday_and_hour(client, session):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    # 2024-03-04 is a Monday.
+    _block(client, session, "2024-03-04", datetime(2024, 3, 4, 9, 40), 45, project_id=alpha)
+    _block(client, session, "2024-03-04", datetime(2024, 3, 4, 23, 30), 90)          # runs into Tuesday
+    _block(client, session, "2024-03-05", datetime(2024, 3, 5, 14, 5), 20)           # too short for focus
+    _block(client, session, "2024-03-06", datetime(2024, 3, 6, 10, 15), 60, "MEETING")
+    _block(client, session, "2024-03-06", datetime(2024, 3, 6, 10, 50), 30, "TECH_ISSUE", project_id=alpha)
+    _block(client, session, "2024-03-11", datetime(2024, 3, 11, 9, 0), 60)           # outside the range
+
+    resp = client.get("/api/reports/heatmap", params={"from": "2024-03-04", "to": "2024-03-10"})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    focus, interruptions = body["focusMinutes"], body["interruptions"]
+    assert len(focus) == 7 and all(len(row) == 24 for row in focus)
+    assert focus[0][9] == 20 and focus[0][10] == 25
+    assert focus[0][23] == 30 and focus[1][0] == 60
+    assert body["totalFocusMinutes"] == 135
+    assert interruptions[2][10] == 2
+    assert body["totalInterruptions"] == 2
+
+    metrics = client.get("/api/reports/metrics", params={"from": "2024-03-04", "to": "2024-03-10"}).json()["metrics"]
+    assert body["totalFocusMinutes"] == metrics["focusMinutes"]
+
+    scoped = client.get(
+        "/api/reports/heatmap", params={"from": "2024-03-04", "to": "2024-03-10", "projectId": alpha}
+    ).json()
+    assert scoped["totalFocusMinutes"] == 45 and scoped["totalInterruptions"] == 1
+
+    # Local time two hours ahead of UTC: Monday 23:30 becomes Tuesday 01:30.
+    shifted = client.get(
+        "/api/reports/heatmap", params={"from": "2024-03-04", "to": "2024-03-10", "tzOffsetMinutes": 120}
+    ).json()
+    assert shifted["focusMinutes"][1][1] == 30 and shifted["focusMinutes"][1][2] == 60
+    assert shifted["focusMinutes"][0][11] == 20
+
+    assert client.get("/api/reports/heatmap", params={"from": "2024-03-10", "to": "2024-03-04"}).status_code == 400
+
+
+def test_focus_heatmap_bins_blocks_by_when_they_happened(client):
+    # Logged now, but worked on Monday 2024-03-04 from 07:10 to 08:10 UTC.
+    resp = client.post("/api/events/batch", json={"events": [
+        {"type": "intent_block_started", "occurredAt": "2024-03-04T09:10:00+02:00",
+         "payload": {"blockId": "b1", "date": "2024-03-04", "intent": "Offline work"}},
+        {"type": "intent_block_ended", "occurredAt": "2024-03-04T10:10:00+02:00",
+         "payload": {"blockId": "b1", "durationMinutes": 60}},
+    ]})
+    assert resp.status_code == 200, resp.text
+
+    body = client.get("/api/reports/heatmap", params={"from": "2024-03-04", "to": "2024-03-10"}).json()
+    assert body["focusMinutes"][0][7] == 50 and body["focusMinutes"][0][8] == 10
+    assert body["totalFocusMinutes"] == 60
@@ -0,0 +1,80 @@
+import json
+
+from app.services.rollup_cache import CACHE_HEADER
+
+
+def _seed(client):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    beta = client.post("/api/projects", json={"name": "Beta"}).json()["id"]
+    ids = []
+    for day in ("2024-03-04", "2024-03-05", "2024-03-06"):
+        for intent in ("One", "Two"):
+            block_id = client.post(
+                "/api/blocks/start", json={"date": day, "intent": intent, "projectId": alpha}
+            ).json()["blockId"]
+            client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 30})
+            ids.append(block_id)
+    client.post("/api/blocks/start", json={"date": "2024-03-05", "intent": "Other", "projectId": beta})
+    # Newest day first, latest start first within a day.
+    return alpha, [ids[5], ids[4], ids[3], ids[2], ids[1], ids[0]]
+
+
+def test_project_blocks_pages_and_filters(client):
+    alpha, expected = _seed(client)
+    url = f"/api/reports/projects/{alpha}/blocks"
+
+    seen, after = [], None
+    while True:
+        page = client.get(url, params={"limit": 4, **({"after": after} if after else {})}).json()
+        seen.extend(b["blockId"] for b in page["items"])
+        after = page["nextCursor"]
+        if after is None:
+            break
+    assert seen == expected
+    assert len(page["items"]) == 2
+
+    ranged = client.get(url, params={"from": "2024-03-05", "to": "2024-03-05"}).json()
+    assert [b["blockId"] for b in ranged["items"]] == expected[2:4]
+    assert ranged["items"][0]["durationMinutes"] == 30
+    assert ranged["nextCursor"] is None
+
+    assert client.get(url, params={"after": "not-a-cursor"}).status_code == 400
+    assert client.get(url, params={"from": "2024-03-06", "to": "2024-03-05"}).status_code == 400
+    assert client.get("/api/reports/projects/missing/blocks").status_code == 404
+
+
+def test_project_blocks_stream(client):
+    alpha, expected = _seed(client)
+    resp = client.get(f"/api/reports/projects/{alpha}/blocks/stream", params={"from": "2024-03-05"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [b["blockId"] for b in lines] == expected[:4]
+
+
+def test_project_data_version_2_drops_block_lists(client):
+    alpha, _ = _seed(client)
+    url = f"/api/reports/projects/{alpha}/data"
+    v1 = client.get(url).json()
+    assert len(v1["blocks"]) == 6 and len(v1["metrics"]["blocks"]) == 6
+
+    resp = client.get(url, params={"version": 2})
+    assert resp.headers[CACHE_HEADER] == "miss"
+    v2 = resp.json()
+    assert "blocks" not in v2 and "blocks" not in v2["metrics"]
+    assert v2["metrics"] == {k: v for k, v in v1["metrics"].items() if k != "blocks"}
+    assert {k: v for k, v in v2.items() if k != "metrics"} == {k: v for k, v in v1.items() if k not in ("metrics", "blocks")}
+
+    # Cached under its own key and ETag.
+    again = client.get(url, params={"version": 2})
+    assert again.headers[CACHE_HEADER] == "hit" and again.json() == v2
+    assert again.headers["ETag"] != client.get(url).headers["ETag"]
+    assert client.get(url, params={"version": 2}, headers={"If-None-Match": again.headers["ETag"]}).status_code == 304
+    assert len(client.get(url).json()["blocks"]) == 6
+
+    # A new project block drops both versions.
+    client.post("/api/blocks/start", json={"date": "2024-03-07", "intent": "More", "projectId": alpha})
+    resp = client.get(url, params={"version": 2})
+    assert resp.headers[CACHE_HEADER] == "miss" and resp.json()["metrics"]["totalBlocks"] == 7
+    v1 = client.get(url).json()
+    assert resp.json()["metrics"] == {k: v for k, v in v1["metrics"].items() if k != "blocks"}
@@ -0,0 +1,78 @@
+"""
+Tests for the day projections (day_blocks, day_recovery, day_todos).
+Covers: incremental maintenance via log_event, date scoping, rebuild from the log.
+"""
+from sqlmodel import Session, select
+
+from app.models import DayBlock, DayTodo
+from app.services.projections import rebuild_projections
+from app.services.rollups import get_day_rollup
+
+
+def _log_sample_day(client, date):
+    block_id = client.post("/api/blocks/start", json={"date": date, "intent": "Write parser"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": "MEETING"})
+    client.post("/api/blocks/end", json={"blockId": block_id, "actualOutcome": "Half done", "durationMinutes": 50})
+
+    focus_id = client.post("/api/blocks/start", json={"date": date, "intent": "Review PR"}).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": focus_id, "durationMinutes": 35})
+
+    rec_id = client.post("/api/recovery/start", json={"kind": "LUNCH", "date": date}).json()["blockId"]
+    client.post("/api/recovery/end", json={"blockId": rec_id, "durationMinutes": 40})
+
+    kept = client.post("/api/todos", json={"text": "Ship it", "date": date}).json()["todoId"]
+    dropped = client.post("/api/todos", json={"text": "Never mind", "date": date}).json()["todoId"]
+    client.patch(f"/api/todos/{kept}/complete", json={"completionDate": date})
+    client.delete(f"/api/todos/{dropped}")
+    return block_id
+
+
+def test_log_event_maintains_day_projections(session: Session, client):
+    date = "2026-05-04"
+    block_id = _log_sample_day(client, date)
+
+    block = session.get(DayBlock, block_id)
+    assert block.date == date
+    assert block.interrupted is True
+    assert block.reason_code == "MEETING"
+    assert block.duration_minutes == 50
+
+    todos = session.exec(select(DayTodo).where(DayTodo.date == date)).all()
+    assert len(todos) == 2
+    assert sum(1 for t in todos if t.deleted) == 1
+
+
+def test_day_rollup_only_reads_its_date(client):
+    _log_sample_day(client, "2026-05-04")
+    client.post("/api/blocks/start", json={"date": "2026-05-05", "intent": "Other day"})
+
+    data = client.get("/api/days/2026-05-04").json()
+    assert [b["intent"] for b in data["blocks"]] == ["Write parser", "Review PR"]
+    assert data["metrics"]["totalBlocks"] == 2
+    assert data["metrics"]["interruptedBlocks"] == 1
+    assert data["metrics"]["focusBlocks"] == 1
+    assert data["metrics"]["totalActiveMinutes"] == 85
+    assert data["metrics"]["totalRecoveryMinutes"] == 40
+    assert [t["text"] for t in data["todos"]] == ["Ship it"]
+    assert data["metrics"]["todosCompleted"] == 1
+
+    other = client.get("/api/days/2026-05-05").json()
+    assert [b["intent"] for b in other["blocks"]] == ["Other day"]
+    assert other["todos"] == []
+
+
+def test_follow_up_for_unknown_block_is_ignored(session: Session, client):
+    client.post("/api/blocks/end", json={"blockId": "missing", "durationMinutes": 10})
+    assert session.get(DayBlock, "missing") is None
+
+
+def test_rebuild_projections_matches_incremental(session: Session, client):
+    date = "2026-05-04"
+    _log_sample_day(client, date)
+    before = get_day_rollup(session, date)
+
+    replayed = rebuild_projections(session)
+    assert replayed == 11
+
+    after = get_day_rollup(session, date)
+    assert after == before
@@ -0,0 +1,49 @@
+"""
+Tests for the projects dashboard (GET /api/reports/projects).
+Covers: single grouped pass matches per-project metrics, from/to window.
+"""
+from datetime import datetime, timezone
+
+from sqlmodel import Session
+
+from app.services.rollups import _compute_period_metrics
+
+LIFETIME = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+
+
+def _log_block(client, project_id, minutes, date="2026-03-02"):
+    block_id = client.post(
+        "/api/blocks/start", json={"date": date, "intent": "Work", "projectId": project_id}
+    ).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": minutes})
+
+
+def test_dashboard_matches_per_project_metrics(client, session: Session):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    beta = client.post("/api/projects", json={"name": "Beta"}).json()["id"]
+    _log_block(client, alpha, 45)
+    _log_block(client, alpha, 20)
+    _log_block(client, beta, 90)
+    _log_block(client, None, 30)
+
+    items = {item["id"]: item for item in client.get("/api/reports/projects").json()["items"]}
+    assert items[alpha]["metrics"] == _compute_period_metrics(session, *LIFETIME, project_id=alpha, with_blocks=False)
+    assert items[beta]["metrics"] == _compute_period_metrics(session, *LIFETIME, project_id=beta, with_blocks=False)
+    assert "blocks" not in items[alpha]["metrics"]
+    assert items[alpha]["metrics"]["totalBlocks"] == 2
+    assert items[beta]["metrics"]["totalBlocks"] == 1
+
+
+def test_dashboard_window(client):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    _log_block(client, alpha, 45)
+    today = datetime.now(timezone.utc).date().isoformat()
+
+    def total_blocks(params):
+        items = client.get("/api/reports/projects", params=params).json()["items"]
+        return next(i for i in items if i["id"] == alpha)["metrics"]["totalBlocks"]
+
+    assert total_blocks({"from": today, "to": today}) == 1
+    assert total_blocks({"to": "2000-01-01"}) == 0
+    assert total_blocks({"from": "2999-01-01"}) == 0
+    assert client.get("/api/reports/projects", params={"from": "2026-02-01", "to": "2026-01-01"}).status_code == 400
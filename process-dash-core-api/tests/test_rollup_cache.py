@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta
+
+from app.services.events import log_event
+from app.services.rollup_cache import CACHE_HEADER, Invalidation, RollupCache
+
+BYPASS_HEADERS = {CACHE_HEADER: "bypass"}
+
+
+def _get(client, url):
+    resp = client.get(url)
+    assert resp.status_code == 200, resp.text
+    return resp.headers[CACHE_HEADER], resp.json()
+
+
+def _assert_fresh(client, url, cached):
+    fresh = client.get(url, headers=BYPASS_HEADERS)
+    assert fresh.headers[CACHE_HEADER] == "bypass"
+    assert fresh.json() == cached
+
+
+def test_day_rollup_cache_invalidated_by_block_lookup(client):
+    day, other_day = "2024-03-04", "2024-03-05"
+    url, other_url = f"/api/days/{day}", f"/api/days/{other_day}"
+
+    assert _get(client, url)[0] == "miss"
+    assert _get(client, other_url)[0] == "miss"
+    assert _get(client, url)[0] == "hit"
+
+    block_id = client.post("/api/blocks/start", json={"date": day, "intent": "Write"}).json()["blockId"]
+    status, data = _get(client, url)
+    assert status == "miss" and len(data["blocks"]) == 1
+    _assert_fresh(client, url, data)
+
+    # Follow-up events carry only the blockId; the projection row names the day.
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 40})
+    status, data = _get(client, url)
+    assert status == "miss" and data["metrics"]["totalActiveMinutes"] == 40
+    _assert_fresh(client, url, data)
+
+    client.post("/api/intents/daily", json={"date": day, "intents": ["Write"]})
+    status, data = _get(client, url)
+    assert status == "miss" and data["intents"] == ["Write"]
+
+    assert _get(client, other_url)[0] == "hit"
+
+
+def test_day_rollup_cache_follows_todos_and_moved_blocks(client, session):
+    day, next_day = "2024-03-04", "2024-03-05"
+    todo_id = client.post("/api/todos", json={"text": "Ship", "date": day}).json()["todoId"]
+    block_id = client.post("/api/blocks/start", json={"date": day, "intent": "Write"}).json()["blockId"]
+    _get(client, f"/api/days/{day}")
+    _get(client, f"/api/days/{next_day}")
+
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": day})
+    status, data = _get(client, f"/api/days/{day}")
+    assert status == "miss" and data["metrics"]["todosCompleted"] == 1
+
+    # Restarting a block on another day (e.g. from a replayed log) moves it: both days are stale.
+    log_event(session, "intent_block_started", {"blockId": block_id, "date": next_day, "intent": "Write"})
+    for d in (day, next_day):
+        status, data = _get(client, f"/api/days/{d}")
+        assert status == "miss"
+        _assert_fresh(client, f"/api/days/{d}", data)
+    assert _get(client, f"/api/days/{next_day}")[1]["blocks"][0]["blockId"] == block_id
+
+
+def test_sprint_rollup_cache_invalidation(client):
+    today = date.today()
+    current = client.post(
+        "/api/sprints",
+        json={"name": "Now", "startDate": (today - timedelta(days=2)).isoformat(), "durationDays": 7},
+    ).json()
+    past = client.post(
+        "/api/sprints",
+        json={"name": "Past", "startDate": (today - timedelta(days=30)).isoformat(), "durationDays": 7},
+    ).json()
+    url, past_url = f"/api/sprints/{current['id']}/rollup", f"/api/sprints/{past['id']}/rollup"
+    _get(client, url)
+    _get(client, past_url)
+    assert _get(client, url)[0] == "hit"
+
+    # Events logged now land in the current sprint's window only.
+    block_id = client.post("/api/blocks/start", json={"date": today.isoformat(), "intent": "Work"}).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 30})
+    status, data = _get(client, url)
+    assert status == "miss" and data["metrics"]["totalBlocks"] == 1
+    _assert_fresh(client, url, data)
+    assert _get(client, past_url)[0] == "hit"
+
+    story = client.post("/api/stories", json={"sprintId": past["id"], "title": "Story", "storyPoints": 2}).json()
+    status, data = _get(client, past_url)
+    assert status == "miss" and data["stories"]["storiesCommitted"] == 1
+
+    client.patch(f"/api/stories/{story['id']}/status", json={"status": "DONE"})
+    status, data = _get(client, past_url)
+    assert status == "miss" and data["stories"]["pointsDelivered"] == 2
+
+    client.post(
+        f"/api/sprints/{past['id']}/summary",
+        json={"topFragmenters": ["MEETING"], "notPerformanceIssues": [], "oneChangeNextWeek": "x"},
+    )
+    status, data = _get(client, past_url)
+    assert status == "miss" and data["reflection"]["oneChangeNextWeek"] == "x"
+
+    client.patch(f"/api/sprints/{past['id']}", json={"name": "Renamed", "forceRecalculate": True})
+    status, data = _get(client, past_url)
+    assert status == "miss" and data["name"] == "Renamed"
+    _assert_fresh(client, past_url, data)
+    assert _get(client, url)[0] == "hit"
+
+
+def test_project_data_cache_invalidation(client):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    beta = client.post("/api/projects", json={"name": "Beta"}).json()["id"]
+    alpha_url, beta_url = f"/api/reports/projects/{alpha}/data", f"/api/reports/projects/{beta}/data"
+    _get(client, alpha_url)
+    _get(client, beta_url)
+
+    client.post("/api/blocks/start", json={"date": "2024-03-04", "intent": "Work", "projectId": alpha})
+    status, data = _get(client, alpha_url)
+    assert status == "miss" and data["metrics"]["totalBlocks"] == 1
+    _assert_fresh(client, alpha_url, data)
+    assert _get(client, beta_url)[0] == "hit"
+
+    # Completed todos count towards every project.
+    todo_id = client.post("/api/todos", json={"text": "Ship", "date": "2024-03-04"}).json()["todoId"]
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": "2024-03-04"})
+    assert _get(client, beta_url)[0] == "miss"
+
+
+def test_rollup_cache_lru_and_stale_puts():
+    cache = RollupCache(max_size=2)
+    epoch = cache.epoch
+    cache.put(("day", "a"), 1, epoch)
+    cache.put(("day", "b"), 2, epoch)
+    assert cache.get(("day", "a")) == (True, 1)
+    cache.put(("day", "c"), 3, epoch)
+    assert cache.get(("day", "b")) == (False, None)
+    assert cache.get(("day", "a")) == (True, 1)
+
+    window = (datetime(2024, 3, 1), datetime(2024, 3, 8))
+    cache.put(("sprint", "s"), {}, cache.epoch, window)
+    changes = Invalidation()
+    changes.timestamps.add(datetime(2024, 3, 7, 23, 59))
+    assert cache.invalidate(changes) == 1
+
+    # A value computed across an invalidation is not stored.
+    assert cache.put(("day", "d"), 4, epoch) is False
+
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["size"] == 1
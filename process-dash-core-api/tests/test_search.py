@@ -0,0 +1,83 @@
+from app.services.search import rebuild_search_index
+
+
+def _seed(client):
+    alpha = client.post("/api/projects", json={"name": "Alpha"}).json()["id"]
+    sprint = client.post("/api/sprints", json={"name": "Platform sprint", "startDate": "2026-03-02", "durationDays": 14}).json()
+    story = client.post("/api/stories", json={
+        "sprintId": sprint["id"], "title": "Warm the rollup cache", "description": "Precompute sprint rollups",
+    }).json()["id"]
+    block = client.post("/api/blocks/start", json={
+        "date": "2026-03-04", "intent": "Debugging the cache", "notes": "stale entries", "projectId": alpha,
+    }).json()["blockId"]
+    client.post("/api/blocks/end", json={"blockId": block, "actualOutcome": "Found the eviction bug", "durationMinutes": 45})
+    client.post("/api/blocks/start", json={"date": "2026-03-10", "intent": "Write cache docs"})
+    todo = client.post("/api/todos", json={"text": "Ask about cache TTL", "date": "2026-03-05"}).json()["todoId"]
+    client.post("/api/intents/daily", json={"date": "2026-03-04", "intents": ["Fix the cache invalidation"]})
+    client.post(f"/api/sprints/{sprint['id']}/summary", json={
+        "topFragmenters": ["MEETING"], "notPerformanceIssues": [], "oneChangeNextWeek": "Protect mornings",
+    })
+    return alpha, sprint["id"], story, block, todo
+
+
+def _hits(client, **params):
+    resp = client.get("/api/search", params=params)
+    assert resp.status_code == 200, resp.text
+    return [(item["kind"], item["id"]) for item in resp.json()["items"]]
+
+
+def test_search_ranks_highlights_and_filters(client, session):
+    alpha, sprint_id, story, block, todo = _seed(client)
+
+    body = client.get("/api/search", params={"q": "debug"}).json()
+    assert [(i["kind"], i["id"]) for i in body["items"]] == [("block", block)]
+    hit = body["items"][0]
+    assert hit["title"] == "<mark>Debugging</mark> the cache"
+    assert hit["date"] == "2026-03-04" and hit["projectId"] == alpha
+
+    kinds = {kind for kind, _ in _hits(client, q="cache")}
+    assert kinds == {"story", "block", "todo", "intents"}
+    in_range = _hits(client, q="cache", **{"from": "2026-03-04", "to": "2026-03-05"})
+    assert sorted(in_range) == sorted([("block", block), ("todo", todo), ("intents", "2026-03-04")])
+    assert sorted(_hits(client, q="cache", projectId=alpha)) == sorted([("block", block), ("story", story)])
+    assert _hits(client, q="cache", kind="todo") == [("todo", todo)]
+    assert _hits(client, q="eviction bug") == [("block", block)]
+    assert _hits(client, q="protect") == [("sprint_summary", sprint_id)]
+    assert _hits(client, q='"eviction" (bug') == [("block", block)]   # FTS5 syntax is not interpreted
+
+    assert client.get("/api/search", params={"q": "!!"}).status_code == 400
+    assert client.get("/api/search", params={"q": "cache", "kind": "nope"}).status_code == 400
+
+
+def test_search_escapes_indexed_html(client, session):
+    block = client.post("/api/blocks/start", json={
+        "date": "2026-03-04", "intent": "<img src=x onerror=alert(1)> payload", "notes": "a <script>payload</script> & more",
+    }).json()["blockId"]
+
+    hit = client.get("/api/search", params={"q": "payload"}).json()["items"][0]
+    assert hit["id"] == block
+    assert hit["title"] == "&lt;img src=x onerror=alert(1)&gt; <mark>payload</mark>"
+    assert hit["snippet"] == "a &lt;script&gt;<mark>payload</mark>&lt;/script&gt; &amp; more"
+
+
+def test_search_index_follows_edits_and_deletes(client, session):
+    _, sprint_id, story, block, todo = _seed(client)
+
+    client.patch(f"/api/stories/{story}", json={"title": "Shard the event log"})
+    assert _hits(client, q="shard") == [("story", story)]
+    assert ("story", story) not in _hits(client, q="warm")
+
+    client.delete(f"/api/todos/{todo}")
+    client.delete(f"/api/stories/{story}")
+    assert _hits(client, q="ttl") == [] and _hits(client, q="shard") == []
+
+    # A sprint summary is titled after its sprint.
+    client.patch(f"/api/sprints/{sprint_id}", json={"name": "Storage sprint"})
+    assert _hits(client, q="storage") == [("sprint_summary", sprint_id)]
+    assert _hits(client, q="platform") == []
+    assert _hits(client, q="protect") == [("sprint_summary", sprint_id)]
+
+    before = _hits(client, q="cache")
+    rebuild_search_index(session)
+    session.commit()
+    assert sorted(_hits(client, q="cache")) == sorted(before)
@@ -0,0 +1,101 @@
+"""
+Tests for rollup snapshots (app.services.snapshots).
+Covers: snapshot + tail replay matches a full replay, per-project scopes,
+settled blocks, windows the snapshot does not cover.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models import RollupSnapshot
+from app.services.rollups import _compute_period_metrics
+from app.services.snapshots import create_snapshot
+
+LIFETIME = (datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+
+
+def _log_blocks(client, project_id=None, minutes=40, interrupt=False):
+    block_id = client.post(
+        "/api/blocks/start", json={"date": "2026-03-02", "intent": "Work", "projectId": project_id}
+    ).json()["blockId"]
+    if interrupt:
+        client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": "CONTEXT_SWITCH"})
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": minutes})
+    rec_id = client.post("/api/recovery/start", json={"kind": "COFFEE", "date": "2026-03-02"}).json()["blockId"]
+    client.post("/api/recovery/end", json={"blockId": rec_id, "durationMinutes": 10})
+    todo_id = client.post("/api/todos", json={"text": "t", "date": "2026-03-02"}).json()["todoId"]
+    client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": "2026-03-02"})
+
+
+def _metrics(session: Session, project_id=None):
+    return _compute_period_metrics(session, *LIFETIME, project_id=project_id, with_blocks=False)
+
+
+def _full_replay(session: Session, project_id=None):
+    session.exec(delete(RollupSnapshot))
+    session.commit()
+    return _metrics(session, project_id=project_id)
+
+
+def test_snapshot_plus_tail_matches_full_replay(client, session: Session):
+    _log_blocks(client, interrupt=True)
+    _log_blocks(client, project_id="p1", minutes=60)
+    open_block = client.post(
+        "/api/blocks/start", json={"date": "2026-03-02", "intent": "Still going", "projectId": "p1"}
+    ).json()["blockId"]
+
+    snapshot = create_snapshot(session, settle_seconds=0)
+    assert snapshot is not None
+    assert snapshot.event_count > 0
+    # Ended blocks are settled into totals; only the open one keeps its dict.
+    scopes = json.loads(snapshot.state)["scopes"]
+    assert list(scopes[""]["blocks"]) == [open_block] and list(scopes["p1"]["blocks"]) == [open_block]
+    assert scopes[""]["settled"]["blocks"] == 2 and scopes["p1"]["settled"]["blocks"] == 1
+
+    client.post("/api/blocks/interrupt", json={"blockId": open_block, "reasonCode": "MEETING"})
+    client.post("/api/blocks/end", json={"blockId": open_block, "durationMinutes": 35})
+    _log_blocks(client, project_id="p1", minutes=20, interrupt=True)
+    _log_blocks(client)
+
+    from_snapshot = _metrics(session)
+    from_snapshot_p1 = _metrics(session, project_id="p1")
+    assert "blocks" not in from_snapshot
+    assert from_snapshot == _full_replay(session)
+    assert from_snapshot_p1 == _full_replay(session, project_id="p1")
+    assert from_snapshot["totalBlocks"] == 5
+    assert from_snapshot["interruptedBlocks"] == 3
+    assert from_snapshot["totalActiveMinutes"] == 40 + 60 + 35 + 20 + 40
+    assert from_snapshot["todosCompleted"] == 4
+
+
+def test_block_lists_never_start_from_a_snapshot(client, session: Session):
+    _log_blocks(client)
+    create_snapshot(session, settle_seconds=0)
+    _log_blocks(client, minutes=50)
+
+    metrics = _compute_period_metrics(session, *LIFETIME)
+    assert [b["durationMinutes"] for b in metrics["blocks"]] == [40, 50]
+    assert {k: v for k, v in metrics.items() if k != "blocks"} == _metrics(session)
+
+
+def test_create_snapshot_extends_previous_and_keeps_only_latest(client, session: Session):
+    _log_blocks(client)
+    first = create_snapshot(session, settle_seconds=0)
+    _log_blocks(client)
+    second = create_snapshot(session, settle_seconds=0)
+
+    assert second.event_count > first.event_count
+    assert session.exec(select(RollupSnapshot)).all() == [second]
+    assert create_snapshot(session, settle_seconds=0) is None  # nothing new
+
+
+def test_windowed_rollup_ignores_snapshot_outside_window(client, session: Session):
+    _log_blocks(client, minutes=45)
+    create_snapshot(session, settle_seconds=0)
+
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    metrics = _compute_period_metrics(session, future, future + timedelta(days=1), with_blocks=False)
+    assert metrics["totalBlocks"] == 0
+    assert metrics["todosCompleted"] == 0
@@ -118,3 +118,201 @@ def test_sprint_summaries_list(client):
     items = resp.json()["items"]
     assert len(items) == 2
     assert all("sprintId" in i for i in items)
+
+
+def test_sprint_summaries_metrics_match_rollups(client):
+    from datetime import date, timedelta
+
+    today = date.today()
+    project = client.post("/api/projects", json={"name": "Summaries"}).json()["id"]
+    other = client.post("/api/projects", json={"name": "Other"}).json()["id"]
+    current = client.post(
+        "/api/sprints",
+        json={"name": "Now", "startDate": (today - timedelta(days=3)).isoformat(), "durationDays": 7, "projectId": project},
+    ).json()
+    past = client.post(
+        "/api/sprints",
+        json={"name": "Past", "startDate": (today - timedelta(days=30)).isoformat(), "durationDays": 7, "projectId": other},
+    ).json()
+
+    block_id = client.post("/api/blocks/start", json={"date": today.isoformat(), "intent": "Work"}).json()["blockId"]
+    client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": "MEETING"})
+    client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 50})
+
+    for sprint in (current, past):
+        client.post(
+            f"/api/sprints/{sprint['id']}/summary",
+            json={"topFragmenters": [], "notPerformanceIssues": [], "oneChangeNextWeek": "x"},
+        )
+
+    items = {i["sprintId"]: i for i in client.get("/api/sprints/summaries").json()["items"]}
+    for sprint in (current, past):
+        rollup = client.get(f"/api/sprints/{sprint['id']}/rollup").json()
+        assert items[sprint["id"]]["metrics"] == rollup["metrics"]
+    assert items[current["id"]]["metrics"]["totalBlocks"] == 1
+    assert items[past["id"]]["metrics"]["totalBlocks"] == 0
+
+    filtered = client.get("/api/sprints/summaries", params={"projectId": project}).json()["items"]
+    assert [i["sprintId"] for i in filtered] == [current["id"]]
+
+
+def test_closed_sprint_rollup_is_frozen_until_recalculated_or_reopened(client):
+    from datetime import date, timedelta
+
+    today = date.today()
+    sprint = client.post(
+        "/api/sprints",
+        json={"name": "Frozen", "startDate": (today - timedelta(days=2)).isoformat(), "durationDays": 7},
+    ).json()
+    url = f"/api/sprints/{sprint['id']}/rollup"
+
+    def _log_block():
+        block_id = client.post("/api/blocks/start", json={"date": today.isoformat(), "intent": "Work"}).json()["blockId"]
+        client.post("/api/blocks/interrupt", json={"blockId": block_id, "reasonCode": "MEETING"})
+        client.post("/api/blocks/end", json={"blockId": block_id, "durationMinutes": 50})
+
+    _log_block()
+    story = client.post("/api/stories", json={"sprintId": sprint["id"], "title": "Open", "storyPoints": 3}).json()
+    client.post(
+        f"/api/sprints/{sprint['id']}/summary",
+        json={"topFragmenters": ["MEETING"], "notPerformanceIssues": [], "oneChangeNextWeek": "x"},
+    )
+    live = client.get(url).json()
+
+    close = client.post(f"/api/sprints/{sprint['id']}/close").json()
+    assert [s["id"] for s in close["unfinishedStories"]] == [story["id"]]
+    assert client.get(url).json() == live
+
+    # New activity inside the window no longer moves the frozen rollup...
+    _log_block()
+    frozen = client.get(url).json()
+    assert frozen["metrics"] == live["metrics"]
+    assert frozen["metrics"]["topFragmenters"] == live["metrics"]["topFragmenters"]
+    summaries = client.get("/api/sprints/summaries").json()["items"]
+    assert summaries[0]["metrics"] == live["metrics"]
+
+    # ...but carrying stories forward and saving the reflection are reflected.
+    target = client.post(
+        "/api/sprints",
+        json={"name": "Next", "startDate": (today + timedelta(days=5)).isoformat(), "durationDays": 7},
+    ).json()
+    client.post(
+        f"/api/sprints/{sprint['id']}/carry-forward",
+        json={"storyIds": [story["id"]], "targetSprintId": target["id"]},
+    )
+    client.post(
+        f"/api/sprints/{sprint['id']}/summary",
+        json={"topFragmenters": [], "notPerformanceIssues": [], "oneChangeNextWeek": "y"},
+    )
+    frozen = client.get(url).json()
+    assert frozen["metrics"] == live["metrics"]
+    assert frozen["stories"]["storiesCarriedOver"] == 1
+    assert frozen["reflection"]["oneChangeNextWeek"] == "y"
+
+    # Date edits of a frozen sprint need confirmation, and then recompute it.
+    unconfirmed = client.patch(f"/api/sprints/{sprint['id']}", json={"durationDays": 6}).json()
+    assert unconfirmed["requiresConfirmation"] is True
+    client.patch(f"/api/sprints/{sprint['id']}", json={"name": "Frozen 2", "forceRecalculate": True})
+    recalculated = client.get(url).json()
+    assert recalculated["name"] == "Frozen 2"
+    assert recalculated["metrics"]["totalBlocks"] == 2
+
+    reopened = client.post(f"/api/sprints/{sprint['id']}/reopen").json()
+    assert reopened["isClosed"] is False
+    _log_block()
+    assert client.get(url).json()["metrics"]["totalBlocks"] == 3
+    assert client.post("/api/sprints/missing/reopen").status_code == 404
+
+
+def _sprint_with_stories(client, name, start, statuses):
+    sprint = client.post("/api/sprints", json={"name": name, "startDate": start, "durationDays": 7}).json()
+    ids = []
+    for i, status in enumerate(statuses):
+        story = client.post(
+            "/api/stories",
+            json={"sprintId": sprint["id"], "title": f"{name} story {i}", "storyPoints": 3, "tags": ["PSP"]},
+        ).json()
+        if status != "TODO":
+            client.patch(f"/api/stories/{story['id']}/status", json={"status": status})
+        ids.append(story["id"])
+    return sprint["id"], ids
+
+
+def test_close_sprint_carries_unfinished_stories_in_one_transaction(client, session):
+    from sqlalchemy import event
+    from sqlmodel import select
+
+    from app.models import EventLog, SprintStoryState
+
+    sid, ids = _sprint_with_stories(client, "Close", "2026-06-01", ["TODO", "IN_PROGRESS", "DONE", "TODO"])
+    client.delete(f"/api/stories/{ids[3]}")
+    nxt, _ = _sprint_with_stories(client, "Next", "2026-06-08", [])
+    client.get(f"/api/sprints/{sid}/rollup")   # warm the cache
+
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        resp = client.post(f"/api/sprints/{sid}/close", json={"carryForwardTo": nxt})
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["unfinishedStories"] == []
+    assert [s["title"] for s in body["carriedForward"]] == ["Close story 0", "Close story 1"]
+    assert sum(s.startswith("INSERT INTO user_stories") for s in statements) == 1
+    assert sum(s.startswith("UPDATE user_stories") for s in statements) == 1
+    assert sum(s.startswith("INSERT INTO event_log") for s in statements) == 1
+
+    originals = {s["id"]: s["status"] for s in client.get("/api/stories", params={"sprintId": sid}).json()["items"]}
+    assert originals == {ids[0]: "CARRIED_OVER", ids[1]: "CARRIED_OVER", ids[2]: "DONE"}
+    rollup = client.get(f"/api/sprints/{sid}/rollup").json()
+    assert rollup["stories"]["storiesCarriedOver"] == 2
+    assert client.get(f"/api/sprints/{sid}").json()["isClosed"] is True
+    assert len(client.get("/api/stories", params={"sprintId": nxt, "tag": "psp"}).json()["items"]) == 2
+    states = session.exec(select(SprintStoryState).where(SprintStoryState.sprint_id == nxt)).all()
+    assert [(s.status, s.points) for s in states] == [("TODO", 3), ("TODO", 3)]
+    carried = session.exec(select(EventLog).where(EventLog.type == "user_story_carried_forward")).all()
+    assert len(carried) == 2 and all('"storyPoints": 3' in e.payload for e in carried)
+
+    # Already carried stories are not carried again.
+    again = client.post(f"/api/sprints/{sid}/carry-forward", json={"storyIds": ids, "targetSprintId": nxt}).json()
+    assert [s["title"] for s in again["movedStories"]] == ["Close story 2"]
+
+
+def test_carry_forward_all_unfinished_is_atomic(client, session, monkeypatch):
+    import pytest
+
+    import app.routers.sprints as sprints_router
+
+    sid, ids = _sprint_with_stories(client, "Src", "2026-07-01", ["TODO", "DONE", "IN_PROGRESS"])
+    nxt, _ = _sprint_with_stories(client, "Dst", "2026-07-08", [])
+
+    def _fail(session, events):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(sprints_router, "log_events", _fail)
+    with pytest.raises(RuntimeError):
+        client.post(f"/api/sprints/{sid}/carry-forward", json={"allUnfinished": True, "targetSprintId": nxt})
+    session.rollback()
+    monkeypatch.undo()
+    statuses = [s["status"] for s in client.get("/api/stories", params={"sprintId": sid}).json()["items"]]
+    assert statuses == ["TODO", "DONE", "IN_PROGRESS"]
+    assert client.get("/api/stories", params={"sprintId": nxt}).json()["items"] == []
+
+    assert client.get(f"/api/sprints/{sid}/rollup").json()["stories"]["storiesCarriedOver"] == 0
+    resp = client.post(f"/api/sprints/{sid}/carry-forward", json={"allUnfinished": True, "targetSprintId": nxt})
+    assert resp.json()["count"] == 2
+    assert client.get(f"/api/sprints/{sid}/rollup").json()["stories"]["storiesCarriedOver"] == 2
+    assert [s["status"] for s in client.get("/api/stories", params={"sprintId": sid}).json()["items"]] == [
+        "CARRIED_OVER", "DONE", "CARRIED_OVER",
+    ]
+
+    assert client.post(f"/api/sprints/{sid}/carry-forward", json={"targetSprintId": nxt}).status_code == 400
+    assert client.post(
+        f"/api/sprints/{sid}/carry-forward", json={"allUnfinished": True, "targetSprintId": sid}
+    ).status_code == 400
@@ -0,0 +1,23 @@
+import pytest
+from sqlmodel import Session, create_engine
+
+from app.db import apply_sqlite_pragmas, read_sqlite_pragmas
+from app.settings import Settings
+
+
+def test_performance_profile_applies_pragmas_per_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'workobs.sqlite'}")
+    apply_sqlite_pragmas(engine, Settings(WORKOBS_SQLITE_BUSY_TIMEOUT_MS=1234).sqlite_pragmas)
+
+    with Session(engine) as session:
+        active = read_sqlite_pragmas(session, ["journal_mode", "synchronous", "busy_timeout", "temp_store"])
+    assert active == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 1234, "temp_store": 2}
+
+
+def test_default_profile_leaves_sqlite_defaults():
+    assert Settings(WORKOBS_SQLITE_PROFILE="default").sqlite_pragmas == {}
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(RuntimeError):
+        Settings(WORKOBS_SQLITE_PROFILE="turbo").sqlite_pragmas
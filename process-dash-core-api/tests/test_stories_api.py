@@ -118,6 +118,48 @@ def test_list_stories_filter_by_status(client):
     assert len(resp_todo.json()["items"]) == 0
 
 
+def test_list_stories_filter_by_tags_and_facets(client):
+    sprint = _create_sprint(client, name="Sprint Tags", start="2026-10-15")
+    nxt = _create_sprint(client, name="Sprint Tags 2", start="2026-10-29")
+
+    def story(title, tags):
+        return client.post(
+            "/api/stories", json={"sprintId": sprint["id"], "title": title, "tags": tags}
+        ).json()["id"]
+
+    both = story("Both", ["PSP", "tsp"])
+    psp = story("PSP only", ["psp "])
+    story("Untagged", None)
+    retagged = story("Retagged", ["TSP"])
+    client.patch(f"/api/stories/{retagged}", json={"tags": ["Ops"]})
+
+    def titles(**params):
+        resp = client.get("/api/stories", params={"sprintId": sprint["id"], **params})
+        assert resp.status_code == 200, resp.text
+        return [i["title"] for i in resp.json()["items"]]
+
+    assert titles(tag="psp") == ["Both", "PSP only"]
+    assert titles(tag=["TSP", "ops"]) == ["Both", "Retagged"]
+    assert titles(tag=["psp", "tsp"], tagMode="all") == ["Both"]
+    assert client.get("/api/stories", params={"tag": "psp", "tagMode": "some"}).status_code == 400
+    everything = titles()
+    assert len(everything) == 4
+    assert titles(tag="") == everything
+    assert titles(tag=["  ", ""], tagMode="all") == everything
+    assert titles(tag=["", "PSP "]) == ["Both", "PSP only"]
+
+    facets = client.get("/api/stories/tags", params={"sprintId": sprint["id"]}).json()["items"]
+    assert facets == [{"tag": "psp", "count": 2}, {"tag": "ops", "count": 1}, {"tag": "tsp", "count": 1}]
+
+    # Carried-forward copies are tagged too; deleted stories drop out of facets.
+    client.post(f"/api/sprints/{sprint['id']}/carry-forward", json={"storyIds": [psp], "targetSprintId": nxt["id"]})
+    client.delete(f"/api/stories/{both}")
+    assert client.get("/api/stories", params={"sprintId": nxt["id"], "tag": "PSP"}).json()["items"][0]["title"] == "PSP only"
+    assert client.get("/api/stories/tags").json()["items"] == [
+        {"tag": "psp", "count": 2}, {"tag": "ops", "count": 1},
+    ]
+
+
 # ── Update ─────────────────────────────────────────────────────────────────────
 
 def test_update_story_fields(client):
@@ -0,0 +1,84 @@
+from sqlmodel import select
+
+from app.models import EventLog, SprintStoryState
+
+
+def _sprint(client, name="Sprint 1", start="2026-06-09"):
+    return client.post("/api/sprints", json={"name": name, "startDate": start, "durationDays": 14}).json()["id"]
+
+
+def _event_count(session, event_type):
+    return len(session.exec(select(EventLog).where(EventLog.type == event_type)).all())
+
+
+def test_bulk_import_creates_and_updates_in_one_batch(client, session):
+    sid = _sprint(client)
+    other = _sprint(client, name="Sprint 2", start="2026-06-23")
+    existing = client.post("/api/stories", json={"sprintId": sid, "title": "Old title", "storyPoints": 3}).json()
+
+    resp = client.post(f"/api/stories/bulk?sprintId={sid}", json={"stories": [
+        {"title": "Import A", "storyPoints": 5, "tags": ["PSP", "backend"]},
+        {"title": "Import B", "sprintId": other, "tags": ["tsp"]},
+        {"id": existing["id"], "title": "New title", "storyPoints": 8, "status": "IN_PROGRESS", "tags": ["psp"]},
+    ]})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert (body["count"], body["created"], body["updated"], body["unchanged"]) == (3, 2, 1, 0)
+    assert [item["action"] for item in body["items"]] == ["created", "created", "updated"]
+    assert body["items"][2]["id"] == existing["id"]
+
+    stories = {s["title"]: s for s in client.get("/api/stories", params={"sprintId": sid}).json()["items"]}
+    assert stories["Import A"]["storyPoints"] == 5 and stories["New title"]["status"] == "IN_PROGRESS"
+    assert client.get("/api/stories", params={"sprintId": other}).json()["items"][0]["title"] == "Import B"
+    tagged = client.get("/api/stories", params={"tag": "psp"}).json()["items"]
+    assert {s["title"] for s in tagged} == {"Import A", "New title"}
+
+    assert _event_count(session, "user_story_created") == 3
+    assert _event_count(session, "user_story_points_changed") == 1
+    assert _event_count(session, "user_story_status_changed") == 1
+    current = session.exec(
+        select(SprintStoryState).where(SprintStoryState.sprint_id == sid).where(SprintStoryState.valid_to == None)  # noqa: E711
+    ).all()
+    assert sorted((s.status, s.points) for s in current) == [("IN_PROGRESS", 8), ("TODO", 5)]
+
+
+def test_bulk_import_streams_csv(client):
+    sid = _sprint(client)
+    csv_body = (
+        "﻿title,storyPoints,tags,acceptanceCriteria\n"
+        'Café login,3,"psp; ux","Given a user\nWhen they log in\nThen it works"\n'
+        "\n"
+        "Export report,,reports,\n"
+    ).encode()
+
+    def chunks():
+        for start in range(0, len(csv_body), 7):   # splits quoted cells and the é
+            yield csv_body[start:start + 7]
+
+    resp = client.post(
+        "/api/stories/bulk", params={"sprintId": sid}, content=chunks(), headers={"Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["created"] == 2
+
+    stories = {s["title"]: s for s in client.get("/api/stories", params={"sprintId": sid}).json()["items"]}
+    assert stories["Café login"]["tags"] == ["psp", "ux"]
+    assert stories["Café login"]["acceptanceCriteria"] == "Given a user\nWhen they log in\nThen it works"
+    assert stories["Export report"]["storyPoints"] is None
+
+
+def test_bulk_import_is_all_or_nothing(client, session):
+    sid = _sprint(client)
+    resp = client.post("/api/stories/bulk", json={"stories": [
+        {"sprintId": sid, "title": "Fine"},
+        {"sprintId": sid, "title": "Bad points", "storyPoints": 4},
+        {"sprintId": "missing", "title": "No sprint"},
+        {"id": "missing", "title": "No story"},
+    ]})
+    assert resp.status_code == 422
+    assert [e["index"] for e in resp.json()["detail"]] == [1, 2, 3]
+    assert client.get("/api/stories").json()["items"] == []
+    assert _event_count(session, "user_story_created") == 0
+
+    assert client.post("/api/stories/bulk", json={"stories": []}).status_code == 400
+    assert client.post("/api/stories/bulk", content=b"x", headers={"Content-Type": "text/plain"}).status_code == 415
@@ -0,0 +1,48 @@
+def _todo(client, text, day, completed_on=None):
+    todo_id = client.post("/api/todos", json={"text": text, "date": day}).json()["todoId"]
+    if completed_on:
+        client.patch(f"/api/todos/{todo_id}/complete", json={"completionDate": completed_on})
+    return todo_id
+
+
+def test_todos_for_date_come_from_projection(client):
+    first = _todo(client, "First", "2026-05-04")
+    second = _todo(client, "Second", "2026-05-04", completed_on="2026-05-05")
+    gone = _todo(client, "Gone", "2026-05-04")
+    _todo(client, "Elsewhere", "2026-05-05")
+    client.delete(f"/api/todos/{gone}")
+
+    todos = client.get("/api/todos/2026-05-04").json()["todos"]
+    assert [t["todoId"] for t in todos] == [first, second]
+    assert todos[1]["completed"] is True and todos[1]["completionDate"] == "2026-05-05"
+    assert client.get("/api/todos", params={"from": "2026-05-04", "to": "2026-05-04"}).json()["todos"] == todos
+    assert client.get("/api/todos/not-a-date").json() == {"date": "not-a-date", "todos": []}
+
+
+def test_list_todos_pages_and_filters(client):
+    a = _todo(client, "A", "2026-05-03")
+    b = _todo(client, "B", "2026-05-04", completed_on="2026-05-04")
+    c = _todo(client, "C", "2026-05-04")
+    d = _todo(client, "D", "2026-05-05")
+    client.delete(f"/api/todos/{_todo(client, 'Deleted', '2026-05-05')}")
+
+    everything = client.get("/api/todos").json()
+    assert [t["todoId"] for t in everything["todos"]] == [d, b, c, a]
+    assert everything["nextCursor"] is None
+
+    seen, after = [], None
+    while True:
+        page = client.get("/api/todos", params={"limit": 3, **({"after": after} if after else {})}).json()
+        seen.extend(t["todoId"] for t in page["todos"])
+        after = page["nextCursor"]
+        if after is None:
+            break
+    assert seen == [d, b, c, a]
+
+    open_todos = client.get("/api/todos", params={"completed": "false", "from": "2026-05-04"}).json()["todos"]
+    assert [t["todoId"] for t in open_todos] == [d, c]
+    done = client.get("/api/todos", params={"completed": "true"}).json()["todos"]
+    assert [t["todoId"] for t in done] == [b]
+
+    assert client.get("/api/todos", params={"after": "bogus"}).status_code == 400
+    assert client.get("/api/todos", params={"from": "2026-05-05", "to": "2026-05-04"}).status_code == 400
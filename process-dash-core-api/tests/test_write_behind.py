@@ -0,0 +1,117 @@
+"""
+Tests for the group-commit write-behind queue.
+Covers: batching under concurrency, durability on return, inline fallback, failure isolation.
+"""
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models import DayBlock, EventLog, SprintDefinition
+from app.services.events import log_event
+from app.services.write_behind import start_writer, stop_writer
+
+
+@pytest.fixture(name="file_engine")
+def file_engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'workobs.sqlite'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    writer = start_writer(engine, flush_interval_ms=5, max_batch_size=64)
+    yield engine, writer
+    stop_writer(engine)
+    engine.dispose()
+
+
+def _count_events(engine) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(EventLog)).one()
+
+
+def test_concurrent_writers_share_commits(file_engine):
+    engine, writer = file_engine
+
+    def worker(n: int):
+        with Session(engine) as session:
+            for i in range(25):
+                block_id = f"b-{n}-{i}"
+                evt = log_event(session, "intent_block_started", {"blockId": block_id, "date": "2026-05-04"})
+                assert evt.id  # durable and assigned on return
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _count_events(engine) == 200
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(DayBlock)).one() == 200
+
+    stats = writer.stats()
+    assert stats["events"] == 200
+    assert stats["batches"] < 200
+    assert stats["maxBatchSize"] > 1
+    assert stats["avgFlushMs"] > 0
+
+
+def test_session_with_pending_changes_commits_inline(file_engine):
+    engine, writer = file_engine
+
+    with Session(engine) as session:
+        sprint = SprintDefinition(name="S", start_date=date(2026, 5, 4), end_date=date(2026, 5, 10), duration_days=7)
+        sprint_id = sprint.id
+        session.add(sprint)
+        log_event(session, "sprint_closed", {"sprintId": sprint_id})
+
+    assert writer.stats()["events"] == 0
+    with Session(engine) as session:
+        assert session.get(SprintDefinition, sprint_id) is not None
+    assert _count_events(engine) == 1
+
+
+def test_flushed_changes_commit_inline_with_their_event(file_engine):
+    engine, writer = file_engine
+    with Session(engine) as session:
+        log_event(session, "todo_deleted", {"todoId": "t"}, local_id="dup")
+    events_before = writer.stats()["events"]
+
+    with Session(engine) as session:
+        sprint = SprintDefinition(name="S", start_date=date(2026, 5, 4), end_date=date(2026, 5, 10), duration_days=7)
+        sprint_id = sprint.id
+        session.add(sprint)
+        session.flush()
+        with pytest.raises(IntegrityError):
+            log_event(session, "sprint_closed", {"sprintId": sprint_id}, local_id="dup")
+        session.rollback()
+
+    assert writer.stats()["events"] == events_before
+    with Session(engine) as session:
+        assert session.get(SprintDefinition, sprint_id) is None
+    assert _count_events(engine) == 1
+
+
+def test_failed_event_does_not_fail_its_batch(file_engine):
+    engine, writer = file_engine
+    with Session(engine) as session:
+        log_event(session, "todo_deleted", {"todoId": "t"}, local_id="dup")
+
+    errors = []
+
+    def worker(local_id):
+        with Session(engine) as session:
+            try:
+                log_event(session, "todo_deleted", {"todoId": "t"}, local_id=local_id)
+            except IntegrityError as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(lid,)) for lid in ["dup", "a", "b", "c"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 1
+    assert _count_events(engine) == 4
+    assert writer.stats()["failedEvents"] == 1
@@ -52,6 +52,10 @@ def get_day(date: str) -> dict:
     return _get(f"/days/{date}")
 
 
+def get_days_range(from_date: str, to_date: str) -> dict:
+    return _get("/days", {"from": from_date, "to": to_date})
+
+
 # ── Daily intents ──────────────────────────────────────────────────────────────
 
 def set_intents(date: str, intents: list[str]) -> dict:
@@ -337,8 +341,13 @@ def update_project_config(project_id: str, default_sprint_duration_days: int = N
     return _patch(f"/projects/{project_id}/config", body)
 
 
-def get_projects_dashboard() -> dict:
-    return _get("/reports/projects")
+def get_projects_dashboard(from_date: str = None, to_date: str = None) -> dict:
+    params = {}
+    if from_date:
+        params["from"] = from_date
+    if to_date:
+        params["to"] = to_date
+    return _get("/reports/projects", params)
 
 
 def get_project_report(project_id: str) -> dict:
@@ -404,14 +413,50 @@ def tag_story(story_id: str, tags: list) -> dict:
     return _patch(f"/stories/{story_id}", {"tags": tags})
 
 
-def close_sprint(sprint_id: str) -> dict:
-    """Mark a sprint as closed. Returns unfinished stories."""
-    return _post(f"/sprints/{sprint_id}/close", {})
+def close_sprint(sprint_id: str, carry_forward_to: str = None) -> dict:
+    """Mark a sprint as closed. Returns unfinished stories, or carries them all to carry_forward_to."""
+    return _post(f"/sprints/{sprint_id}/close", {"carryForwardTo": carry_forward_to} if carry_forward_to else {})
+
+
+def reopen_sprint(sprint_id: str) -> dict:
+    """Reopen a closed sprint so its rollup is recomputed from the log again."""
+    return _post(f"/sprints/{sprint_id}/reopen", {})
 
 
-def carry_forward_stories(sprint_id: str, story_ids: list, target_sprint_id: str) -> dict:
-    """Copy selected stories to a target sprint and mark originals CARRIED_OVER."""
+def carry_forward_stories(
+    sprint_id: str,
+    story_ids: list = None,
+    target_sprint_id: str = None,
+    all_unfinished: bool = False,
+) -> dict:
+    """Copy selected (or all unfinished) stories to a target sprint and mark originals CARRIED_OVER."""
     return _post(f"/sprints/{sprint_id}/carry-forward", {
-        "storyIds": story_ids,
+        "storyIds": story_ids or [],
+        "allUnfinished": all_unfinished,
         "targetSprintId": target_sprint_id,
     })
+
+
+# ── Search ─────────────────────────────────────────────────────────────────────
+
+def search(
+    query: str,
+    from_date: str = None,
+    to_date: str = None,
+    project_id: str = None,
+    kinds: list = None,
+    limit: int = None,
+) -> dict:
+    """Full-text search over stories, blocks, todos, intents and sprint summaries."""
+    params = {"q": query}
+    if from_date:
+        params["from"] = from_date
+    if to_date:
+        params["to"] = to_date
+    if project_id:
+        params["projectId"] = project_id
+    if kinds:
+        params["kind"] = kinds
+    if limit:
+        params["limit"] = limit
+    return _get("/search", params)
@@ -50,6 +50,22 @@ TOOLS = [
             "required": ["date"],
         },
     ),
+    types.Tool(
+        name="get_days_range",
+        description=(
+            "Fetch day rollups for every date in an inclusive range (max 366 days) in one call, "
+            "plus totals for the range. Each day has the same shape as get_day. "
+            "Use this for week or month questions instead of calling get_day per day."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fromDate": {"type": "string", "description": "First date, YYYY-MM-DD"},
+                "toDate": {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD"},
+            },
+            "required": ["fromDate", "toDate"],
+        },
+    ),
     types.Tool(
         name="set_intents",
         description=(
@@ -340,12 +356,28 @@ TOOLS = [
         name="close_sprint",
         description=(
             "Mark a sprint as closed. Returns the list of unfinished stories "
-            "so you can offer to carry them forward with carry_forward_stories."
+            "so you can offer to carry them forward with carry_forward_stories. "
+            "Pass carryForwardTo only when the user asked to move every unfinished story."
         ),
         inputSchema={
             "type": "object",
             "properties": {
                 "sprintId": {"type": "string", "description": "UUID of the sprint to close"},
+                "carryForwardTo": {"type": "string", "description": "Sprint UUID to carry all unfinished stories to (optional)"},
+            },
+            "required": ["sprintId"],
+        },
+    ),
+    types.Tool(
+        name="reopen_sprint",
+        description=(
+            "Reopen a closed sprint. A closed sprint's rollup is frozen at close; "
+            "reopening drops that snapshot so its metrics follow new activity again."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sprintId": {"type": "string", "description": "UUID of the sprint to reopen"},
             },
             "required": ["sprintId"],
         },
@@ -353,7 +385,8 @@ TOOLS = [
     types.Tool(
         name="carry_forward_stories",
         description=(
-            "Move a list of stories from a closed sprint to a target sprint. "
+            "Move a list of stories (or, with allUnfinished, every TODO / IN_PROGRESS story) "
+            "from a closed sprint to a target sprint. "
             "Originals are marked CARRIED_OVER; fresh TODO copies appear in the target sprint. "
             "Always call close_sprint first, then offer this to the user."
         ),
@@ -362,9 +395,10 @@ TOOLS = [
             "properties": {
                 "sprintId":       {"type": "string", "description": "Source sprint UUID"},
                 "storyIds":       {"type": "array", "items": {"type": "string"}, "description": "Story UUIDs to carry forward"},
+                "allUnfinished":  {"type": "boolean", "description": "Carry every unfinished story instead of storyIds"},
                 "targetSprintId": {"type": "string", "description": "Destination sprint UUID"},
             },
-            "required": ["sprintId", "storyIds", "targetSprintId"],
+            "required": ["sprintId", "targetSprintId"],
         },
     ),
     types.Tool(
@@ -450,8 +484,17 @@ TOOLS = [
     ),
     types.Tool(
         name="get_projects_dashboard",
-        description="Get a summary dashboard of all projects — useful for understanding overall project health and activity.",
-        inputSchema={"type": "object", "properties": {}},
+        description=(
+            "Get a summary dashboard of all projects — useful for understanding overall project health and activity. "
+            "Lifetime by default; pass fromDate/toDate to limit it to a date window."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fromDate": {"type": "string", "description": "First date, YYYY-MM-DD (optional)"},
+                "toDate": {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD (optional)"},
+            },
+        },
     ),
     types.Tool(
         name="get_project_report",
@@ -707,6 +750,30 @@ TOOLS = [
             "required": ["sprintId", "taskId"],
         },
     ),
+    types.Tool(
+        name="search",
+        description=(
+            "Full-text search across stories, focus blocks (intent, notes, outcome), todos, daily intents "
+            "and sprint summaries. Returns the best matches first with highlighted snippets — use it to find "
+            "when something was worked on before fetching the day or sprint."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query":     {"type": "string", "description": "Words to look for; the last word also matches as a prefix"},
+                "fromDate":  {"type": "string", "description": "First date, YYYY-MM-DD (optional)"},
+                "toDate":    {"type": "string", "description": "Last date (inclusive), YYYY-MM-DD (optional)"},
+                "projectId": {"type": "string", "description": "UUID of a project to search within (optional)"},
+                "kinds": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["story", "block", "todo", "intents", "sprint_summary"]},
+                    "description": "Only these kinds of record (optional)",
+                },
+                "limit": {"type": "integer", "description": "Max results, 1-100 (default 20)"},
+            },
+            "required": ["query"],
+        },
+    ),
 ]
 
 
@@ -732,6 +799,9 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
             case "get_day":
                 return _ok(api.get_day(arguments["date"]))
 
+            case "get_days_range":
+                return _ok(api.get_days_range(arguments["fromDate"], arguments["toDate"]))
+
             case "set_intents":
                 return _ok(api.set_intents(arguments["date"], arguments["intents"]))
 
@@ -837,13 +907,20 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
                 ))
 
             case "close_sprint":
-                return _ok(api.close_sprint(sprint_id=arguments["sprintId"]))
+                return _ok(api.close_sprint(
+                    sprint_id=arguments["sprintId"],
+                    carry_forward_to=arguments.get("carryForwardTo"),
+                ))
+
+            case "reopen_sprint":
+                return _ok(api.reopen_sprint(sprint_id=arguments["sprintId"]))
 
             case "carry_forward_stories":
                 return _ok(api.carry_forward_stories(
                     sprint_id=arguments["sprintId"],
-                    story_ids=arguments["storyIds"],
+                    story_ids=arguments.get("storyIds"),
                     target_sprint_id=arguments["targetSprintId"],
+                    all_unfinished=arguments.get("allUnfinished", False),
                 ))
 
             case "complete_todo":
@@ -868,7 +945,10 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
                 ))
 
             case "get_projects_dashboard":
-                return _ok(api.get_projects_dashboard())
+                return _ok(api.get_projects_dashboard(
+                    from_date=arguments.get("fromDate"),
+                    to_date=arguments.get("toDate"),
+                ))
 
             case "get_project_report":
                 return _ok(api.get_project_report(project_id=arguments["projectId"]))
@@ -993,6 +1073,16 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
                     task_id=arguments["taskId"],
                 ))
 
+            case "search":
+                return _ok(api.search(
+                    query=arguments["query"],
+                    from_date=arguments.get("fromDate"),
+                    to_date=arguments.get("toDate"),
+                    project_id=arguments.get("projectId"),
+                    kinds=arguments.get("kinds"),
+                    limit=arguments.get("limit"),
+                ))
+
             case _:
                 return _err(f"Unknown tool: {name}")
 
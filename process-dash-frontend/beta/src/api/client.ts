@@ -55,6 +55,13 @@ export type DayRollup = {
     todos: Todo[];
 };
 
+export type DaysRange = {
+    from: string;
+    to: string;
+    days: DayRollup[];
+    totals: DayMetrics & { totalActiveMinutes: number; totalRecoveryMinutes: number };
+};
+
 export type WeeklySummaryRequest = {
     topFragmenters: string[];
     notPerformanceIssues: string[];
@@ -135,6 +142,15 @@ export type UserStoryListResponse = {
     items: UserStory[];
 };
 
+export type StoryImportResult = {
+    ok: boolean;
+    count: number;
+    created: number;
+    updated: number;
+    unchanged: number;
+    items: { index: number; action: "created" | "updated" | "unchanged"; id: string; title: string }[];
+};
+
 export type SprintListResponse = {
     items: SprintDefinition[];
 };
@@ -194,6 +210,29 @@ export type FinancialYearListResponse = {
     items: FinancialYear[];
 };
 
+export type SprintBurndownDay = {
+    date: string;
+    scopePoints: number | null;
+    scopeStories: number | null;
+    remainingPoints: number | null;
+    remainingStories: number | null;
+    completedPoints: number | null;
+    completedStories: number | null;
+};
+
+export type SprintBurndown = {
+    sprintId: string;
+    startDate: string;
+    endDate: string;
+    days: SprintBurndownDay[];
+    scopeChanges: { date: string; storyId: string; change: "added" | "removed" | "reestimated"; pointsDelta: number }[];
+};
+
+export type ProjectBlocksPage = {
+    items: Block[];
+    nextCursor: string | null;
+};
+
 export type SprintTask = {
     id: string;
     sprintId: string;
@@ -254,8 +293,14 @@ export const api = {
 
     reports: {
         getDay: (date: string) => fetchJson<DayRollup>(`/days/${date}`),
+        getDaysRange: (from: string, to: string) =>
+            fetchJson<DaysRange>(`/days?from=${encodeURIComponent(from)}&to=${encodeURIComponent(to)}`),
         getProjectsDashboard: () => fetchJson<{ items: any[] }>("/reports/projects"),
-        getProjectData: (projectId: string) => fetchJson<any>(`/reports/projects/${projectId}/data`),
+        getProjectData: (projectId: string) => fetchJson<any>(`/reports/projects/${projectId}/data?version=2`),
+        getProjectBlocks: (projectId: string, after?: string | null) =>
+            fetchJson<ProjectBlocksPage>(
+                `/reports/projects/${projectId}/blocks${after ? `?after=${encodeURIComponent(after)}` : ""}`
+            ),
     },
 
     sprints: {
@@ -284,6 +329,7 @@ export const api = {
                 }
             ),
         getRollup: (sprintId: string) => fetchJson<SprintRollup>(`/sprints/${sprintId}/rollup`),
+        getBurndown: (sprintId: string) => fetchJson<SprintBurndown>(`/sprints/${sprintId}/burndown`),
         saveSummary: (sprintId: string, data: WeeklySummaryRequest) =>
             fetchJson(`/sprints/${sprintId}/summary`, {
                 method: "POST",
@@ -291,18 +337,22 @@ export const api = {
                 body: JSON.stringify(data),
             }),
         getSummaries: () => fetchJson<SprintSummaryListResponse>("/sprints/summaries"),
-        close: (sprintId: string) =>
-            fetchJson<{ ok: boolean; sprintId: string; unfinishedStories: UserStory[] }>(
+        close: (sprintId: string, carryForwardTo?: string) =>
+            fetchJson<{ ok: boolean; sprintId: string; unfinishedStories: UserStory[]; carriedForward: UserStory[] }>(
                 `/sprints/${sprintId}/close`,
-                { method: "POST", headers: { "Content-Type": "application/json" }, body: "{}" }
+                {
+                    method: "POST",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify(carryForwardTo ? { carryForwardTo } : {}),
+                }
             ),
-        carryForward: (sprintId: string, storyIds: string[], targetSprintId: string) =>
+        carryForward: (sprintId: string, storyIds: string[], targetSprintId: string, allUnfinished = false) =>
             fetchJson<{ ok: boolean; movedStories: UserStory[]; count: number }>(
                 `/sprints/${sprintId}/carry-forward`,
                 {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify({ storyIds, targetSprintId }),
+                    body: JSON.stringify({ storyIds, targetSprintId, allUnfinished }),
                 }
             ),
     },
@@ -469,6 +519,13 @@ export const api = {
             const q = qs.toString();
             return fetchJson<UserStoryListResponse>(`/stories${q ? `?${q}` : ""}`);
         },
+        tags: (params?: { sprintId?: string; projectId?: string }) => {
+            const qs = new URLSearchParams();
+            if (params?.sprintId) qs.set("sprintId", params.sprintId);
+            if (params?.projectId) qs.set("projectId", params.projectId);
+            const q = qs.toString();
+            return fetchJson<{ items: { tag: string; count: number }[] }>(`/stories/tags${q ? `?${q}` : ""}`);
+        },
         create: (data: {
             sprintId: string;
             projectId?: string;
@@ -483,6 +540,12 @@ export const api = {
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify(data),
             }),
+        bulk: (stories: Record<string, unknown>[] | string, sprintId?: string) =>
+            fetchJson<StoryImportResult>(`/stories/bulk${sprintId ? `?sprintId=${encodeURIComponent(sprintId)}` : ""}`, {
+                method: "POST",
+                headers: { "Content-Type": typeof stories === "string" ? "text/csv" : "application/json" },
+                body: typeof stories === "string" ? stories : JSON.stringify({ stories }),
+            }),
         update: (storyId: string, data: {
             title?: string;
             description?: string;
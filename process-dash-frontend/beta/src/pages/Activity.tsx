@@ -118,21 +118,17 @@ export default function Activity() {
         setDayRollups({});
 
         try {
-            const dates = getDaysArray(startDate, endDate);
-
-            // Fetch GitHub activity & daily rollups in parallel
-            const [gitRes, ...rollupsRes] = await Promise.all([
+            // Fetch GitHub activity & the day rollups for the whole range in parallel
+            const [gitRes, rangeRes] = await Promise.all([
                 api.projects.getGithubActivity(selectedProjectId, startDate, endDate),
-                ...dates.map(d => api.reports.getDay(d).catch(() => null))
+                api.reports.getDaysRange(startDate, endDate).catch(() => null),
             ]);
 
             setGithubData(gitRes);
 
             const rollupMap: Record<string, any> = {};
-            dates.forEach((d, idx) => {
-                if (rollupsRes[idx]) {
-                    rollupMap[d] = rollupsRes[idx];
-                }
+            rangeRes?.days.forEach(day => {
+                rollupMap[day.date] = day;
             });
             setDayRollups(rollupMap);
 
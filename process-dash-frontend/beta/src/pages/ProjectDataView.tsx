@@ -15,16 +15,35 @@ import {
 export default function ProjectDataView() {
     const { id } = useParams<{ id: string }>();
     const [data, setData] = useState<any>(null);
+    const [blocks, setBlocks] = useState<Block[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         if (!id) return;
-        api.reports.getProjectData(id)
-            .then(setData)
+        Promise.all([api.reports.getProjectData(id), api.reports.getProjectBlocks(id)])
+            .then(([projectData, page]) => {
+                setData(projectData);
+                setBlocks(page.items);
+                setNextCursor(page.nextCursor);
+            })
             .catch(console.error)
             .finally(() => setLoading(false));
     }, [id]);
 
+    const loadMore = () => {
+        if (!id || !nextCursor) return;
+        setLoadingMore(true);
+        api.reports.getProjectBlocks(id, nextCursor)
+            .then((page) => {
+                setBlocks((prev) => [...prev, ...page.items]);
+                setNextCursor(page.nextCursor);
+            })
+            .catch(console.error)
+            .finally(() => setLoadingMore(false));
+    };
+
     if (loading) return <Loading text="Loading project data…" />;
     if (!data || !data.id) return (
         <div style={{ padding: "28px 32px", maxWidth: 960, margin: "0 auto" }}>
@@ -32,8 +51,8 @@ export default function ProjectDataView() {
         </div>
     );
 
-    // Group blocks by date
-    const blocksByDate = data.blocks.reduce((acc: any, b: Block) => {
+    // Group the loaded pages of blocks by date
+    const blocksByDate = blocks.reduce((acc: any, b: Block) => {
         if (!acc[b.date]) acc[b.date] = [];
         acc[b.date].push(b);
         return acc;
@@ -189,6 +208,13 @@ export default function ProjectDataView() {
                                 </div>
                             </div>
                         ))}
+                        {nextCursor && (
+                            <div style={{ display: "flex", justifyContent: "center" }}>
+                                <Button variant="ghost" size="sm" onClick={loadMore} disabled={loadingMore}>
+                                    {loadingMore ? "Loading…" : "Load more"}
+                                </Button>
+                            </div>
+                        )}
                     </div>
                 )}
             </Section>
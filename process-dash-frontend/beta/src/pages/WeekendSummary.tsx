@@ -67,10 +67,8 @@ export default function WeekendSummary() {
             const weekRes = await api.sprints.getRollup(sprintId);
             setWeekData(weekRes);
 
-            const dates = getDatesInRange(weekRes.startDate, weekRes.endDate);
-            const dayPromises = dates.map(d => api.reports.getDay(d).catch(() => null));
-            const days = (await Promise.all(dayPromises)).filter(d => d !== null) as DayRollup[];
-            setDaysData(days);
+            const range = await api.reports.getDaysRange(weekRes.startDate, weekRes.endDate);
+            setDaysData(range.days);
         } catch (e) {
             console.error(e);
         } finally {
@@ -441,24 +439,3 @@ export default function WeekendSummary() {
         </div>
     );
 }
-
-function getDatesInRange(startDate: string, endDate: string): string[] {
-    const result: string[] = [];
-    const start = new Date(`${startDate}T00:00:00`);
-    const end = new Date(`${endDate}T00:00:00`);
-
-    if (Number.isNaN(start.getTime()) || Number.isNaN(end.getTime()) || start > end) {
-        return result;
-    }
-
-    const d = new Date(start);
-    while (d <= end) {
-        const y = d.getFullYear();
-        const m = String(d.getMonth() + 1).padStart(2, "0");
-        const day = String(d.getDate()).padStart(2, "0");
-        result.push(`${y}-${m}-${day}`);
-        d.setDate(d.getDate() + 1);
-    }
-
-    return result;
-}